@@ -19,6 +19,8 @@ class Base():
         TRANSLATION_STOP_DONE: int = 220                        # 翻译停止完成
         TRANSLATION_UPDATE: int = 230                           # 翻译状态更新
         TRANSLATION_MANUAL_EXPORT: int = 240                    # 翻译结果手动导出
+        TRANSLATION_PLAN: int = 250                             # 翻译预估
+        TRANSLATION_PLAN_DONE: int = 260                        # 翻译预估完成
         CACHE_FILE_AUTO_SAVE: int = 300                         # 缓存文件自动保存
         PROJECT_STATUS: int = 400                               # 项目状态检查
         PROJECT_STATUS_CHECK_DONE: int = 410                    # 项目状态检查完成
@@ -77,9 +79,6 @@ class Base():
         # 默认配置
         self.default = {}
 
-        # 获取事件管理器单例
-        self.event_manager_singleton = EventManager()
-
     # PRINT
     def print(self, msg: str, e: Exception = None, file: bool = True, console: bool = True) -> None:
         LogHelper.print(msg, e, file, console)
@@ -1,5 +1,8 @@
 class BaseData():
 
+    # 允许子类通过 __slots__ 省去实例字典
+    __slots__ = ()
+
     _TYPE_FILTER = (int, str, bool, float, list, dict, tuple)
 
     def __init__(self) -> None:
@@ -0,0 +1,27 @@
+from typing import Callable
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QObject
+from PyQt5.QtCore import pyqtSignal
+
+# 事件桥，通过 Qt 的事件队列将事件投递到创建者所在的线程（即界面的主线程）中处理
+class EventBridge(QObject):
+
+    # 自定义信号
+    # 字典类型或者其他复杂对象应该使用 object 作为信号参数类型，这样可以传递任意 Python 对象，包括 dict
+    signal = pyqtSignal(int, object)
+
+    def __init__(self, handler: Callable) -> None:
+        super().__init__()
+
+        # 初始化
+        self.handler = handler
+        self.signal.connect(self.process_event, Qt.QueuedConnection)
+
+    # 处理事件
+    def process_event(self, event: int, data: dict) -> None:
+        self.handler(event, data)
+
+    # 触发事件
+    def emit(self, event: int, data: dict) -> None:
+        self.signal.emit(event, data)
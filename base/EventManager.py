@@ -1,27 +1,41 @@
-from PyQt5.QtCore import Qt
-from PyQt5.QtCore import QObject
-from PyQt5.QtCore import pyqtSignal
+import sys
+import queue
+import threading
 
-class EventManager(QObject):
+class EventManager():
 
     # 单一实例
     _singleton = None
 
-    # 自定义信号
-    # 字典类型或者其他复杂对象应该使用 object 作为信号参数类型，这样可以传递任意 Python 对象，包括 dict
-    signal = pyqtSignal(int, object)
+    # 单例创建锁，避免多个线程同时首次订阅或触发事件时创建多个实例
+    LOCK = threading.Lock()
+
+    # 无界面模式，事件在独立的线程中按触发顺序依次处理，不依赖 Qt 的事件循环
+    # 单例在首次订阅或触发事件时创建，需要在此之前设置
+    HEADLESS = False
 
     # 事件列表
     event_callbacks = {}
 
     def __init__(self) -> None:
         super().__init__()
-        self.signal.connect(self.process_event, Qt.QueuedConnection)
+
+        if EventManager.HEADLESS == True:
+            self.bridge = None
+            self.queue = queue.Queue()
+            threading.Thread(target = self.process_queue, daemon = True).start()
+        else:
+            # 延迟导入，无界面模式下不需要 Qt
+            from base.EventBridge import EventBridge
+            self.bridge = EventBridge(self.process_event)
+            self.queue = None
 
     # 获取单例
     def get_singleton() -> "EventManager":
         if EventManager._singleton == None:
-            EventManager._singleton = EventManager()
+            with EventManager.LOCK:
+                if EventManager._singleton == None:
+                    EventManager._singleton = EventManager()
 
         return EventManager._singleton
 
@@ -31,9 +45,28 @@ class EventManager(QObject):
             for hanlder in self.event_callbacks[event]:
                 hanlder(event, data)
 
+    # 无界面模式下依次处理队列中的事件，与 Qt 的事件循环一致，处理函数抛出的异常交给全局异常钩子
+    def process_queue(self) -> None:
+        while True:
+            event, data = self.queue.get()
+            try:
+                self.process_event(event, data)
+            except Exception:
+                sys.excepthook(*sys.exc_info())
+            finally:
+                self.queue.task_done()
+
+    # 等待已触发的事件处理完毕，仅在无界面模式下有效
+    def join(self) -> None:
+        if self.queue is not None:
+            self.queue.join()
+
     # 触发事件
     def emit(self, event: int, data: dict) -> None:
-        self.signal.emit(event, data)
+        if self.queue is not None:
+            self.queue.put((event, data))
+        else:
+            self.bridge.emit(event, data)
 
     # 订阅事件
     def subscribe(self, event: int, hanlder: callable) -> None:
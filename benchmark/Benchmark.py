@@ -0,0 +1,272 @@
+import os
+import sys
+import time
+import ctypes
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+import rapidjson as json
+from rich import box
+from rich.table import Table
+from rich.console import Console
+
+from base.Base import Base
+from benchmark.MockServer import MockServer
+
+# 吞吐量测试，使用模拟接口服务在不同的并发数下完整执行翻译流程，输出每秒翻译行数、每个请求的 CPU 耗时与内存峰值
+# 每个并发数在独立的子进程中执行，以便分别统计 CPU 耗时与内存峰值，模拟接口服务运行在主进程中，不计入统计
+# 在项目根目录下执行：python -m benchmark.Benchmark --help
+class Benchmark(Base):
+
+    # 默认的并发数列表
+    CONCURRENCY = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+    # 生成测试项目时使用的文本片段
+    WORDS = ("魔導具", "ダリヤ", "うつむかない", "ありがとう", "ございます", "王都", "の", "は", "を", "に", "で", "した", "ます", "「", "」", "、", "。")
+
+    # 子进程使用的默认配置
+    DEFAULT_CONFIG = {
+        "source_language": "JA",
+        "target_language": "ZH",
+        "task_token_limit": 384,
+        "request_timeout": 120,
+        "max_round": 16,
+        "proxy_enable": False,
+        "proxy_url": "",
+        "glossary_enable": False,
+        "glossary_data": [],
+        "auto_glossary_enable": False,
+        "traditional_chinese_enable": False,
+        "mtool_optimizer_enable": False,
+        "pre_translation_replacement_enable": False,
+        "pre_translation_replacement_data": [],
+        "post_translation_replacement_enable": False,
+        "post_translation_replacement_data": [],
+        "custom_prompt_zh_enable": False,
+        "custom_prompt_zh_data": "",
+        "custom_prompt_en_enable": False,
+        "custom_prompt_en_data": "",
+        "balance_platforms": [],
+    }
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        super().__init__()
+
+        # 初始化
+        self.args = args
+        self.console = Console(highlight = True, tab_size = 4)
+
+    # 生成测试项目，返回输入文件夹
+    def generate_project(self, folder: str) -> str:
+        rng = random.Random(self.args.seed)
+        input_folder = f"{folder}/input"
+        os.makedirs(input_folder, exist_ok = True)
+
+        # 按行数平均分配到各个文件，每行包含随机数量的文本片段
+        files = max(1, self.args.files)
+        for i in range(files):
+            count = self.args.lines // files + (1 if i < self.args.lines % files else 0)
+            lines = [
+                "".join(rng.choice(Benchmark.WORDS) for _ in range(rng.randint(4, 32))) + f"{i}-{j}。"
+                for j in range(count)
+            ]
+            with open(f"{input_folder}/{i:04d}.txt", "w", encoding = "utf-8") as writer:
+                writer.write("\n".join(lines))
+
+        return input_folder
+
+    # 生成子进程的配置文件
+    def generate_config(self, folder: str, input_folder: str, server: MockServer, concurrency: int) -> str:
+        config = dict(Benchmark.DEFAULT_CONFIG)
+        config.update({
+            "input_folder": input_folder,
+            "output_folder": f"{folder}/output_{concurrency}",
+            "batch_size": concurrency,
+            "task_token_limit": self.args.token_limit,
+            "activate_platform": 0,
+            "platforms": [
+                {
+                    "id": 0,
+                    "name": "mock",
+                    "api_format": self.args.format,
+                    "api_url": server.get_url(self.args.format),
+                    "api_key": ["mock"],
+                    "model": "mock",
+                    "thinking": False,
+                    "top_p": 0.95,
+                    "temperature": 0.95,
+                    "presence_penalty": 0.0,
+                    "frequency_penalty": 0.0,
+                },
+            ],
+        })
+
+        path = f"{folder}/config_{concurrency}.json"
+        with open(path, "w", encoding = "utf-8") as writer:
+            writer.write(json.dumps(config, indent = 4, ensure_ascii = False))
+
+        return path
+
+    # 执行测试
+    def run(self) -> None:
+        server = MockServer.from_args(self.args)
+        server.start()
+
+        folder = tempfile.mkdtemp(prefix = "benchmark_")
+        try:
+            input_folder = self.args.input if self.args.input != "" else self.generate_project(folder)
+
+            rows: list[dict] = []
+            for concurrency in [int(v) for v in self.args.concurrency.split(",") if v.strip() != ""]:
+                server.pop_stats()
+                result = self.run_worker(self.generate_config(folder, input_folder, server, concurrency))
+                result["concurrency"] = concurrency
+                result["stats"] = server.pop_stats()
+                rows.append(result)
+                self.info(f"concurrency {concurrency} - {result.get("line", 0)} lines in {result.get("time", 0):.2f}s")
+
+            self.console.print(self.generate_table(rows))
+        finally:
+            server.stop()
+            shutil.rmtree(folder, ignore_errors = True)
+
+    # 在子进程中执行一次完整的翻译流程
+    def run_worker(self, config_path: str) -> dict:
+        result_path = config_path.replace(".json", "_result.json")
+        cmd = [sys.executable, "-m", "benchmark.Benchmark", "--worker", config_path, "--expert", json.dumps(self.get_expert())]
+        with open(config_path.replace(".json", ".log"), "w", encoding = "utf-8") as log:
+            subprocess.run(cmd, stdout = log, stderr = subprocess.STDOUT, check = False)
+
+        try:
+            with open(result_path, "r", encoding = "utf-8") as reader:
+                return json.load(reader)
+        except Exception as e:
+            self.error(config_path, e)
+            return {}
+
+    # 解析专家配置参数
+    def get_expert(self) -> dict:
+        expert = {}
+        for item in self.args.expert:
+            k, v = item.split("=", 1)
+            try:
+                expert[k.strip()] = json.loads(v)
+            except Exception:
+                expert[k.strip()] = v
+
+        return expert
+
+    # 生成结果表格
+    def generate_table(self, rows: list[dict]) -> Table:
+        table = Table(
+            box = box.ASCII2,
+            expand = True,
+            title = f"{self.args.format} - {self.args.input if self.args.input != "" else f"{self.args.lines} lines"}, latency {self.args.latency}s",
+            highlight = True,
+            show_header = True,
+            collapse_padding = True,
+        )
+        for column in ("conc", "time s", "lines/s", "reqs", "failed", "inflight", "cpu ms/req", "peak MB", "left"):
+            table.add_column(column, justify = "right")
+
+        for row in rows:
+            stats: dict = row.get("stats", {})
+            requests = sum(v for k, v in stats.items() if k != "max_inflight")
+            failed = requests - stats.get(MockServer.Outcome.SUCCESS, 0)
+            table.add_row(
+                str(row.get("concurrency")),
+                f"{row.get("time", 0):.2f}",
+                f"{row.get("line", 0) / max(0.001, row.get("time", 0)):.1f}",
+                str(requests),
+                str(failed),
+                str(stats.get("max_inflight", 0)),
+                f"{row.get("cpu", 0) * 1000 / max(1, requests):.2f}",
+                f"{row.get("memory", 0):.1f}",
+                str(row.get("untranslated", "-")),
+            )
+
+        return table
+
+    # 获取当前进程的内存峰值（MB），无法获取时返回 0
+    @classmethod
+    def get_peak_memory(cls) -> float:
+        try:
+            if os.name == "nt":
+                class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                    _fields_ = [
+                        ("cb", ctypes.c_ulong),
+                        ("PageFaultCount", ctypes.c_ulong),
+                        ("PeakWorkingSetSize", ctypes.c_size_t),
+                        ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t),
+                        ("PeakPagefileUsage", ctypes.c_size_t),
+                    ]
+
+                counters = PROCESS_MEMORY_COUNTERS()
+                counters.cb = ctypes.sizeof(counters)
+                ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+                return counters.PeakWorkingSetSize / 1024 / 1024
+            else:
+                import resource
+                rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+        except Exception:
+            return 0.0
+
+    # 子进程，完整执行一次翻译流程并写入结果
+    @classmethod
+    def run_worker_target(cls, config_path: str, expert: dict) -> None:
+        from base.EventManager import EventManager
+        from module.ExpertConfig import ExpertConfig
+        from module.Translator.Translator import Translator
+
+        # 子进程中没有 Qt 的事件循环，依赖 EventManager 的无界面模式处理事件
+        # 没有无界面模式时，子进程中触发的事件（缓存保存、翻译状态等）都不会被处理
+        EventManager.HEADLESS = True
+
+        # 使用独立的配置文件，专家配置只在内存中修改
+        Base.CONFIG_PATH = config_path
+        for k, v in expert.items():
+            setattr(ExpertConfig.get(), k, v)
+
+        translator = Translator()
+        cpu = time.process_time()
+        try:
+            translator.translation_start_target(Base.TranslationStatus.UNTRANSLATED)
+        finally:
+            translator.cache_manager.app_shut_down(Base.Event.APP_SHUT_DOWN, {})
+
+        result = {
+            "time": translator.extras.get("time", 0),
+            "line": translator.extras.get("line", 0),
+            "untranslated": translator.cache_manager.get_item_count_by_status(Base.TranslationStatus.UNTRANSLATED),
+            "cpu": time.process_time() - cpu,
+            "memory": cls.get_peak_memory(),
+        }
+        with open(config_path.replace(".json", "_result.json"), "w", encoding = "utf-8") as writer:
+            writer.write(json.dumps(result))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "使用模拟接口服务测试翻译流程的吞吐量")
+    parser.add_argument("--format", default = Base.APIFormat.OPENAI, choices = (Base.APIFormat.OPENAI, Base.APIFormat.ANTHROPIC, Base.APIFormat.SAKURALLM), help = "接口格式")
+    parser.add_argument("--concurrency", default = ",".join(str(v) for v in Benchmark.CONCURRENCY), help = "并发数列表，以逗号分隔")
+    parser.add_argument("--input", default = "", help = "输入文件夹，为空时生成测试项目")
+    parser.add_argument("--lines", type = int, default = 10000, help = "生成的测试项目的行数")
+    parser.add_argument("--files", type = int, default = 20, help = "生成的测试项目的文件数")
+    parser.add_argument("--token-limit", type = int, default = 384, help = "任务的 Token 阈值")
+    MockServer.add_arguments(parser)
+    parser.add_argument("--expert", action = "append", default = [], help = "专家配置，格式为 key=value，可以重复指定，例如 --expert async_request_enable=true")
+    parser.add_argument("--worker", default = "", help = argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker != "":
+        Benchmark.run_worker_target(args.worker, json.loads(args.expert[0]) if len(args.expert) > 0 else {})
+    else:
+        Benchmark(args).run()
@@ -0,0 +1,605 @@
+import math
+import time
+import random
+import asyncio
+import argparse
+import threading
+
+import rapidjson as json
+
+from base.Base import Base
+
+# 模拟接口服务，实现 OpenAI、Anthropic 与 SakuraLLM 接口的翻译请求，用于在没有真实接口的情况下测试翻译流程的吞吐量
+# 请求耗时服从对数正态分布，并按回复长度增加耗时，可以按比例注入服务端错误、速率限制、格式错误的回复与退化的回复
+# 支持普通请求与流式请求，回复内容由原文逐字转换得到，不包含假名，可以通过翻译结果检查
+# 同时实现 OpenAI 与 Anthropic 的批量接口，批量任务中的请求在后台并行处理，请求结果与耗时的规则与普通请求相同
+class MockServer(Base):
+
+    # 模拟译文使用的字符，原文中的假名按码位映射为这些字符
+    CHARACTERS = "文语译言书字词句"
+
+    # 流式回复每个片段的字符数
+    STREAM_CHUNK_SIZE = 16
+
+    # 速率限制时建议的重试等待时间（秒）
+    RETRY_AFTER = 1
+
+    # 批量任务的有效期（秒）
+    BATCH_EXPIRY = 24 * 60 * 60
+
+    # 请求结果类型
+    class Outcome():
+
+        SUCCESS: str = "success"                                # 成功
+        ERROR: str = "error"                                    # 服务端错误
+        RATE_LIMIT: str = "rate_limit"                          # 速率限制
+        MALFORMED: str = "malformed"                            # 格式错误的回复
+        DEGENERATE: str = "degenerate"                          # 退化的回复
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        latency: float = 1.0,
+        latency_sigma: float = 0.5,
+        token_latency: float = 0.0,
+        capacity: int = 0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        degenerate_rate: float = 0.0,
+        seed: int = None,
+    ) -> None:
+        super().__init__()
+
+        # 初始化
+        self.host = host
+        self.port = port
+        self.latency = max(0.0, latency)                        # 请求耗时的中位数（秒）
+        self.latency_sigma = max(0.0, latency_sigma)            # 请求耗时的对数标准差
+        self.token_latency = max(0.0, token_latency)            # 每个回复字符额外增加的耗时（秒）
+        self.capacity = max(0, capacity)                        # 同时处理的请求数量上限，超过时返回速率限制，为 0 时不限制
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self.degenerate_rate = degenerate_rate
+        self.random = random.Random(seed)
+
+        # 统计数据
+        self.inflight: int = 0
+        self.max_inflight: int = 0
+        self.stats: dict[str, int] = {}
+
+        # 批量任务与上传的文件
+        self.batches: dict[str, dict] = {}
+        self.files: dict[str, bytes] = {}
+        self.id_count: int = 0
+
+        # 事件循环
+        self.loop: asyncio.AbstractEventLoop = None
+        self.server: asyncio.AbstractServer = None
+        self.ready = threading.Event()
+
+        # 线程锁
+        self.lock = threading.Lock()
+
+    # 添加命令行参数
+    @classmethod
+    def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument("--port", type = int, default = 8765, help = "模拟接口服务的端口")
+        parser.add_argument("--latency", type = float, default = 1.0, help = "请求耗时的中位数（秒）")
+        parser.add_argument("--latency-sigma", type = float, default = 0.5, help = "请求耗时的对数标准差")
+        parser.add_argument("--token-latency", type = float, default = 0.0, help = "每个回复字符额外增加的耗时（秒）")
+        parser.add_argument("--capacity", type = int, default = 0, help = "同时处理的请求数量上限，超过时返回 429，为 0 时不限制")
+        parser.add_argument("--error-rate", type = float, default = 0.0, help = "返回 500 错误的比例")
+        parser.add_argument("--rate-limit-rate", type = float, default = 0.0, help = "返回 429 错误的比例")
+        parser.add_argument("--malformed-rate", type = float, default = 0.0, help = "返回截断的回复的比例")
+        parser.add_argument("--degenerate-rate", type = float, default = 0.0, help = "返回退化的回复的比例")
+        parser.add_argument("--seed", type = int, default = 0, help = "随机数种子")
+
+    # 根据命令行参数创建服务
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> "MockServer":
+        return cls(
+            port = args.port,
+            latency = args.latency,
+            latency_sigma = args.latency_sigma,
+            token_latency = args.token_latency,
+            capacity = args.capacity,
+            error_rate = args.error_rate,
+            rate_limit_rate = args.rate_limit_rate,
+            malformed_rate = args.malformed_rate,
+            degenerate_rate = args.degenerate_rate,
+            seed = args.seed,
+        )
+
+    # 获取接口地址
+    def get_url(self, api_format: str) -> str:
+        if api_format == Base.APIFormat.ANTHROPIC:
+            return f"http://{self.host}:{self.port}"
+        else:
+            return f"http://{self.host}:{self.port}/v1"
+
+    # 获取并清空统计数据
+    def pop_stats(self) -> dict[str, int]:
+        with self.lock:
+            stats = dict(self.stats, max_inflight = self.max_inflight)
+            self.stats = {}
+            self.max_inflight = self.inflight
+
+        return stats
+
+    # 在后台线程中启动服务
+    def start(self) -> None:
+        threading.Thread(target = self.run, daemon = True).start()
+        self.ready.wait()
+
+    # 停止服务
+    def stop(self) -> None:
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.server.close)
+
+    # 运行服务，直到服务被关闭
+    def run(self) -> None:
+        async def main() -> None:
+            self.loop = asyncio.get_running_loop()
+            self.server = await asyncio.start_server(self.handle, self.host, self.port, backlog = 4096)
+            self.ready.set()
+            try:
+                await self.server.serve_forever()
+            except asyncio.CancelledError:
+                pass
+
+        asyncio.run(main())
+
+    # 处理连接，同一连接上的请求依次处理
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if line == b"":
+                    break
+
+                method, path = line.decode("latin-1").split()[:2]
+                headers: dict[str, str] = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b""):
+                        break
+                    k, v = header.decode("latin-1").split(":", 1)
+                    headers[k.strip().lower()] = v.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                path = path.split("?")[0].rstrip("/")
+                if method == "POST" and path == "/v1/chat/completions":
+                    await self.handle_request(writer, json.loads(body), Base.APIFormat.OPENAI)
+                elif method == "POST" and path == "/v1/messages":
+                    await self.handle_request(writer, json.loads(body), Base.APIFormat.ANTHROPIC)
+                elif path.startswith(("/v1/files", "/v1/batches", "/v1/messages/batches")):
+                    await self.handle_batch(writer, method, path, headers, body)
+                else:
+                    await self.write_json(writer, 404, {"error": {"type": "not_found_error", "message": f"{method} {path}"}})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            self.debug("", e)
+        finally:
+            writer.close()
+
+    # 处理翻译请求
+    async def handle_request(self, writer: asyncio.StreamWriter, request: dict, api_format: str) -> None:
+        # 速率限制
+        with self.lock:
+            if (self.capacity > 0 and self.inflight >= self.capacity) or self.random.random() < self.rate_limit_rate:
+                outcome = MockServer.Outcome.RATE_LIMIT
+            else:
+                outcome = None
+                self.inflight = self.inflight + 1
+                self.max_inflight = max(self.max_inflight, self.inflight)
+
+        if outcome == MockServer.Outcome.RATE_LIMIT:
+            self.count(outcome)
+            return await self.write_json(
+                writer,
+                429,
+                {"type": "error", "error": {"type": "rate_limit_error", "message": "rate limit exceeded"}},
+                {"Retry-After": str(MockServer.RETRY_AFTER)},
+            )
+
+        try:
+            # 生成回复
+            prompt, sakura, srcs = self.parse_request(request, api_format)
+            outcome = self.get_outcome()
+            content = self.generate_content(srcs, sakura, outcome)
+            latency = self.get_latency(len(content))
+
+            # 服务端错误在等待后返回
+            if outcome == MockServer.Outcome.ERROR:
+                await asyncio.sleep(latency)
+                return await self.write_json(writer, 500, {"type": "error", "error": {"type": "api_error", "message": "internal server error"}})
+
+            usage = (len(prompt), len(content))
+            if request.get("stream") == True:
+                await self.write_stream(writer, api_format, content, usage, latency)
+            else:
+                await asyncio.sleep(latency)
+                await self.write_json(writer, 200, self.generate_response(api_format, request.get("model", ""), content, usage))
+        finally:
+            with self.lock:
+                self.inflight = self.inflight - 1
+            self.count(outcome)
+
+    # 处理批量接口的请求
+    async def handle_batch(self, writer: asyncio.StreamWriter, method: str, path: str, headers: dict[str, str], body: bytes) -> None:
+        # 路径中的批量任务 ID，例如 batches/{id}/cancel 或 messages/batches/{id}/results
+        parts = path.split("/")[2:]
+        index = 2 if parts[0] == "messages" else 1
+        batch = self.batches.get(parts[index]) if len(parts) > index else None
+
+        # OpenAI - 上传文件
+        if method == "POST" and parts == ["files"]:
+            file_id = self.generate_id("file")
+            self.files[file_id] = self.parse_multipart_file(headers.get("content-type", ""), body)
+            await self.write_json(writer, 200, self.generate_file(file_id))
+        # OpenAI - 下载文件
+        elif method == "GET" and len(parts) == 3 and parts[0] == "files" and parts[2] == "content" and parts[1] in self.files:
+            await self.write_body(writer, 200, self.files.get(parts[1]), "application/octet-stream")
+        # OpenAI - 创建批量任务
+        elif method == "POST" and parts == ["batches"]:
+            request: dict = json.loads(body)
+            lines = self.files.get(request.get("input_file_id"), b"").decode("utf-8").splitlines()
+            requests = [(v.get("custom_id"), v.get("body")) for v in (json.loads(line) for line in lines if line.strip() != "")]
+            batch = self.create_batch(self.generate_id("batch"), Base.APIFormat.OPENAI, requests)
+            batch["input_file_id"] = request.get("input_file_id")
+            await self.write_json(writer, 200, self.generate_batch(batch))
+        # Anthropic - 创建批量任务
+        elif method == "POST" and parts == ["messages", "batches"]:
+            requests = [(v.get("custom_id"), v.get("params")) for v in json.loads(body).get("requests", [])]
+            batch = self.create_batch(self.generate_id("msgbatch"), Base.APIFormat.ANTHROPIC, requests)
+            await self.write_json(writer, 200, self.generate_batch(batch))
+        # 取回批量任务的结果
+        elif method == "GET" and parts[-1] == "results" and batch is not None and batch.get("ended_at") is not None:
+            await self.write_body(writer, 200, self.generate_batch_results(batch), "application/binary")
+        # 查询批量任务
+        elif method == "GET" and batch is not None:
+            await self.write_json(writer, 200, self.generate_batch(batch))
+        # 取消批量任务
+        elif method == "POST" and parts[-1] == "cancel" and batch is not None:
+            if batch.get("ended_at") is None and batch.get("cancel_at") is None:
+                batch["cancel_at"] = time.time()
+                batch.get("task").cancel()
+            await self.write_json(writer, 200, self.generate_batch(batch))
+        else:
+            await self.write_json(writer, 404, {"error": {"type": "not_found_error", "message": f"{method} {path}"}})
+
+    # 生成批量任务与文件的 ID
+    def generate_id(self, prefix: str) -> str:
+        with self.lock:
+            self.id_count = self.id_count + 1
+            return f"{prefix}_mock_{self.id_count}"
+
+    # 解析 multipart/form-data 请求，返回其中 file 字段的内容
+    def parse_multipart_file(self, content_type: str, body: bytes) -> bytes:
+        boundary = content_type.split("boundary=")[-1].strip("\"").encode("latin-1")
+        for part in body.split(b"--" + boundary):
+            head, _, data = part.partition(b"\r\n\r\n")
+            if b"name=\"file\"" in head:
+                return data.removesuffix(b"\r\n")
+
+        return b""
+
+    # 创建批量任务并在后台开始处理
+    def create_batch(self, batch_id: str, api_format: str, requests: list[tuple[str, dict]]) -> dict:
+        batch = {
+            "id": batch_id,
+            "api_format": api_format,
+            "requests": requests,
+            "succeeded": {},                                    # {请求 ID: 回复}
+            "errored": {},                                      # {请求 ID: 错误}
+            "created_at": time.time(),
+            "cancel_at": None,
+            "ended_at": None,
+            "input_file_id": None,
+            "output_file_id": None,
+            "error_file_id": None,
+        }
+        batch["task"] = asyncio.create_task(self.process_batch(batch))
+        self.batches[batch_id] = batch
+
+        return batch
+
+    # 处理批量任务，全部请求并行处理，取消时未完成的请求不再处理
+    async def process_batch(self, batch: dict) -> None:
+        async def process(custom_id: str, request: dict) -> None:
+            prompt, sakura, srcs = self.parse_request(request, batch.get("api_format"))
+            outcome = self.get_outcome()
+            content = self.generate_content(srcs, sakura, outcome)
+            await asyncio.sleep(self.get_latency(len(content)))
+
+            self.count(outcome)
+            if outcome == MockServer.Outcome.ERROR:
+                batch.get("errored")[custom_id] = {"type": "api_error", "message": "internal server error"}
+            else:
+                batch.get("succeeded")[custom_id] = self.generate_response(batch.get("api_format"), request.get("model", ""), content, (len(prompt), len(content)))
+
+        try:
+            await asyncio.gather(*(process(custom_id, request) for custom_id, request in batch.get("requests")))
+        except asyncio.CancelledError:
+            pass
+
+        # OpenAI 的结果写入输出文件，成功与失败的请求分别写入不同的文件
+        if batch.get("api_format") == Base.APIFormat.OPENAI:
+            batch["output_file_id"] = self.generate_id("file")
+            batch["error_file_id"] = self.generate_id("file")
+            self.files[batch.get("output_file_id")] = self.generate_batch_results(batch, "succeeded")
+            self.files[batch.get("error_file_id")] = self.generate_batch_results(batch, "errored")
+
+        batch["ended_at"] = time.time()
+
+    # 生成批量任务的结果，每行一个请求，OpenAI 按 kind 生成成功或失败的请求的输出文件
+    def generate_batch_results(self, batch: dict, kind: str = None) -> bytes:
+        lines: list[str] = []
+        for i, (custom_id, _) in enumerate(batch.get("requests")):
+            if batch.get("api_format") == Base.APIFormat.ANTHROPIC:
+                if custom_id in batch.get("succeeded"):
+                    result = {"type": "succeeded", "message": batch.get("succeeded").get(custom_id)}
+                elif custom_id in batch.get("errored"):
+                    result = {"type": "errored", "error": {"type": "error", "error": batch.get("errored").get(custom_id)}}
+                else:
+                    result = {"type": "canceled"}
+                lines.append(json.dumps({"custom_id": custom_id, "result": result}, ensure_ascii = False))
+            elif custom_id in batch.get(kind):
+                status_code, body = (200, batch.get(kind).get(custom_id)) if kind == "succeeded" else (500, {"error": batch.get(kind).get(custom_id)})
+                lines.append(json.dumps({
+                    "id": f"batch_req_{i}",
+                    "custom_id": custom_id,
+                    "response": {"status_code": status_code, "request_id": f"req_{i}", "body": body},
+                    "error": None,
+                }, ensure_ascii = False))
+
+        return "\n".join(lines).encode("utf-8")
+
+    # 生成上传文件的信息
+    def generate_file(self, file_id: str) -> dict:
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(self.files.get(file_id, b"")),
+            "created_at": int(time.time()),
+            "filename": "batch.jsonl",
+            "purpose": "batch",
+            "status": "processed",
+        }
+
+    # 生成批量任务的信息
+    def generate_batch(self, batch: dict) -> dict:
+        def timestamp(t: float) -> str:
+            return None if t is None else time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(t))
+
+        total = len(batch.get("requests"))
+        succeeded = len(batch.get("succeeded"))
+        errored = len(batch.get("errored"))
+        ended = batch.get("ended_at") is not None
+        canceled = total - succeeded - errored if ended else 0
+        if batch.get("api_format") == Base.APIFormat.ANTHROPIC:
+            return {
+                "id": batch.get("id"),
+                "type": "message_batch",
+                "processing_status": "ended" if ended else "canceling" if batch.get("cancel_at") is not None else "in_progress",
+                "request_counts": {
+                    "processing": total - succeeded - errored - canceled,
+                    "succeeded": succeeded,
+                    "errored": errored,
+                    "canceled": canceled,
+                    "expired": 0,
+                },
+                "created_at": timestamp(batch.get("created_at")),
+                "expires_at": timestamp(batch.get("created_at") + MockServer.BATCH_EXPIRY),
+                "ended_at": timestamp(batch.get("ended_at")),
+                "archived_at": None,
+                "cancel_initiated_at": timestamp(batch.get("cancel_at")),
+                "results_url": f"{self.get_url(Base.APIFormat.ANTHROPIC)}/v1/messages/batches/{batch.get("id")}/results" if ended else None,
+            }
+        else:
+            if ended:
+                status = "cancelled" if batch.get("cancel_at") is not None else "completed"
+            else:
+                status = "cancelling" if batch.get("cancel_at") is not None else "in_progress"
+
+            return {
+                "id": batch.get("id"),
+                "object": "batch",
+                "endpoint": "/v1/chat/completions",
+                "errors": None,
+                "input_file_id": batch.get("input_file_id"),
+                "completion_window": "24h",
+                "status": status,
+                "output_file_id": batch.get("output_file_id"),
+                "error_file_id": batch.get("error_file_id"),
+                "created_at": int(batch.get("created_at")),
+                "expires_at": int(batch.get("created_at") + MockServer.BATCH_EXPIRY),
+                "request_counts": {"total": total, "completed": succeeded, "failed": errored},
+            }
+
+    # 记录请求结果
+    def count(self, outcome: str) -> None:
+        with self.lock:
+            self.stats[outcome] = self.stats.get(outcome, 0) + 1
+
+    # 随机选择请求结果
+    def get_outcome(self) -> str:
+        with self.lock:
+            value = self.random.random()
+
+        for outcome, rate in (
+            (MockServer.Outcome.ERROR, self.error_rate),
+            (MockServer.Outcome.MALFORMED, self.malformed_rate),
+            (MockServer.Outcome.DEGENERATE, self.degenerate_rate),
+        ):
+            if value < rate:
+                return outcome
+            value = value - rate
+
+        return MockServer.Outcome.SUCCESS
+
+    # 计算请求耗时
+    def get_latency(self, length: int) -> float:
+        with self.lock:
+            gauss = self.random.gauss(0, 1)
+
+        return self.latency * math.exp(self.latency_sigma * gauss) + length * self.token_latency
+
+    # 解析请求，返回 (提示词文本, 是否为 SakuraLLM 请求, 原文列表)
+    def parse_request(self, request: dict, api_format: str) -> tuple[str, bool, list[str]]:
+        texts: list[str] = []
+        if isinstance(request.get("system"), str):
+            texts.append(request.get("system"))
+        user = ""
+        for message in request.get("messages", []):
+            content = message.get("content", "")
+            if isinstance(content, list):
+                content = "\n".join(block.get("text", "") for block in content if isinstance(block, dict))
+            texts.append(content)
+            if message.get("role") == "user":
+                user = content
+        prompt = "\n".join(texts)
+
+        # SakuraLLM 的提示词以系统提示词开头，原文逐行位于用户提示词的末尾
+        if api_format == Base.APIFormat.OPENAI and prompt.startswith("你是一个轻小说翻译模型"):
+            return prompt, True, user.split("翻译成中文：\n")[-1].splitlines()
+
+        # 其他接口的原文以 JSON 格式位于用户提示词的最后一行
+        try:
+            data = json.loads(user.strip().splitlines()[-1])
+            srcs = [str(v) for v in data.values()] if isinstance(data, dict) else []
+        except Exception:
+            srcs = []
+
+        return prompt, False, srcs
+
+    # 生成回复内容
+    def generate_content(self, srcs: list[str], sakura: bool, outcome: str) -> str:
+        dsts = [self.translate(src) for src in srcs]
+
+        # 退化的回复，第一行译文陷入重复循环
+        if outcome == MockServer.Outcome.DEGENERATE and len(dsts) > 0:
+            dsts[0] = dsts[0] + MockServer.CHARACTERS[0] * 64
+
+        if sakura == True:
+            content = "\n".join(dsts)
+        else:
+            content = json.dumps({str(i): dst for i, dst in enumerate(dsts)}, ensure_ascii = False)
+
+        # 格式错误的回复，截断回复内容
+        if outcome == MockServer.Outcome.MALFORMED:
+            content = content[: len(content) // 2]
+
+        return content
+
+    # 生成模拟译文，假名映射为汉字，其他字符保持不变，以保留代码与标点
+    def translate(self, src: str) -> str:
+        return "".join(
+            MockServer.CHARACTERS[ord(c) % len(MockServer.CHARACTERS)] if "぀" <= c <= "ヿ" else c
+            for c in src
+        )
+
+    # 生成普通请求的回复
+    def generate_response(self, api_format: str, model: str, content: str, usage: tuple[int, int]) -> dict:
+        if api_format == Base.APIFormat.ANTHROPIC:
+            return {
+                "id": "msg_mock",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{"type": "text", "text": content}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": usage[0], "output_tokens": usage[1]},
+            }
+        else:
+            return {
+                "id": "chatcmpl-mock",
+                "object": "chat.completion",
+                "created": 0,
+                "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": usage[0], "completion_tokens": usage[1], "total_tokens": sum(usage)},
+            }
+
+    # 生成流式回复的事件列表
+    def generate_stream_events(self, api_format: str, content: str, usage: tuple[int, int]) -> tuple[list[str], list[str], list[str]]:
+        pieces = [content[i : i + MockServer.STREAM_CHUNK_SIZE] for i in range(0, len(content), MockServer.STREAM_CHUNK_SIZE)]
+        if api_format == Base.APIFormat.ANTHROPIC:
+            def event(data: dict) -> str:
+                return f"event: {data.get("type")}\ndata: {json.dumps(data, ensure_ascii = False)}\n\n"
+
+            head = [
+                event({
+                    "type": "message_start",
+                    "message": {
+                        "id": "msg_mock", "type": "message", "role": "assistant", "model": "", "content": [],
+                        "stop_reason": None, "stop_sequence": None, "usage": {"input_tokens": usage[0], "output_tokens": 0},
+                    },
+                }),
+                event({"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}}),
+            ]
+            body = [event({"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": piece}}) for piece in pieces]
+            tail = [
+                event({"type": "content_block_stop", "index": 0}),
+                event({"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None}, "usage": {"output_tokens": usage[1]}}),
+                event({"type": "message_stop"}),
+            ]
+        else:
+            def event(choices: list[dict], usage: dict = None) -> str:
+                data = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": 0, "model": "", "choices": choices, "usage": usage}
+                return f"data: {json.dumps(data, ensure_ascii = False)}\n\n"
+
+            head = [event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])]
+            body = [event([{"index": 0, "delta": {"content": piece}, "finish_reason": None}]) for piece in pieces]
+            tail = [
+                event([{"index": 0, "delta": {}, "finish_reason": "stop"}]),
+                event([], {"prompt_tokens": usage[0], "completion_tokens": usage[1], "total_tokens": sum(usage)}),
+                "data: [DONE]\n\n",
+            ]
+
+        return head, body, tail
+
+    # 写入 JSON 回复
+    async def write_json(self, writer: asyncio.StreamWriter, status: int, data: dict, headers: dict[str, str] = {}) -> None:
+        await self.write_body(writer, status, json.dumps(data, ensure_ascii = False).encode("utf-8"), "application/json", headers)
+
+    # 写入回复
+    async def write_body(self, writer: asyncio.StreamWriter, status: int, body: bytes, content_type: str, headers: dict[str, str] = {}) -> None:
+        head = f"HTTP/1.1 {status} {"OK" if status == 200 else "Error"}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+        for k, v in headers.items():
+            head = head + f"{k}: {v}\r\n"
+        writer.write((head + "\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    # 写入流式回复，回复片段在请求耗时内均匀发送
+    async def write_stream(self, writer: asyncio.StreamWriter, api_format: str, content: str, usage: tuple[int, int], latency: float) -> None:
+        async def send(text: str) -> None:
+            data = text.encode("utf-8")
+            writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+            await writer.drain()
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n")
+        head, body, tail = self.generate_stream_events(api_format, content, usage)
+        for text in head:
+            await send(text)
+        for text in body:
+            await asyncio.sleep(latency / max(1, len(body)))
+            await send(text)
+        for text in tail:
+            await send(text)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+# 单独运行模拟接口服务，可以在应用中将接口地址设置为本服务的地址进行测试
+# 在项目根目录下执行：python -m benchmark.MockServer --help
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "模拟 OpenAI、Anthropic 与 SakuraLLM 接口的翻译请求")
+    MockServer.add_arguments(parser)
+    server = MockServer.from_args(parser.parse_args())
+    server.info(f"{server.get_url(Base.APIFormat.OPENAI)} | {server.get_url(Base.APIFormat.ANTHROPIC)}")
+    server.run()
@@ -0,0 +1,83 @@
+import os
+import sys
+import argparse
+import traceback
+
+import rapidjson as json
+
+from base.Base import Base
+from base.BaseLanguage import BaseLanguage
+from base.EventManager import EventManager
+from module.CommandLine import CommandLine
+from module.Localizer.Localizer import Localizer
+from module.LogHelper import LogHelper
+from module.ExpertConfig import ExpertConfig
+from module.VersionManager import VersionManager
+
+# 捕获全局异常
+def excepthook(exc_type, exc_value, exc_traceback) -> None:
+    if issubclass(exc_type, KeyboardInterrupt):
+        # 用户中断，不记录日志
+        sys.__excepthook__(exc_type, exc_value, exc_traceback)
+        return
+
+    # 使用LogHelper记录异常信息
+    LogHelper.error(f"{Localizer.get().log_crash}\n{"".join(traceback.format_exception(exc_type, exc_value, exc_traceback)).strip()}")
+
+# 载入配置文件
+def load_config(path: str) -> dict:
+    config = {}
+
+    if os.path.exists(path):
+        with open(path, "r", encoding = "utf-8-sig") as reader:
+            config = json.load(reader)
+
+    return config
+
+# 无界面模式的入口，不创建 QApplication，在项目根目录下执行：python cli.py --help
+# 退出码：0 - 全部条目均已翻译，1 - 仍有条目未翻译，2 - 配置或文件错误，130 - 被中断
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "无界面模式，读取配置文件并执行翻译流程")
+    parser.add_argument("--config", default = Base.CONFIG_PATH, help = "配置文件路径，可以使用应用界面生成的配置文件")
+    parser.add_argument("--continue", dest = "resume", action = "store_true", help = "从输出文件夹中的缓存数据继续翻译")
+    parser.add_argument("--plan", action = "store_true", help = "只执行翻译预估，不发送任何请求")
+    parser.add_argument("--progress-interval", type = float, default = 10.0, help = "输出翻译进度的间隔（秒）")
+    args = parser.parse_args()
+
+    # 捕获全局异常
+    sys.excepthook = excepthook
+
+    # 事件不经过 Qt 的事件循环，需要在首次订阅或触发事件之前设置
+    EventManager.HEADLESS = True
+
+    # 设置工作目录
+    script_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+    sys.path.append(script_dir)
+
+    # 载入配置文件
+    Base.CONFIG_PATH = args.config
+    config = load_config(args.config)
+
+    # 加载版本号
+    if os.path.isfile("version.txt"):
+        with open("version.txt", "r", encoding = "utf-8-sig") as reader:
+            VersionManager.VERSION = reader.read().strip()
+
+    # 设置应用语言
+    Localizer.set_app_language(config.get("app_language", BaseLanguage.ZH))
+
+    # 打印日志
+    LogHelper.info(f"LinguaGacha {VersionManager.VERSION}")
+    LogHelper.debug(Localizer.get().log_debug_mode) if LogHelper.is_debug() else None
+
+    # 初始化实例
+    ExpertConfig.get()
+
+    # 执行翻译流程
+    command_line = CommandLine(args.progress_interval)
+    sys.exit(
+        command_line.run(
+            Base.TranslationStatus.TRANSLATING if args.resume == True else Base.TranslationStatus.UNTRANSLATED,
+            args.plan,
+        )
+    )
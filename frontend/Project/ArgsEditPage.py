@@ -11,6 +11,7 @@ from qfluentwidgets import SingleDirectionScrollArea
 
 from base.Base import Base
 from module.Localizer.Localizer import Localizer
+from widget.SpinCard import SpinCard
 from widget.SliderCard import SliderCard
 
 class ArgsEditPage(MessageBoxBase, Base):
@@ -50,6 +51,8 @@ class ArgsEditPage(MessageBoxBase, Base):
         self.add_widget_temperature(self.vbox, config, window)
         self.add_widget_presence_penalty(self.vbox, config, window)
         self.add_widget_frequency_penalty(self.vbox, config, window)
+        self.add_widget_rpm_limit(self.vbox, config, window)
+        self.add_widget_tpm_limit(self.vbox, config, window)
         self.add_widget_url(self.vbox, config, window)
 
         # 填充
@@ -165,6 +168,48 @@ class ArgsEditPage(MessageBoxBase, Base):
             )
         )
 
+    # 每分钟请求数限制
+    def add_widget_rpm_limit(self, parent: QLayout, config: dict, window: FluentWindow) -> None:
+        def init(widget: SpinCard) -> None:
+            widget.set_range(0, 9999999)
+            widget.set_value(self.platform.get("rpm_limit", 0))
+
+        def value_changed(widget: SpinCard, value: int) -> None:
+            config = self.load_config()
+            self.platform["rpm_limit"] = value
+            self.update_platform_to_config(self.platform, config)
+            self.save_config(config)
+
+        parent.addWidget(
+            SpinCard(
+                Localizer.get().args_edit_page_rpm_limit_title,
+                Localizer.get().args_edit_page_rpm_limit_content,
+                init = init,
+                value_changed = value_changed,
+            )
+        )
+
+    # 每分钟 Token 数限制
+    def add_widget_tpm_limit(self, parent: QLayout, config: dict, window: FluentWindow) -> None:
+        def init(widget: SpinCard) -> None:
+            widget.set_range(0, 999999999)
+            widget.set_value(self.platform.get("tpm_limit", 0))
+
+        def value_changed(widget: SpinCard, value: int) -> None:
+            config = self.load_config()
+            self.platform["tpm_limit"] = value
+            self.update_platform_to_config(self.platform, config)
+            self.save_config(config)
+
+        parent.addWidget(
+            SpinCard(
+                Localizer.get().args_edit_page_tpm_limit_title,
+                Localizer.get().args_edit_page_tpm_limit_content,
+                init = init,
+                value_changed = value_changed,
+            )
+        )
+
     # 添加链接
     def add_widget_url(self, parent: QLayout, config: dict, window: FluentWindow) -> None:
         if self.platform.get("api_format") == Base.APIFormat.GOOGLE:
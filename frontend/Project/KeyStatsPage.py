@@ -0,0 +1,103 @@
+import time
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QLayout
+from PyQt5.QtWidgets import QHeaderView
+from PyQt5.QtWidgets import QTableWidgetItem
+
+from qfluentwidgets import FluentWindow
+from qfluentwidgets import TableWidget
+from qfluentwidgets import MessageBoxBase
+
+from base.Base import Base
+from module.Localizer.Localizer import Localizer
+from module.Translator.KeyPool import KeyPool
+
+class KeyStatsPage(MessageBoxBase, Base):
+
+    def __init__(self, id: int, window: FluentWindow) -> None:
+        super().__init__(window)
+
+        # 载入配置文件
+        config = self.load_config()
+
+        # 设置框体
+        self.widget.setFixedSize(960, 720)
+        self.yesButton.setText(Localizer.get().close)
+        self.cancelButton.hide()
+
+        # 获取平台配置
+        self.platform = {}
+        for platform in config.get("platforms", []):
+            if platform.get("id", 0) == id:
+                self.platform = platform
+                break
+
+        # 设置主布局
+        self.viewLayout.setContentsMargins(24, 24, 24, 24) # 左、上、右、下
+
+        # 添加控件
+        self.add_widget_table(self.viewLayout, config, window)
+
+    # 隐藏密钥的中间部分
+    def mask(self, api_key: str) -> str:
+        if len(api_key) <= 12:
+            return api_key
+        else:
+            return f"{api_key[:6]}...{api_key[-4:]}"
+
+    # 表格
+    def add_widget_table(self, parent: QLayout, config: dict, window: FluentWindow) -> None:
+        self.table = TableWidget(self)
+        parent.addWidget(self.table)
+
+        # 设置表格属性
+        self.table.setBorderRadius(4)
+        self.table.setBorderVisible(True)
+        self.table.setWordWrap(False)
+        self.table.setColumnCount(6)
+        self.table.setEditTriggers(TableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+
+        # 设置水平表头并隐藏垂直表头
+        self.table.verticalHeader().hide()
+        self.table.setHorizontalHeaderLabels(
+            (
+                Localizer.get().key_stats_page_table_key,
+                Localizer.get().key_stats_page_table_request,
+                Localizer.get().key_stats_page_table_success_rate,
+                Localizer.get().key_stats_page_table_latency,
+                Localizer.get().key_stats_page_table_status,
+                Localizer.get().key_stats_page_table_last_error,
+            ),
+        )
+
+        # 向表格更新数据
+        now = time.time()
+        stats = KeyPool.get_stats(self.platform)
+        self.table.setRowCount(len(stats))
+        for row, (api_key, stat) in enumerate(stats):
+            if stat.get("quarantine_until") > now:
+                status = Localizer.get().key_stats_page_status_quarantine.replace("{SECONDS}", str(int(stat.get("quarantine_until") - now)))
+            else:
+                status = Localizer.get().key_stats_page_status_healthy
+
+            if stat.get("request") == 0:
+                success_rate = "-"
+            else:
+                success_rate = f"{stat.get("success") / stat.get("request") * 100:.1f}%"
+
+            values = (
+                self.mask(api_key),
+                str(stat.get("request")),
+                success_rate,
+                f"{stat.get("latency"):.2f}s" if stat.get("latency") > 0 else "-",
+                status,
+                stat.get("last_error").replace("\n", " "),
+            )
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setTextAlignment(Qt.AlignCenter if col < len(values) - 1 else Qt.AlignLeft | Qt.AlignVCenter)
+                item.setToolTip(value)
+                self.table.setItem(row, col, item)
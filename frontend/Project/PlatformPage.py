@@ -17,6 +17,7 @@ from module.Localizer.Localizer import Localizer
 from widget.FlowCard import FlowCard
 from frontend.Project.PlatformEditPage import PlatformEditPage
 from frontend.Project.ArgsEditPage import ArgsEditPage
+from frontend.Project.KeyStatsPage import KeyStatsPage
 
 class PlatformPage(QWidget, Base):
 
@@ -27,6 +28,7 @@ class PlatformPage(QWidget, Base):
         # 默认配置
         self.default = {
             "activate_platform": 0,
+            "balance_platforms": [],
             "platforms": self.load_default_platforms(),
         }
 
@@ -100,6 +102,13 @@ class PlatformPage(QWidget, Base):
                     config["activate_platform"] = 0
                 elif config["activate_platform"] > i:
                     config["activate_platform"] = config["activate_platform"] - 1
+
+                # 修正负载均衡接口的ID
+                config["balance_platforms"] = [
+                    v if v < i else v - 1
+                    for v in config.get("balance_platforms", [])
+                    if v != i
+                ]
                 break
 
         # 修正条目id
@@ -121,6 +130,18 @@ class PlatformPage(QWidget, Base):
         # 更新控件
         self.update_custom_platform_widgets(widget, window)
 
+    # 加入或移出负载均衡
+    def toggle_balance_platform(self, id: int, widget: FlowCard, window: FluentWindow) -> None:
+        config = self.load_config()
+        if id in config.get("balance_platforms", []):
+            config["balance_platforms"] = [v for v in config.get("balance_platforms", []) if v != id]
+        else:
+            config["balance_platforms"] = config.get("balance_platforms", []) + [id]
+        self.save_config(config)
+
+        # 更新控件
+        self.update_custom_platform_widgets(widget, window)
+
     # 显示编辑接口对话框
     def show_api_edit_page(self, id: int, widget: FlowCard, window: FluentWindow) -> None:
         PlatformEditPage(id, window).exec()
@@ -132,6 +153,10 @@ class PlatformPage(QWidget, Base):
     def show_args_edit_page(self, id: int, widget: FlowCard, window: FluentWindow) -> None:
         ArgsEditPage(id, window).exec()
 
+    # 显示密钥状态对话框
+    def show_key_stats_page(self, id: int, widget: FlowCard, window: FluentWindow) -> None:
+        KeyStatsPage(id, window).exec()
+
     # 更新自定义平台控件
     def update_custom_platform_widgets(self, widget: FlowCard, window: FluentWindow) -> None:
         config = self.load_config()
@@ -143,6 +168,8 @@ class PlatformPage(QWidget, Base):
                 drop_down_push_button = DropDownPushButton(item.get("name"))
             else:
                 drop_down_push_button = PrimaryDropDownPushButton(item.get("name"))
+            if item.get("id", 0) in config.get("balance_platforms", []):
+                drop_down_push_button.setIcon(FluentIcon.SYNC)
             drop_down_push_button.setFixedWidth(192)
             drop_down_push_button.setContentsMargins(4, 0, 4, 0) # 左、上、右、下
             widget.add_widget(drop_down_push_button)
@@ -156,6 +183,18 @@ class PlatformPage(QWidget, Base):
                 )
             )
             menu.addSeparator()
+            menu.addAction(
+                Action(
+                    FluentIcon.SYNC,
+                    (
+                        Localizer.get().platform_page_api_balance_remove
+                        if item.get("id", 0) in config.get("balance_platforms", [])
+                        else Localizer.get().platform_page_api_balance_add
+                    ),
+                    triggered = partial(self.toggle_balance_platform, item.get("id", 0), widget, window),
+                )
+            )
+            menu.addSeparator()
             menu.addAction(
                 Action(
                     FluentIcon.EDIT,
@@ -180,6 +219,14 @@ class PlatformPage(QWidget, Base):
                 )
             )
             menu.addSeparator()
+            menu.addAction(
+                Action(
+                    FluentIcon.HEART,
+                    Localizer.get().platform_page_api_key_stats,
+                    triggered = partial(self.show_key_stats_page, item.get("id", 0), widget, window),
+                )
+            )
+            menu.addSeparator()
             menu.addAction(
                 Action(
                     FluentIcon.DELETE,
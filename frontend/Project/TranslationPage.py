@@ -96,6 +96,8 @@ class TranslationPage(QWidget, Base):
         self.subscribe(Base.Event.TRANSLATION_START, lambda event, data: self.update_button_status(event, data))
         self.subscribe(Base.Event.TRANSLATION_STOP, lambda event, data: self.update_button_status(event, data))
         self.subscribe(Base.Event.TRANSLATION_STOP_DONE, self.translation_stop_done)
+        self.subscribe(Base.Event.TRANSLATION_PLAN, lambda event, data: self.update_button_status(event, data))
+        self.subscribe(Base.Event.TRANSLATION_PLAN_DONE, self.translation_plan_done)
         self.subscribe(Base.Event.TRANSLATION_UPDATE, self.translation_update)
         self.subscribe(Base.Event.CACHE_FILE_AUTO_SAVE, self.cache_file_auto_save)
         self.subscribe(Base.Event.PROJECT_STATUS_CHECK_DONE, lambda event, data: self.update_button_status(event, data))
@@ -125,7 +127,9 @@ class TranslationPage(QWidget, Base):
         self.update_time(self.data)
         self.update_line(self.data)
         self.update_token(self.data)
+        self.update_cache(self.data)
         self.update_task(self.data)
+        self.update_concurrency(self.data)
         self.update_status(self.data)
 
         # 接收到退出信号则停止
@@ -139,18 +143,22 @@ class TranslationPage(QWidget, Base):
             self.action_start.setEnabled(True)
             self.action_stop.setEnabled(False)
             self.action_export.setEnabled(False)
+            self.action_plan.setEnabled(True)
         elif Base.WORK_STATUS == Base.Status.TESTING:
             self.action_start.setEnabled(False)
             self.action_stop.setEnabled(False)
             self.action_export.setEnabled(False)
+            self.action_plan.setEnabled(False)
         elif Base.WORK_STATUS == Base.Status.TRANSLATING:
             self.action_start.setEnabled(False)
             self.action_stop.setEnabled(True)
             self.action_export.setEnabled(True)
+            self.action_plan.setEnabled(False)
         elif Base.WORK_STATUS == Base.Status.STOPPING:
             self.action_start.setEnabled(False)
             self.action_stop.setEnabled(False)
             self.action_export.setEnabled(False)
+            self.action_plan.setEnabled(False)
 
         if Base.WORK_STATUS == Base.Status.IDLE and data.get("status") == Base.TranslationStatus.TRANSLATING:
             self.action_continue.setEnabled(True)
@@ -169,6 +177,19 @@ class TranslationPage(QWidget, Base):
         # 更新继续翻译按钮状态
         self.emit(Base.Event.PROJECT_STATUS, {})
 
+    # 翻译预估完成事件
+    def translation_plan_done(self, event: int, data: dict) -> None:
+        self.emit(Base.Event.APP_TOAST_SHOW, {
+            "type": Base.ToastType.SUCCESS,
+            "message": Localizer.get().translation_page_plan_toast,
+        })
+
+        # 更新按钮状态
+        self.update_button_status(event, data)
+
+        # 更新继续翻译按钮状态
+        self.emit(Base.Event.PROJECT_STATUS, {})
+
     # 更新时间
     def update_time(self, data: dict) -> None:
         if Base.WORK_STATUS not in (Base.Status.STOPPING, Base.Status.TRANSLATING):
@@ -237,6 +258,19 @@ class TranslationPage(QWidget, Base):
             self.task.set_unit("KTask")
             self.task.set_value(f"{(task / 1000):.2f}")
 
+    # 更新并发上限
+    def update_concurrency(self, data: dict) -> None:
+        if Base.WORK_STATUS not in (Base.Status.STOPPING, Base.Status.TRANSLATING):
+            return None
+
+        concurrency = self.data.get("concurrency")
+        if concurrency is None:
+            self.concurrency.set_unit("")
+            self.concurrency.set_value(Localizer.get().none)
+        else:
+            self.concurrency.set_unit("Task")
+            self.concurrency.set_value(f"{concurrency}")
+
     # 更新 Token 数据
     def update_token(self, data: dict) -> None:
         if Base.WORK_STATUS not in (Base.Status.STOPPING, Base.Status.TRANSLATING):
@@ -262,6 +296,22 @@ class TranslationPage(QWidget, Base):
             self.speed.set_unit("KT/S")
             self.speed.set_value(f"{(speed / 1000):.2f}")
 
+    # 更新缓存命中数据
+    def update_cache(self, data: dict) -> None:
+        if Base.WORK_STATUS not in (Base.Status.STOPPING, Base.Status.TRANSLATING):
+            return None
+
+        cached_tokens = self.data.get("cached_tokens", 0)
+        if cached_tokens < 1000:
+            self.cache_hit.set_unit("Token")
+            self.cache_hit.set_value(f"{cached_tokens}")
+        elif cached_tokens < 1000 * 1000:
+            self.cache_hit.set_unit("KToken")
+            self.cache_hit.set_value(f"{(cached_tokens / 1000):.2f}")
+        else:
+            self.cache_hit.set_unit("MToken")
+            self.cache_hit.set_value(f"{(cached_tokens / 1000 / 1000):.2f}")
+
     # 更新进度环
     def update_status(self, data: dict) -> None:
         if Base.WORK_STATUS == Base.Status.STOPPING:
@@ -333,7 +383,9 @@ class TranslationPage(QWidget, Base):
         self.add_remaining_line_card(self.flow_layout, config, window)
         self.add_speed_card(self.flow_layout, config, window)
         self.add_token_card(self.flow_layout, config, window)
+        self.add_cache_card(self.flow_layout, config, window)
         self.add_task_card(self.flow_layout, config, window)
+        self.add_concurrency_card(self.flow_layout, config, window)
 
         self.container.addWidget(self.flow_container, 1)
 
@@ -351,6 +403,8 @@ class TranslationPage(QWidget, Base):
         self.command_bar_card.add_separator()
         self.add_command_bar_action_export(self.command_bar_card, config, window)
         self.command_bar_card.add_separator()
+        self.add_command_bar_action_plan(self.command_bar_card, config, window)
+        self.command_bar_card.add_separator()
         self.add_command_bar_action_timer(self.command_bar_card, config, window)
 
         # 添加信息条
@@ -427,6 +481,16 @@ class TranslationPage(QWidget, Base):
         self.token.setFixedSize(204, 204)
         parent.addWidget(self.token)
 
+    # 缓存命中
+    def add_cache_card(self, parent: QLayout, config: dict, window: FluentWindow) -> None:
+        self.cache_hit = DashboardCard(
+                title = Localizer.get().translation_page_card_cache,
+                value = Localizer.get().none,
+                unit = "",
+            )
+        self.cache_hit.setFixedSize(204, 204)
+        parent.addWidget(self.cache_hit)
+
     # 并行任务
     def add_task_card(self, parent: QLayout, config: dict, window: FluentWindow) -> None:
         self.task = DashboardCard(
@@ -437,6 +501,16 @@ class TranslationPage(QWidget, Base):
         self.task.setFixedSize(204, 204)
         parent.addWidget(self.task)
 
+    # 并发上限
+    def add_concurrency_card(self, parent: QLayout, config: dict, window: FluentWindow) -> None:
+        self.concurrency = DashboardCard(
+                title = Localizer.get().translation_page_card_concurrency,
+                value = Localizer.get().none,
+                unit = "",
+            )
+        self.concurrency.setFixedSize(204, 204)
+        parent.addWidget(self.concurrency)
+
     # 开始
     def add_command_bar_action_start(self, parent: CommandBarCard, config: dict, window: FluentWindow) -> None:
         def triggered() -> None:
@@ -501,6 +575,17 @@ class TranslationPage(QWidget, Base):
         )
         self.action_export.setEnabled(False)
 
+    # 翻译预估，可以继续翻译时预估剩余的翻译任务
+    def add_command_bar_action_plan(self, parent: CommandBarCard, config: dict, window: FluentWindow) -> None:
+        def triggered() -> None:
+            self.emit(Base.Event.TRANSLATION_PLAN, {
+                "status": Base.TranslationStatus.TRANSLATING if self.action_continue.isEnabled() else Base.TranslationStatus.UNTRANSLATED,
+            })
+
+        self.action_plan = parent.add_action(
+            Action(FluentIcon.CALENDAR, Localizer.get().translation_page_plan, parent, triggered = triggered),
+        )
+
     # 定时器
     def add_command_bar_action_timer(self, parent: CommandBarCard, config: dict, window: FluentWindow) -> None:
 
@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import threading
+
+import rapidjson as json
+
+from base.Base import Base
+from module.Cache.CacheItem import CacheItem
+
+# 缓存数据的 SQLite 存储格式，仅用于持久化，条目的计数与任务切分仍然在 CacheManager 的内存数据中进行
+# 每个任务完成后只需要按 id 更新发生变化的条目，不必像 JSON 快照一样重写全部数据
+class CacheDatabase(Base):
+
+    # 翻译过程中会发生变化的字段，单独存储为列，其余字段存储为 JSON 文本
+    MUTABLE_FIELDS: tuple[str] = (
+        "dst",
+        "status",
+        "retry_count",
+    )
+
+    # 表结构
+    SCHEMA: str = (
+        "CREATE TABLE IF NOT EXISTS items ("
+        "id INTEGER PRIMARY KEY, "
+        "status TEXT NOT NULL, "
+        "dst TEXT NOT NULL, "
+        "retry_count INTEGER NOT NULL, "
+        "data TEXT NOT NULL"
+        ")"
+    )
+
+    # 实例，每个数据库文件对应一个实例，实例内复用同一个连接
+    INSTANCES: dict[str, "CacheDatabase"] = {}
+
+    # 类线程锁
+    LOCK = threading.Lock()
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+
+        # 初始化
+        self.path = path
+        self.connection: sqlite3.Connection = None
+
+    # 获取数据库文件对应的实例
+    @classmethod
+    def get(cls, path: str) -> "CacheDatabase":
+        with cls.LOCK:
+            if path not in cls.INSTANCES:
+                cls.INSTANCES[path] = cls(path)
+
+            return cls.INSTANCES.get(path)
+
+    # 关闭数据库文件对应的连接，删除数据库文件之前调用，以免连接继续写入已删除的文件或在 Windows 上导致文件无法删除
+    @classmethod
+    def close(cls, path: str) -> None:
+        with cls.LOCK:
+            database = cls.INSTANCES.pop(path, None)
+            if database is not None and database.connection is not None:
+                database.connection.close()
+                database.connection = None
+
+    # 获取连接，首次连接时设置数据库参数并创建表，数据库文件被外部删除时重新连接
+    def connect(self) -> sqlite3.Connection:
+        if self.connection is not None and not os.path.isfile(self.path):
+            self.connection.close()
+            self.connection = None
+
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, timeout = 30, check_same_thread = False)
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+            self.connection.execute(CacheDatabase.SCHEMA)
+
+        return self.connection
+
+    # 写入全部条目，在同一个事务中重建表以替换全部数据，写入失败时保留原有数据
+    def write_items(self, items: list[CacheItem]) -> None:
+        with CacheDatabase.LOCK:
+            connection = self.connect()
+            with connection:
+                connection.execute("BEGIN")
+                connection.execute("DROP TABLE IF EXISTS items")
+                connection.execute(CacheDatabase.SCHEMA)
+                connection.executemany(
+                    "INSERT INTO items (id, status, dst, retry_count, data) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        (
+                            i,
+                            item.get_status(),
+                            item.get_dst(),
+                            item.get_retry_count(),
+                            json.dumps(
+                                {k: v for k, v in item.get_vars().items() if k not in CacheDatabase.MUTABLE_FIELDS},
+                                indent = None,
+                                ensure_ascii = False,
+                            ),
+                        )
+                        for i, item in enumerate(items)
+                    ),
+                )
+
+    # 更新条目中会发生变化的字段
+    def update_items(self, entries: list[tuple[int, CacheItem]]) -> None:
+        with CacheDatabase.LOCK:
+            connection = self.connect()
+            with connection:
+                connection.executemany(
+                    "UPDATE items SET status = ?, dst = ?, retry_count = ? WHERE id = ?",
+                    (
+                        (item.get_status(), item.get_dst(), item.get_retry_count(), i)
+                        for i, item in entries
+                    ),
+                )
+
+    # 读取全部条目
+    def read_items(self) -> list[CacheItem]:
+        items: list[CacheItem] = []
+
+        with CacheDatabase.LOCK:
+            connection = self.connect()
+            for status, dst, retry_count, data in connection.execute("SELECT status, dst, retry_count, data FROM items ORDER BY id"):
+                args: dict = json.loads(data)
+                args["status"] = status
+                args["dst"] = dst
+                args["retry_count"] = retry_count
+                items.append(CacheItem(args))
+
+        return items
@@ -1,5 +1,7 @@
 import re
 import threading
+import itertools
+from typing import Callable
 
 import tiktoken
 import tiktoken_ext
@@ -35,8 +37,37 @@ class CacheItem(BaseData):
         RENPY: str = "RENPY"                            # RENPY 游戏文本
         RPGMAKER: str = "RPGMAKER"                      # RPGMAKER 游戏文本
 
-    # 缓存 Token 数量
+    # 使用 __slots__ 以减少内存占用与属性访问开销
+    # 条目不再持有线程锁，同一条目在同一时间只会被其所属的翻译任务修改
+    __slots__ = (
+        "src",
+        "dst",
+        "extra_field",
+        "tag",
+        "row",
+        "file_type",
+        "file_path",
+        "text_type",
+        "status",
+        "retry_count",
+        "skip_internal_filter",
+        "status_callback",
+        "dst_sub_lines",
+    )
+
+    # 仅在内存中使用的字段，不写入缓存
+    TRANSIENT_FIELDS: tuple[str] = (
+        "status_callback",
+        "dst_sub_lines",
+    )
+
+    # 缓存 Token 数量，读取时不加锁，超出容量时一次性淘汰最早写入的条目，直到数量降至容量的一定比例
     TOKEN_COUNT_CACHE: dict[str, int] = {}
+    TOKEN_COUNT_CACHE_SIZE: int = 512 * 1024
+    TOKEN_COUNT_CACHE_TRIM_RATIO: float = 0.75
+
+    # 类线程锁，只在写入与淘汰时使用
+    TOKEN_COUNT_LOCK = threading.Lock()
 
     # RENPY - {w=2.3} [renpy.version_only]
     RE_RENPY = re.compile(r"\{[^{}]*\}|\[[^\[\]]*\]", flags = re.IGNORECASE)
@@ -65,13 +96,13 @@ class CacheItem(BaseData):
         self.status: str = Base.TranslationStatus.UNTRANSLATED          # 翻译状态
         self.retry_count: int = 0                                       # 重试次数，当前只有单独重试的时候才增加此计数
         self.skip_internal_filter: bool = False                         # 跳过内置过滤器
+        self.status_callback: Callable = None                           # 翻译状态变化时的回调，由所属的 CacheManager 设置
+        self.dst_sub_lines: list[str] = None                            # 已通过检查的子句译文，未通过检查的子句为 None，仅在启用逐行回收时使用
 
         # 初始化
         for k, v in args.items():
-            setattr(self, k, v)
-
-        # 线程锁
-        self.lock = threading.Lock()
+            if k in CacheItem.__slots__:
+                setattr(self, k, v)
 
         # 如果文件类型是 XLSX、TRANS、KVJSON、MESSAGEJSON，且没有文本类型，则判断实际的文本类型
         types = (CacheItem.FileType.XLSX, CacheItem.FileType.TRANS, CacheItem.FileType.KVJSON, CacheItem.FileType.MESSAGEJSON)
@@ -83,160 +114,208 @@ class CacheItem(BaseData):
             elif len(CacheItem.RE_RENPY.findall(self.get_src())) > 0:
                 self.text_type = CacheItem.TextType.RENPY
 
+    # 获取变量
+    def get_vars(self) -> dict:
+        return {
+            k: getattr(self, k)
+            for k in CacheItem.__slots__
+            if k not in CacheItem.TRANSIENT_FIELDS and isinstance(getattr(self, k), BaseData._TYPE_FILTER)
+        }
+
     # 获取原文
     def get_src(self) -> str:
-        with self.lock:
-            return self.src
+        return self.src
 
     # 设置原文
     def set_src(self, src: str) -> None:
-        with self.lock:
-            self.src = src
+        self.src = src
 
     # 获取译文
     def get_dst(self) -> str:
-        with self.lock:
-            return self.dst
+        return self.dst
 
     # 设置译文
     def set_dst(self, dst: str) -> None:
-        with self.lock:
-            # 有时候模型的回复反序列化以后会是 int 等非字符类型，所以这里要强制转换成字符串
-            # TODO:可能需要更好的处理方式
-            if isinstance(dst, str):
-                self.dst = dst
-            else:
-                self.dst = str(dst)
+        # 有时候模型的回复反序列化以后会是 int 等非字符类型，所以这里要强制转换成字符串
+        # TODO:可能需要更好的处理方式
+        if isinstance(dst, str):
+            self.dst = dst
+        else:
+            self.dst = str(dst)
 
     # 获取额外字段原文
     def get_extra_field(self) -> str:
-        with self.lock:
-            return self.extra_field
+        return self.extra_field
 
     # 设置额外字段原文
     def set_extra_field(self, extra_field: str) -> None:
-        with self.lock:
-            self.extra_field = extra_field
+        self.extra_field = extra_field
 
     # 获取标签
     def get_tag(self) -> str:
-        with self.lock:
-            return self.tag
+        return self.tag
 
     # 设置标签
     def set_tag(self, tag: str) -> None:
-        with self.lock:
-            self.tag = tag
+        self.tag = tag
 
     # 获取行号
     def get_row(self) -> int:
-        with self.lock:
-            return self.row
+        return self.row
 
     # 设置行号
     def set_row(self, row: int) -> None:
-        with self.lock:
-            self.row = row
+        self.row = row
 
     # 获取文件类型
     def get_file_type(self) -> str:
-        with self.lock:
-            return self.file_type
+        return self.file_type
 
     # 设置文件类型
     def set_file_type(self, type: str) -> None:
-        with self.lock:
-            self.file_type = type
+        self.file_type = type
 
     # 获取文件路径
     def get_file_path(self) -> str:
-        with self.lock:
-            return self.file_path
+        return self.file_path
 
     # 设置文件路径
     def set_file_path(self, path: str) -> None:
-        with self.lock:
-            self.file_path = path
+        self.file_path = path
 
     # 获取文本类型
     def get_text_type(self) -> str:
-        with self.lock:
-            return self.text_type
+        return self.text_type
 
     # 设置文本类型
     def set_text_type(self, type: str) -> None:
-        with self.lock:
-            self.text_type = type
+        self.text_type = type
 
     # 获取翻译状态
     def get_status(self) -> int:
-        with self.lock:
-            return self.status
+        return self.status
 
     # 设置翻译状态
     def set_status(self, status: int) -> None:
-        with self.lock:
-            self.status = status
+        old = self.status
+        self.status = status
+
+        if old != status and self.status_callback is not None:
+            self.status_callback(self, old, status)
+
+    # 设置翻译状态变化时的回调
+    def set_status_callback(self, status_callback: Callable) -> None:
+        self.status_callback = status_callback
 
     # 获取重试次数
     def get_retry_count(self) -> int:
-        with self.lock:
-            return self.retry_count
+        return self.retry_count
 
     # 设置重试次数
     def set_retry_count(self, retry_count: int) -> None:
-        with self.lock:
-            self.retry_count = retry_count
+        self.retry_count = retry_count
 
     # 获取跳过内置过滤器
     def get_skip_internal_filter(self) -> bool:
-        with self.lock:
-            return self.skip_internal_filter
+        return self.skip_internal_filter
 
     # 设置跳过内置过滤器
     def set_skip_internal_filter(self, skip_internal_filter: bool) -> None:
-        with self.lock:
-            self.skip_internal_filter = skip_internal_filter
+        self.skip_internal_filter = skip_internal_filter
 
     # 获取 Token 数量
     def get_token_count(self) -> int:
-        with self.lock:
-            if self.src not in CacheItem.TOKEN_COUNT_CACHE:
-                CacheItem.TOKEN_COUNT_CACHE[self.src] = len(tiktoken.get_encoding("o200k_base").encode(self.src))
+        count = CacheItem.get_token_count_from_cache(self.src)
+
+        if count is None:
+            count = len(CacheItem.get_encoding().encode(self.src, disallowed_special = ()))
+            CacheItem.set_token_count_to_cache({self.src: count})
+
+        return count
 
-            return CacheItem.TOKEN_COUNT_CACHE[self.src]
+    # 获取编码器
+    @classmethod
+    def get_encoding(cls) -> tiktoken.Encoding:
+        return tiktoken.get_encoding("o200k_base")
+
+    # 从缓存中获取 Token 数量，字典的单次读取是原子操作，不需要加锁
+    @classmethod
+    def get_token_count_from_cache(cls, src: str) -> int | None:
+        return cls.TOKEN_COUNT_CACHE.get(src)
+
+    # 向缓存中写入 Token 数量
+    @classmethod
+    def set_token_count_to_cache(cls, data: dict[str, int]) -> None:
+        with cls.TOKEN_COUNT_LOCK:
+            cls.TOKEN_COUNT_CACHE.update(data)
+
+            if len(cls.TOKEN_COUNT_CACHE) > cls.TOKEN_COUNT_CACHE_SIZE:
+                count = len(cls.TOKEN_COUNT_CACHE) - int(cls.TOKEN_COUNT_CACHE_SIZE * cls.TOKEN_COUNT_CACHE_TRIM_RATIO)
+                for src in list(itertools.islice(cls.TOKEN_COUNT_CACHE, count)):
+                    del cls.TOKEN_COUNT_CACHE[src]
 
     # 将原文切片
     def split_sub_lines(self) -> list[str]:
-        with self.lock:
-            return [sub_line for sub_line in self.src.split("\n") if sub_line.strip() != ""]
+        return [sub_line for sub_line in self.src.split("\n") if sub_line.strip() != ""]
+
+    # 获取待翻译的原文切片，跳过已通过检查的子句
+    def get_pending_sub_lines(self) -> list[str]:
+        if self.dst_sub_lines is None:
+            return self.split_sub_lines()
+        else:
+            return [src for src, dst in zip(self.split_sub_lines(), self.dst_sub_lines) if dst is None]
 
-    # 从切片中合并译文
-    def merge_sub_lines(self, dst_sub_lines: list[str], check_result: list[int]) -> tuple[str, list[str], list[int]]:
+    # 获取已通过检查的原文切片
+    def get_accepted_sub_lines(self) -> list[str]:
+        if self.dst_sub_lines is None:
+            return []
+        else:
+            return [src for src, dst in zip(self.split_sub_lines(), self.dst_sub_lines) if dst is not None]
+
+    # 从切片中合并译文，已通过检查的子句直接使用之前的译文
+    # 启用逐行回收时，记录本次通过检查的子句，以便后续只重新翻译未通过检查的子句
+    def merge_sub_lines(self, dst_sub_lines: list[str], check_result: list[int], salvage: bool = False) -> tuple[str, list[str], list[int]]:
         from module.Response.ResponseChecker import ResponseChecker
 
         # 当检查结果长度不足时，为其补全
         if len(check_result) < len(dst_sub_lines):
             check_result = check_result + [ResponseChecker.Error.NONE] * (len(dst_sub_lines) - len(check_result))
 
+        # 已通过检查的子句
+        if self.dst_sub_lines is None:
+            accepted = [None] * len(self.split_sub_lines())
+        else:
+            accepted = self.dst_sub_lines
+
         dst = ""
         check = []
+        merged = []
         for src_sub_line in self.src.split("\n"):
             if src_sub_line == "":
                 dst = dst + "\n"
             elif src_sub_line.strip() == "":
                 dst = dst + src_sub_line + "\n"
-            elif len(dst_sub_lines) > 0:
-                check.append(check_result.pop(0))
-                dst = dst + str(dst_sub_lines.pop(0)) + "\n"
-            # 冗余步骤
-            # 当跳过行数检查步骤时，原文行数可能大于译文行数，此时需要填充多出来的行数
             else:
-                check.append(ResponseChecker.Error.NONE)
-                dst = dst + "" + "\n"
+                if accepted[len(merged)] is not None:
+                    check.append(ResponseChecker.Error.NONE)
+                    dst_sub_line = accepted[len(merged)]
+                elif len(dst_sub_lines) > 0:
+                    check.append(check_result.pop(0))
+                    dst_sub_line = str(dst_sub_lines.pop(0))
+                # 冗余步骤
+                # 当跳过行数检查步骤时，原文行数可能大于译文行数，此时需要填充多出来的行数
+                else:
+                    check.append(ResponseChecker.Error.NONE)
+                    dst_sub_line = ""
+
+                merged.append(dst_sub_line if check[-1] == ResponseChecker.Error.NONE else None)
+                dst = dst + dst_sub_line + "\n"
 
         # 如果当前片段中有没通过检查的子句，则将返回结果置空，以示当前片段需要重新翻译
         if any(v != ResponseChecker.Error.NONE for v in check):
+            if salvage == True:
+                self.dst_sub_lines = merged
             return None, dst_sub_lines, check_result
         else:
+            self.dst_sub_lines = None
             return dst.removesuffix("\n"), dst_sub_lines, check_result
\ No newline at end of file
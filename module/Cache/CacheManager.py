@@ -1,20 +1,34 @@
 import os
-import time
+import bisect
+import codecs
+import hashlib
+import shutil
 import threading
+import concurrent.futures
+from json import JSONDecoder
 
 import rapidjson as json
+from tqdm import tqdm
 
 from base.Base import Base
 from module.Cache.CacheItem import CacheItem
+from module.Cache.CacheDatabase import CacheDatabase
 from module.Cache.CacheProject import CacheProject
 from module.Localizer.Localizer import Localizer
 from module.ExpertConfig import ExpertConfig
+from module.Normalizer import Normalizer
 
 class CacheManager(Base):
 
     # 缓存文件保存周期（秒）
     SAVE_INTERVAL = 15
 
+    # 读取缓存文件时每批次读取的字节数
+    LOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+    # 批量计算 Token 数量时每批次的条目数量
+    TOKEN_COUNT_BATCH_SIZE = 4096
+
     # 结尾标点符号
     END_LINE_PUNCTUATION = (
         ".",
@@ -33,6 +47,7 @@ class CacheManager(Base):
 
     # 类线程锁
     FILE_LOCK = threading.Lock()
+    JOURNAL_LOCK = threading.Lock()
 
     def __init__(self, tick: bool) -> None:
         super().__init__()
@@ -40,6 +55,20 @@ class CacheManager(Base):
         # 默认值
         self.project: CacheProject = CacheProject({})
         self.items: list[CacheItem] = []
+        self.item_index: dict[int, int] = {}
+        self.journal_count: int = 0
+        self.token_count_data: dict[str, int] = {}
+        self.status_count: dict[str, int] = {}
+        self.file_status_count: dict[str, dict[str, int]] = {}
+        self.duplicate_items: dict[int, list[CacheItem]] = {}
+        self.unpacked_chunk_count: int = 0
+
+        # 线程锁
+        self.status_lock = threading.Lock()
+        self.save_lock = threading.Lock()
+
+        # 退出信号
+        self.shut_down_event = threading.Event()
 
         # 启动定时任务
         if tick == True:
@@ -48,7 +77,7 @@ class CacheManager(Base):
 
     # 应用关闭事件
     def app_shut_down(self, event: int, data: dict) -> None:
-        self.app_shut_down = True
+        self.shut_down_event.set()
 
     # 保存缓存到文件
     def save_to_file(self, project: CacheProject = None, items: list[CacheItem] = None, output_folder: str = None) -> None:
@@ -56,15 +85,74 @@ class CacheManager(Base):
         os.makedirs(f"{output_folder}/cache", exist_ok = True)
 
         # 保存缓存到文件
+        if ExpertConfig.get().cache_database_enable == True:
+            self.save_items_to_database(items, output_folder)
+        else:
+            self.save_items_to_json(items, output_folder)
+
+        # 保存项目数据到文件
+        self.save_project_to_file(project, output_folder)
+
+    # 保存缓存到文件 - JSON
+    def save_items_to_json(self, items: list[CacheItem], output_folder: str) -> None:
+        # 轮换日志文件，写入快照期间产生的新日志会写入新的日志文件
+        self.rotate_journal(output_folder)
+
         path = f"{output_folder}/cache/items.json"
         with CacheManager.FILE_LOCK:
             try:
-                with open(path, "w", encoding = "utf-8") as writer:
+                with open(f"{path}.tmp", "w", encoding = "utf-8") as writer:
                     writer.write(json.dumps([item.get_vars() for item in items], indent = None, ensure_ascii = False))
+                os.replace(f"{path}.tmp", path)
+
+                # 快照写入成功后，已合并的日志与其他格式的缓存文件不再需要
+                CacheDatabase.close(f"{output_folder}/cache/items.db")
+                for path in (
+                    f"{output_folder}/cache/items.journal.compacting",
+                    f"{output_folder}/cache/items.db",
+                    f"{output_folder}/cache/items.db-wal",
+                    f"{output_folder}/cache/items.db-shm",
+                ):
+                    if os.path.isfile(path):
+                        os.remove(path)
             except Exception as e:
                 self.debug(Localizer.get().log_write_cache_file_fail, e)
 
-        # 保存项目数据到文件
+    # 保存缓存到文件 - 数据库
+    def save_items_to_database(self, items: list[CacheItem], output_folder: str) -> None:
+        with CacheManager.FILE_LOCK:
+            try:
+                CacheDatabase.get(f"{output_folder}/cache/items.db").write_items(items)
+
+                # 数据库写入成功后，其他格式的缓存文件不再需要
+                for path in (
+                    f"{output_folder}/cache/items.json",
+                    f"{output_folder}/cache/items.journal",
+                    f"{output_folder}/cache/items.journal.compacting",
+                ):
+                    if os.path.isfile(path):
+                        os.remove(path)
+            except Exception as e:
+                self.debug(Localizer.get().log_write_cache_file_fail, e)
+
+    # 保存发生变化的条目到文件
+    def save_items_to_file(self, items: list[CacheItem], output_folder: str) -> None:
+        if ExpertConfig.get().cache_database_enable == True:
+            # 数据库尚未创建时跳过，首次写入全部条目时会包含这些变化
+            path = f"{output_folder}/cache/items.db"
+            if not os.path.isfile(path):
+                return None
+
+            entries = [(self.item_index.get(id(item)), item) for item in items]
+            try:
+                CacheDatabase.get(path).update_items([v for v in entries if v[0] is not None])
+            except Exception as e:
+                self.debug(Localizer.get().log_write_cache_file_fail, e)
+        elif ExpertConfig.get().cache_journal_enable == True:
+            self.append_to_journal(items, output_folder)
+
+    # 保存项目数据到文件
+    def save_project_to_file(self, project: CacheProject, output_folder: str) -> None:
         path = f"{output_folder}/cache/project.json"
         with CacheManager.FILE_LOCK:
             try:
@@ -73,33 +161,167 @@ class CacheManager(Base):
             except Exception as e:
                 self.debug(Localizer.get().log_write_cache_file_fail, e)
 
+    # 追加写入缓存日志
+    def append_to_journal(self, items: list[CacheItem], output_folder: str) -> None:
+        # 只记录可能在翻译过程中发生变化的字段
+        lines = []
+        for item in items:
+            index = self.item_index.get(id(item))
+            if index is None:
+                continue
+
+            lines.append(json.dumps({
+                "id": index,
+                "dst": item.get_dst(),
+                "status": item.get_status(),
+                "retry_count": item.get_retry_count(),
+            }, indent = None, ensure_ascii = False))
+
+        if len(lines) == 0:
+            return None
+
+        os.makedirs(f"{output_folder}/cache", exist_ok = True)
+        with CacheManager.JOURNAL_LOCK:
+            try:
+                with open(f"{output_folder}/cache/items.journal", "a", encoding = "utf-8") as writer:
+                    writer.write("\n".join(lines) + "\n")
+                self.journal_count = self.journal_count + len(lines)
+            except Exception as e:
+                self.debug(Localizer.get().log_write_cache_file_fail, e)
+
+    # 轮换缓存日志，将当前日志并入待合并日志
+    def rotate_journal(self, output_folder: str) -> None:
+        path = f"{output_folder}/cache/items.journal"
+        with CacheManager.JOURNAL_LOCK:
+            try:
+                if os.path.isfile(path):
+                    with open(path, "rb") as reader, open(f"{path}.compacting", "ab") as writer:
+                        shutil.copyfileobj(reader, writer)
+                    os.remove(path)
+                self.journal_count = 0
+            except Exception as e:
+                self.debug(Localizer.get().log_write_cache_file_fail, e)
+
+    # 分批次流式读取缓存文件，解析出的条目直接构造为 CacheItem，避免同时持有完整的中间数据
+    def read_items_from_json(self, path: str) -> list[CacheItem]:
+        items: list[CacheItem] = []
+        decoder = JSONDecoder()
+        unicode_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+
+        eof = False
+        pos = 0
+        buffer = ""
+        self.print("")
+        with open(path, "rb") as reader, tqdm(total = os.path.getsize(path), desc = Localizer.get().translator_load_cache, unit = "B", unit_scale = True) as progress:
+            while True:
+                # 跳过数组起始符号、分隔符与空白符
+                while pos < len(buffer) and buffer[pos] in "[, \t\r\n":
+                    pos = pos + 1
+
+                # 缓冲区已耗尽时读取下一批次的数据
+                if pos >= len(buffer):
+                    if eof == True:
+                        break
+
+                    chunk = reader.read(CacheManager.LOAD_CHUNK_SIZE)
+                    eof = chunk == b""
+                    progress.update(len(chunk))
+                    buffer = buffer[pos:] + unicode_decoder.decode(chunk, final = eof)
+                    pos = 0
+                    continue
+
+                # 到达数组结尾
+                if buffer[pos] == "]":
+                    break
+
+                # 解析单个条目，条目不完整时读取下一批次的数据后重试
+                try:
+                    data, pos = decoder.raw_decode(buffer, pos)
+                except ValueError:
+                    if eof == True:
+                        raise
+
+                    chunk = reader.read(CacheManager.LOAD_CHUNK_SIZE)
+                    eof = chunk == b""
+                    progress.update(len(chunk))
+                    buffer = buffer[pos:] + unicode_decoder.decode(chunk, final = eof)
+                    pos = 0
+                    continue
+
+                items.append(CacheItem(data))
+        self.print("")
+
+        return items
+
+    # 回放缓存日志
+    def replay_journal(self, path: str) -> int:
+        count = 0
+        with open(path, "r", encoding = "utf-8-sig") as reader:
+            for line in reader:
+                # 进程意外退出时最后一行可能不完整，跳过无法解析的行
+                try:
+                    entry: dict = json.loads(line)
+                except Exception:
+                    continue
+
+                index = entry.get("id", -1)
+                if not isinstance(index, int) or index < 0 or index >= len(self.items):
+                    continue
+
+                item = self.items[index]
+                item.set_dst(entry.get("dst", item.get_dst()))
+                item.set_status(entry.get("status", item.get_status()))
+                item.set_retry_count(entry.get("retry_count", item.get_retry_count()))
+                count = count + 1
+
+        return count
+
     # 保存缓存到文件的定时任务
     def save_to_file_tick(self) -> None:
         while True:
-            time.sleep(self.SAVE_INTERVAL)
-
-            # 接收到退出信号则停止
-            if getattr(self, "app_shut_down", False)  == True:
+            # 接收到退出信号则立即停止，不必等待本次间隔结束
+            if self.shut_down_event.wait(self.SAVE_INTERVAL) == True:
                 break
 
             # 接收到保存信号则保存
-            if getattr(self, "save_to_file_require_flag", False)  == True:
-                # 创建上级文件夹
-                folder_path = f"{self.save_to_file_require_path}/cache"
-                os.makedirs(folder_path, exist_ok = True)
-
-                # 保存缓存到文件
+            self.save_to_file_required()
+
+    # 执行已请求的缓存保存，没有保存请求时直接返回，定时任务与需要立即保存的调用方共用
+    def save_to_file_required(self) -> None:
+        with self.save_lock:
+            if getattr(self, "save_to_file_require_flag", False) == False:
+                return None
+
+            # 创建上级文件夹
+            folder_path = f"{self.save_to_file_require_path}/cache"
+            os.makedirs(folder_path, exist_ok = True)
+
+            # 数据库模式下已有数据库，或日志模式下已有快照且日志未达到合并阈值时，只需要保存项目数据
+            if (
+                ExpertConfig.get().cache_database_enable == True
+                and os.path.isfile(f"{folder_path}/items.db")
+            ) or (
+                ExpertConfig.get().cache_database_enable != True
+                and ExpertConfig.get().cache_journal_enable == True
+                and os.path.isfile(f"{folder_path}/items.json")
+                and self.journal_count < ExpertConfig.get().cache_journal_compact_threshold
+            ):
+                self.save_project_to_file(
+                    project = self.project,
+                    output_folder = self.save_to_file_require_path,
+                )
+            else:
                 self.save_to_file(
                     project = self.project,
                     items = self.items,
                     output_folder = self.save_to_file_require_path,
                 )
 
-                # 触发事件
-                self.emit(Base.Event.CACHE_FILE_AUTO_SAVE, {})
+            # 触发事件
+            self.emit(Base.Event.CACHE_FILE_AUTO_SAVE, {})
 
-                # 重置标志
-                self.save_to_file_require_flag = False
+            # 重置标志
+            self.save_to_file_require_flag = False
 
     # 请求保存缓存到文件
     def require_save_to_file(self, output_path: str) -> None:
@@ -108,15 +330,41 @@ class CacheManager(Base):
 
     # 从文件读取数据
     def load_from_file(self, output_path: str) -> None:
+        # 优先从数据库读取数据
+        path = f"{output_path}/cache/items.db"
+        if os.path.isfile(path):
+            with CacheManager.FILE_LOCK:
+                try:
+                    self.set_items(CacheDatabase.get(path).read_items())
+                except Exception as e:
+                    self.debug(Localizer.get().log_read_cache_file_fail, e)
+        else:
+            self.load_items_from_json(output_path)
+
+        # 读取项目数据
+        self.load_project_from_file(output_path)
+
+    # 从文件读取数据 - JSON
+    def load_items_from_json(self, output_path: str) -> None:
         path = f"{output_path}/cache/items.json"
         with CacheManager.FILE_LOCK:
             try:
                 if os.path.isfile(path):
-                    with open(path, "r", encoding = "utf-8-sig") as reader:
-                        self.items = [CacheItem(item) for item in json.load(reader)]
+                    self.set_items(self.read_items_from_json(path))
             except Exception as e:
                 self.debug(Localizer.get().log_read_cache_file_fail, e)
 
+        # 在快照的基础上按顺序回放日志
+        with CacheManager.JOURNAL_LOCK:
+            for path in (f"{output_path}/cache/items.journal.compacting", f"{output_path}/cache/items.journal"):
+                try:
+                    if os.path.isfile(path):
+                        self.journal_count = self.journal_count + self.replay_journal(path)
+                except Exception as e:
+                    self.debug(Localizer.get().log_read_cache_file_fail, e)
+
+    # 从文件读取项目数据
+    def load_project_from_file(self, output_path: str) -> None:
         path = f"{output_path}/cache/project.json"
         with CacheManager.FILE_LOCK:
             try:
@@ -126,20 +374,95 @@ class CacheManager(Base):
             except Exception as e:
                 self.debug(Localizer.get().log_read_cache_file_fail, e)
 
-    # 从文件读取项目数据
-    def load_project_from_file(self, output_path: str) -> None:
-        path = f"{output_path}/cache/project.json"
+    # 从文件读取 Token 数量缓存
+    def load_token_count_from_file(self, output_path: str) -> None:
+        path = f"{output_path}/cache/token_count.json"
         with CacheManager.FILE_LOCK:
             try:
                 if os.path.isfile(path):
                     with open(path, "r", encoding = "utf-8-sig") as reader:
-                        self.project = CacheProject(json.load(reader))
+                        self.token_count_data = json.load(reader)
             except Exception as e:
                 self.debug(Localizer.get().log_read_cache_file_fail, e)
 
+    # 保存 Token 数量缓存到文件
+    def save_token_count_to_file(self, output_path: str) -> None:
+        os.makedirs(f"{output_path}/cache", exist_ok = True)
+
+        path = f"{output_path}/cache/token_count.json"
+        with CacheManager.FILE_LOCK:
+            try:
+                with open(path, "w", encoding = "utf-8") as writer:
+                    writer.write(json.dumps(self.token_count_data, indent = None, ensure_ascii = False))
+            except Exception as e:
+                self.debug(Localizer.get().log_write_cache_file_fail, e)
+
+    # 获取原文的哈希值，作为 Token 数量缓存文件的键
+    def get_src_hash(self, src: str) -> str:
+        return hashlib.blake2b(src.encode("utf-8"), digest_size = 8).hexdigest()
+
+    # 在生成片段前批量计算待翻译条目的 Token 数量
+    def prepare_token_count(self, output_path: str) -> None:
+        # 找出内存缓存中没有的原文
+        srcs: list[str] = list({
+            item.get_src() for item in self.items
+            if item.get_status() not in (Base.TranslationStatus.EXCLUDED, Base.TranslationStatus.TRANSLATED, Base.TranslationStatus.TRANSLATED_IN_PAST)
+        })
+        srcs = [src for src in srcs if CacheItem.get_token_count_from_cache(src) is None]
+        if len(srcs) == 0:
+            return None
+
+        # 优先从文件缓存中获取
+        hashes: dict[str, str] = {src: self.get_src_hash(src) for src in {item.get_src() for item in self.items}}
+        result: dict[str, int] = {
+            src: self.token_count_data.get(hashes.get(src)) for src in srcs
+            if hashes.get(src) in self.token_count_data
+        }
+
+        # 剩余的原文分批次使用多线程编码
+        # 以批次而不是单条文本为单位分发任务，编码器在编码时会释放 GIL
+        srcs = [src for src in srcs if src not in result]
+        encoding = CacheItem.get_encoding()
+        batches = [srcs[i : i + CacheManager.TOKEN_COUNT_BATCH_SIZE] for i in range(0, len(srcs), CacheManager.TOKEN_COUNT_BATCH_SIZE)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers = max(1, min(8, os.cpu_count() or 1))) as executor:
+            for batch, counts in zip(batches, executor.map(lambda batch: [len(encoding.encode(src, disallowed_special = ())) for src in batch], batches)):
+                result.update(zip(batch, counts))
+
+        # 更新内存缓存
+        CacheItem.set_token_count_to_cache(result)
+
+        # 有新计算的结果时，更新文件缓存，只保留当前项目中出现的原文
+        if len(srcs) > 0:
+            project_hashes = set(hashes.values())
+            self.token_count_data = {k: v for k, v in self.token_count_data.items() if k in project_hashes}
+            self.token_count_data.update({hashes.get(src): count for src, count in result.items()})
+            self.save_token_count_to_file(output_path)
+
     # 设置缓存数据
     def set_items(self, items: list[CacheItem]) -> None:
         self.items = items
+        self.item_index = {id(item): i for i, item in enumerate(items)}
+        self.journal_count = 0
+
+        # 统计各翻译状态的条目数量，此后由条目的翻译状态变化回调增量更新
+        with self.status_lock:
+            self.status_count = {}
+            self.file_status_count = {}
+            for item in items:
+                status = item.get_status()
+                file_status_count = self.file_status_count.setdefault(item.get_file_path(), {})
+                self.status_count[status] = self.status_count.get(status, 0) + 1
+                file_status_count[status] = file_status_count.get(status, 0) + 1
+                item.set_status_callback(self.item_status_changed)
+
+    # 条目翻译状态变化时
+    def item_status_changed(self, item: CacheItem, old: str, new: str) -> None:
+        with self.status_lock:
+            file_status_count = self.file_status_count.setdefault(item.get_file_path(), {})
+            self.status_count[old] = self.status_count.get(old, 0) - 1
+            self.status_count[new] = self.status_count.get(new, 0) + 1
+            file_status_count[old] = file_status_count.get(old, 0) - 1
+            file_status_count[new] = file_status_count.get(new, 0) + 1
 
     # 获取缓存数据
     def get_items(self) -> list[CacheItem]:
@@ -163,7 +486,13 @@ class CacheManager(Base):
 
     # 获取缓存数据数量（根据翻译状态）
     def get_item_count_by_status(self, status: int) -> int:
-        return len([item for item in self.items if item.get_status() == status])
+        with self.status_lock:
+            return self.status_count.get(status, 0)
+
+    # 获取缓存数据数量（根据文件路径与翻译状态）
+    def get_item_count_by_file_path_and_status(self, file_path: str, status: int) -> int:
+        with self.status_lock:
+            return self.file_status_count.get(file_path, {}).get(status, 0)
 
     # 生成缓存数据条目片段
     def generate_item_chunks(self, limit: int) -> list[list[CacheItem]]:
@@ -174,11 +503,22 @@ class CacheManager(Base):
         chunks: list[list[CacheItem]] = []
         preceding_chunks: list[list[CacheItem]] = []
         chunk_length: int = 0
+        unique_items: dict[str, CacheItem] = {}
+        self.duplicate_items = {}
         for i, item in enumerate(self.items):
             # 跳过 已排除、已翻译、过去已翻译 的数据
             if item.get_status() in (Base.TranslationStatus.EXCLUDED, Base.TranslationStatus.TRANSLATED, Base.TranslationStatus.TRANSLATED_IN_PAST):
                 continue
 
+            # 原文去重，重复的条目不参与翻译，在首个相同原文的条目翻译完成后直接复用其译文
+            if ExpertConfig.get().deduplication_in_translation == True:
+                key = Normalizer.normalize(item.get_src())
+                if key in unique_items:
+                    self.duplicate_items.setdefault(id(unique_items.get(key)), []).append(item)
+                    continue
+                else:
+                    unique_items[key] = item
+
             # 每个片段的第一条不判断是否超限，以避免特别长的文本导致死循环
             current_length = item.get_token_count()
             if len(chunk) == 0:
@@ -199,8 +539,129 @@ class CacheManager(Base):
             chunks.append(chunk)
             preceding_chunks.append(self.generate_preceding_chunks(chunk[-1], i))
 
+        # 合并片段
+        self.unpacked_chunk_count = len(chunks)
+        if ExpertConfig.get().chunk_packing_enable == True:
+            chunks, preceding_chunks = self.pack_item_chunks(chunks, preceding_chunks, limit, line_limit)
+
         return chunks, preceding_chunks
 
+    # 合并片段，在不超过 Token 阈值与行数阈值的前提下，将片段装入尽可能少的新片段中（最佳适应递减算法）
+    # 按顺序切分时，每个文件的最后一个片段通常远未填满，文件数量较多时会产生大量需要单独承担完整提示词开销的小片段
+    # 与按顺序切分一致，只合并同一文件中的片段，原片段作为整体装入新片段，其中的条目保持连续，装入同一新片段的原片段按原始顺序排列
+    def pack_item_chunks(self, chunks: list[list[CacheItem]], preceding_chunks: list[list[CacheItem]], limit: int, line_limit: int) -> tuple[list[list[CacheItem]], list[list[CacheItem]]]:
+        lengths = [sum(item.get_token_count() for item in chunk) for chunk in chunks]
+
+        # 按文件分组
+        groups: dict[str, list[int]] = {}
+        for i, chunk in enumerate(chunks):
+            groups.setdefault(chunk[0].get_file_path(), []).append(i)
+
+        bins: list[list[int]] = []
+        for group in groups.values():
+            group_bins: list[list[int]] = []
+            bin_lines: list[int] = []
+            spaces: list[tuple[int, int]] = []                  # 有剩余空间的新片段，按 (剩余 Token 数, 新片段索引) 排序
+            for i in sorted(group, key = lambda i: lengths[i], reverse = True):
+                # 找出剩余 Token 数足够且行数不超限的新片段中，剩余 Token 数最少的一个
+                k = bisect.bisect_left(spaces, (lengths[i], -1))
+                while k < len(spaces) and bin_lines[spaces[k][1]] + len(chunks[i]) > line_limit:
+                    k = k + 1
+
+                if k < len(spaces):
+                    space, b = spaces.pop(k)
+                    group_bins[b].append(i)
+                    bin_lines[b] = bin_lines[b] + len(chunks[i])
+                    space = space - lengths[i]
+                else:
+                    b = len(group_bins)
+                    group_bins.append([i])
+                    bin_lines.append(len(chunks[i]))
+                    space = limit - lengths[i]
+
+                if space > 0 and bin_lines[b] < line_limit:
+                    bisect.insort(spaces, (space, b))
+
+            bins.extend(group_bins)
+
+        # 按原始顺序排列，参考上文与不合并时新片段中第一个原片段的参考上文一致
+        bins = sorted((sorted(v) for v in bins), key = lambda v: v[0])
+        return (
+            [[item for i in v for item in chunks[i]] for v in bins],
+            [preceding_chunks[v[0]] for v in bins],
+        )
+
+    # 将指定条目重新切分为片段，与 generate_item_chunks 的切分规则保持一致，用于失败任务的重试
+    def split_item_chunk(self, items: list[CacheItem], limit: int) -> list[list[CacheItem]]:
+        line_limit = max(8, int(limit / 16))
+
+        chunk: list[CacheItem] = []
+        chunks: list[list[CacheItem]] = []
+        chunk_length: int = 0
+        for item in items:
+            current_length = item.get_token_count()
+            if len(chunk) == 0:
+                pass
+            elif chunk_length + current_length > limit or len(chunk) >= line_limit or item.get_file_path() != chunk[-1].get_file_path():
+                chunks.append(chunk)
+                chunk = []
+                chunk_length = 0
+
+            chunk.append(item)
+            chunk_length = chunk_length + current_length
+
+        if len(chunk) > 0:
+            chunks.append(chunk)
+
+        return chunks
+
+    # 计算不去重时的片段数量，与 generate_item_chunks 的切分规则保持一致
+    def get_item_chunk_count(self, limit: int) -> int:
+        line_limit = max(8, int(limit / 16))
+
+        count: int = 0
+        chunk_size: int = 0
+        chunk_length: int = 0
+        last_item: CacheItem = None
+        for item in self.items:
+            if item.get_status() in (Base.TranslationStatus.EXCLUDED, Base.TranslationStatus.TRANSLATED, Base.TranslationStatus.TRANSLATED_IN_PAST):
+                continue
+
+            current_length = item.get_token_count()
+            if chunk_size == 0:
+                count = count + 1
+            elif chunk_length + current_length > limit or chunk_size >= line_limit or item.get_file_path() != last_item.get_file_path():
+                count = count + 1
+                chunk_size = 0
+                chunk_length = 0
+
+            last_item = item
+            chunk_size = chunk_size + 1
+            chunk_length = chunk_length + current_length
+
+        return count
+
+    # 获取重复条目的数量与 Token 数量
+    def get_duplicate_item_count(self) -> tuple[int, int]:
+        items = [item for v in self.duplicate_items.values() for item in v]
+        return len(items), sum(item.get_token_count() for item in items)
+
+    # 将译文复制到重复条目，返回发生变化的条目
+    def fan_out_duplicate_items(self, items: list[CacheItem]) -> list[CacheItem]:
+        result: list[CacheItem] = []
+
+        for item in items:
+            if item.get_status() != Base.TranslationStatus.TRANSLATED:
+                continue
+
+            for duplicate in self.duplicate_items.get(id(item), ()):
+                if duplicate.get_status() == Base.TranslationStatus.UNTRANSLATED:
+                    duplicate.set_dst(item.get_dst())
+                    duplicate.set_status(Base.TranslationStatus.TRANSLATED)
+                    result.append(duplicate)
+
+        return result
+
     # 生成参考上文数据条目片段
     def generate_preceding_chunks(self, start_item: CacheItem, start_index: int) -> list[list[CacheItem]]:
         result: list[CacheItem] = []
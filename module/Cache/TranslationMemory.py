@@ -0,0 +1,271 @@
+import re
+import os
+import time
+import struct
+import difflib
+import hashlib
+import sqlite3
+import threading
+from typing import Self
+
+from base.Base import Base
+from module.Cache.CacheItem import CacheItem
+from module.Normalizer import Normalizer
+
+class TranslationMemory(Base):
+
+    # 翻译记忆库路径，在不同项目之间共享
+    TRANSLATION_MEMORY_PATH = "./resource/translation_memory.db"
+
+    # 单次查询的原文数量
+    QUERY_CHUNK_SIZE = 512
+
+    # 模糊匹配 - 字符 N-Gram 长度
+    SHINGLE_SIZE = 2
+
+    # 模糊匹配 - MinHash 签名分段数与每段行数，相似度约 0.6 以上的条目大概率落入同一分桶
+    LSH_BANDS = 8
+    LSH_ROWS = 4
+
+    # 模糊匹配 - 每个分桶最多读取的候选条目数量，避免高频短句拖慢查询
+    LSH_BUCKET_LIMIT = 64
+
+    # 模糊匹配 - 计算 N-Gram 前将数字统一替换，使仅有数字不同的文本（例如 \N[1] 与 \N[2]）得到相同的 N-Gram
+    RE_DIGIT = re.compile(r"\d")
+
+    # 类线程锁
+    LOCK = threading.Lock()
+
+    def __init__(self, path: str = TRANSLATION_MEMORY_PATH) -> None:
+        super().__init__()
+
+        # 初始化
+        self.path = path
+
+    @classmethod
+    def get(cls) -> Self:
+        if not hasattr(cls, "__instance__"):
+            cls.__instance__ = cls()
+
+        return cls.__instance__
+
+    # 获取连接
+    def connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path), exist_ok = True)
+        connection = sqlite3.connect(self.path, timeout = 30, check_same_thread = False)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS memory ("
+            "source_language TEXT NOT NULL, "
+            "target_language TEXT NOT NULL, "
+            "src TEXT NOT NULL, "
+            "dst TEXT NOT NULL, "
+            "updated_at REAL NOT NULL, "
+            "PRIMARY KEY (source_language, target_language, src)"
+            ")"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS lsh ("
+            "bucket INTEGER NOT NULL, "
+            "id INTEGER NOT NULL, "
+            "PRIMARY KEY (bucket, id)"
+            ") WITHOUT ROWID"
+        )
+
+        return connection
+
+    # 生成记忆库使用的原文键
+    @classmethod
+    def get_key(cls, src: str) -> str:
+        return Normalizer.normalize(src).strip()
+
+    # 查询原文对应的译文，返回 原文键 -> 译文 的字典
+    def query(self, srcs: list[str], source_language: str, target_language: str) -> dict[str, str]:
+        result: dict[str, str] = {}
+
+        keys = list({TranslationMemory.get_key(src) for src in srcs})
+        if len(keys) == 0 or not os.path.isfile(self.path):
+            return result
+
+        with TranslationMemory.LOCK:
+            connection = self.connect()
+            try:
+                for i in range(0, len(keys), TranslationMemory.QUERY_CHUNK_SIZE):
+                    chunk = keys[i : i + TranslationMemory.QUERY_CHUNK_SIZE]
+                    rows = connection.execute(
+                        "SELECT src, dst FROM memory WHERE source_language = ? AND target_language = ? "
+                        f"AND src IN ({", ".join("?" * len(chunk))})",
+                        (source_language, target_language, *chunk),
+                    )
+                    result.update(rows)
+            finally:
+                connection.close()
+
+        return result
+
+    # 添加原文与译文，已存在的条目将被覆盖
+    def add(self, pairs: list[tuple[str, str]], source_language: str, target_language: str) -> None:
+        now = time.time()
+        rows: dict[str, tuple] = {}
+        for src, dst in pairs:
+            key = TranslationMemory.get_key(src)
+            if key != "" and dst.strip() != "":
+                rows[key] = (source_language, target_language, key, dst, now)
+        if len(rows) == 0:
+            return None
+
+        with TranslationMemory.LOCK:
+            connection = self.connect()
+            try:
+                with connection:
+                    # 使用 UPSERT 而不是 REPLACE，以保持 rowid 不变，避免模糊匹配索引失效
+                    connection.executemany(
+                        "INSERT INTO memory (source_language, target_language, src, dst, updated_at) VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (source_language, target_language, src) DO UPDATE SET dst = excluded.dst, updated_at = excluded.updated_at",
+                        rows.values(),
+                    )
+
+                    # 更新模糊匹配索引
+                    keys = list(rows.keys())
+                    for i in range(0, len(keys), TranslationMemory.QUERY_CHUNK_SIZE):
+                        chunk = keys[i : i + TranslationMemory.QUERY_CHUNK_SIZE]
+                        ids = connection.execute(
+                            "SELECT rowid, src FROM memory WHERE source_language = ? AND target_language = ? "
+                            f"AND src IN ({", ".join("?" * len(chunk))})",
+                            (source_language, target_language, *chunk),
+                        ).fetchall()
+                        connection.executemany(
+                            "INSERT OR IGNORE INTO lsh (bucket, id) VALUES (?, ?)",
+                            (
+                                (bucket, id)
+                                for id, key in ids
+                                for bucket in TranslationMemory.get_buckets(key, source_language, target_language)
+                            ),
+                        )
+            finally:
+                connection.close()
+
+    # 获取字符 N-Gram 集合
+    @classmethod
+    def get_shingles(cls, key: str) -> set[str]:
+        key = cls.RE_DIGIT.sub("0", key)
+        if len(key) <= cls.SHINGLE_SIZE:
+            return {key}
+        else:
+            return {key[i : i + cls.SHINGLE_SIZE] for i in range(len(key) - cls.SHINGLE_SIZE + 1)}
+
+    # 计算 MinHash 签名，每个 N-Gram 的哈希值按 32 位切分后作为各个哈希函数的结果
+    @classmethod
+    def get_signature(cls, key: str) -> tuple[int]:
+        size = cls.LSH_BANDS * cls.LSH_ROWS * 4
+        unpack = struct.Struct(f"<{cls.LSH_BANDS * cls.LSH_ROWS}I").unpack
+        return tuple(
+            min(v) for v in zip(*(
+                unpack(hashlib.shake_128(shingle.encode("utf-8")).digest(size))
+                for shingle in cls.get_shingles(key)
+            ))
+        )
+
+    # 计算 LSH 分桶，语言对不同的条目不会落入同一分桶
+    @classmethod
+    def get_buckets(cls, key: str, source_language: str, target_language: str) -> list[int]:
+        signature = cls.get_signature(key)
+        return [
+            int.from_bytes(
+                hashlib.blake2b(
+                    f"{source_language}|{target_language}|{band}|{signature[band * cls.LSH_ROWS : (band + 1) * cls.LSH_ROWS]}".encode(),
+                    digest_size = 8,
+                ).digest(),
+                signed = True,
+            )
+            for band in range(cls.LSH_BANDS)
+        ]
+
+    # 计算两段原文的相似度，完全一致是 1，完全不同是 0
+    @classmethod
+    def get_similarity(cls, x: str, y: str) -> float:
+        return difflib.SequenceMatcher(None, x, y, autojunk = False).ratio()
+
+    # 查询相似原文，返回 原文键 -> [(原文, 译文, 相似度), ...] 的字典，按相似度降序排列
+    def query_similar(self, srcs: list[str], source_language: str, target_language: str, top_k: int, threshold: float) -> dict[str, list[tuple[str, str, float]]]:
+        result: dict[str, list[tuple[str, str, float]]] = {}
+
+        keys = list({TranslationMemory.get_key(src) for src in srcs} - {""})
+        if len(keys) == 0 or top_k <= 0 or not os.path.isfile(self.path):
+            return result
+
+        with TranslationMemory.LOCK:
+            connection = self.connect()
+            try:
+                # 通过 LSH 分桶获取候选条目，按命中分桶数量排序
+                candidates: dict[str, list[int]] = {}
+                for key in keys:
+                    votes: dict[int, int] = {}
+                    for bucket in TranslationMemory.get_buckets(key, source_language, target_language):
+                        for (id, ) in connection.execute(
+                            "SELECT id FROM lsh WHERE bucket = ? LIMIT ?",
+                            (bucket, TranslationMemory.LSH_BUCKET_LIMIT),
+                        ):
+                            votes[id] = votes.get(id, 0) + 1
+                    candidates[key] = sorted(votes, key = lambda id: votes.get(id), reverse = True)[: top_k * 4]
+
+                # 读取候选条目
+                entries: dict[int, tuple[str, str]] = {}
+                ids = list({id for v in candidates.values() for id in v})
+                for i in range(0, len(ids), TranslationMemory.QUERY_CHUNK_SIZE):
+                    chunk = ids[i : i + TranslationMemory.QUERY_CHUNK_SIZE]
+                    for id, src, dst in connection.execute(
+                        f"SELECT rowid, src, dst FROM memory WHERE rowid IN ({", ".join("?" * len(chunk))})",
+                        chunk,
+                    ):
+                        entries[id] = (src, dst)
+            finally:
+                connection.close()
+
+        # 计算实际相似度并筛选
+        for key, ids in candidates.items():
+            similar: list[tuple[str, str, float]] = []
+            for id in ids:
+                if id not in entries:
+                    continue
+
+                src, dst = entries.get(id)
+                score = TranslationMemory.get_similarity(key, src)
+                if score >= threshold:
+                    similar.append((src, dst, score))
+
+            if len(similar) > 0:
+                result[key] = sorted(similar, key = lambda v: v[2], reverse = True)[: top_k]
+
+        return result
+
+    # 将命中记忆库的待翻译条目标记为已翻译，返回命中的条目
+    # 相似度阈值大于 0 时，相似度达到阈值的模糊匹配结果也会被直接使用
+    def apply(self, items: list[CacheItem], source_language: str, target_language: str, threshold: float = 0) -> list[CacheItem]:
+        items = [item for item in items if item.get_status() == Base.TranslationStatus.UNTRANSLATED]
+        hits = self.query([item.get_src() for item in items], source_language, target_language)
+
+        # 模糊匹配
+        if threshold > 0:
+            similar = self.query_similar(
+                [item.get_src() for item in items if TranslationMemory.get_key(item.get_src()) not in hits],
+                source_language,
+                target_language,
+                top_k = 1,
+                threshold = threshold,
+            )
+            hits.update({k: v[0][1] for k, v in similar.items()})
+
+        if len(hits) == 0:
+            return []
+
+        result: list[CacheItem] = []
+        for item in items:
+            dst = hits.get(TranslationMemory.get_key(item.get_src()))
+            if dst is not None:
+                item.set_dst(dst)
+                item.set_status(Base.TranslationStatus.TRANSLATED)
+                result.append(item)
+
+        return result
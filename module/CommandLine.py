@@ -0,0 +1,140 @@
+import os
+import time
+import signal
+import threading
+
+from base.Base import Base
+from base.EventManager import EventManager
+from module.Localizer.Localizer import Localizer
+from module.Translator.Translator import Translator
+
+# 无界面模式，读取配置文件并完整执行一次翻译流程，定期输出翻译进度，以退出码表示翻译结果
+# 不依赖 Qt 与图形界面，可以在服务器、定时任务与 CI 中使用，每个进程使用独立的配置文件即可并行处理多个项目
+# 需要在首次订阅或触发事件之前设置 EventManager.HEADLESS
+class CommandLine(Base):
+
+    # 退出码
+    class ExitCode():
+
+        SUCCESS: int = 0                                        # 全部条目均已翻译
+        INCOMPLETE: int = 1                                     # 已到最大翻译轮次，仍有条目未翻译
+        ERROR: int = 2                                          # 配置文件不存在、文件读取失败、没有需要翻译的条目或翻译预估失败
+        INTERRUPTED: int = 130                                  # 收到中断信号后停止
+
+    def __init__(self, progress_interval: float) -> None:
+        super().__init__()
+
+        # 初始化
+        self.progress_interval = progress_interval
+        self.progress_time = 0.0
+        self.interrupted = False
+        self.plan_item_count = 0
+        self.translator = Translator()
+
+        # 注册事件
+        self.subscribe(Base.Event.TRANSLATION_UPDATE, self.translation_update)
+        self.subscribe(Base.Event.APP_TOAST_SHOW, self.app_toast_show)
+        self.subscribe(Base.Event.TRANSLATION_PLAN_DONE, self.translation_plan_done)
+
+    # 翻译状态更新事件，按间隔输出翻译进度
+    def translation_update(self, event: int, data: dict) -> None:
+        if time.time() - self.progress_time < self.progress_interval:
+            return None
+        self.progress_time = time.time()
+
+        line = data.get("line", 0)
+        total_line = max(line, data.get("total_line", 0))
+        elapsed = data.get("time", 0)
+        self.info(
+            Localizer.get().cli_progress.replace("{LINE}", str(line)).replace("{TOTAL}", str(total_line))
+            .replace("{PERCENT}", f"{line / max(1, total_line) * 100:.1f}").replace("{TIME}", f"{elapsed:.0f}")
+            .replace("{SPEED}", f"{line / max(1, elapsed):.2f}").replace("{TOKEN}", str(data.get("token", 0)))
+        )
+
+    # 翻译预估完成事件，记录预估的条目数量，读取文件失败或预估失败时为 0
+    def translation_plan_done(self, event: int, data: dict) -> None:
+        self.plan_item_count = data.get("item_count", 0)
+
+    # 显示 Toast 事件，无界面模式下输出到日志
+    def app_toast_show(self, event: int, data: dict) -> None:
+        if data.get("type") == Base.ToastType.ERROR:
+            self.error(data.get("message", ""))
+        elif data.get("type") == Base.ToastType.WARNING:
+            self.warning(data.get("message", ""))
+        else:
+            self.info(data.get("message", ""))
+
+    # 中断信号，第一次中断时停止翻译任务并保存进度，再次中断时立即退出
+    def interrupt(self, signum: int, frame: object) -> None:
+        if self.interrupted == True:
+            os._exit(CommandLine.ExitCode.INTERRUPTED)
+
+        self.interrupted = True
+        Base.WORK_STATUS = Base.Status.STOPPING
+        self.print("")
+        self.warning(Localizer.get().cli_interrupt)
+        self.print("")
+
+    # 执行翻译流程或翻译预估，返回退出码
+    def run(self, status: str, plan: bool) -> int:
+        # 检查配置文件
+        if not os.path.isfile(Base.CONFIG_PATH):
+            self.error(f"{Localizer.get().log_config_file_not_exist} {Base.CONFIG_PATH}")
+            self.shut_down()
+            return CommandLine.ExitCode.ERROR
+
+        config = self.load_config()
+        self.info(
+            Localizer.get().cli_start.replace("{PATH}", Base.CONFIG_PATH).replace("{INPUT}", str(config.get("input_folder")))
+            .replace("{OUTPUT}", str(config.get("output_folder")))
+        )
+
+        # 翻译流程在独立的线程中执行，主线程负责接收中断信号
+        signal.signal(signal.SIGINT, self.interrupt)
+        signal.signal(signal.SIGTERM, self.interrupt)
+        thread = threading.Thread(
+            target = self.translator.translation_plan_target if plan == True else self.translator.translation_start_target,
+            args = (status, ),
+            daemon = True,
+        )
+        thread.start()
+        while thread.is_alive():
+            thread.join(0.5)
+
+        # 等待翻译流程触发的事件处理完毕
+        EventManager.get_singleton().join()
+
+        # 停止时翻译流程直接返回，立即执行尚未处理的缓存文件写入请求，以便之后继续翻译
+        cache_manager = self.translator.cache_manager
+        cache_manager.save_to_file_required()
+
+        # 统计结果
+        translated = cache_manager.get_item_count_by_status(Base.TranslationStatus.TRANSLATED)
+        untranslated = cache_manager.get_item_count_by_status(Base.TranslationStatus.UNTRANSLATED)
+        if self.interrupted == True:
+            code = CommandLine.ExitCode.INTERRUPTED
+        elif plan == True and self.plan_item_count == 0:
+            code = CommandLine.ExitCode.ERROR
+        elif plan == True:
+            code = CommandLine.ExitCode.SUCCESS
+        elif cache_manager.get_item_count() == 0:
+            code = CommandLine.ExitCode.ERROR
+        elif untranslated > 0:
+            code = CommandLine.ExitCode.INCOMPLETE
+        else:
+            code = CommandLine.ExitCode.SUCCESS
+
+        if plan == False:
+            self.info(
+                Localizer.get().cli_result.replace("{TRANSLATED}", str(translated)).replace("{UNTRANSLATED}", str(untranslated))
+                .replace("{CODE}", str(code))
+            )
+
+        self.shut_down()
+
+        return code
+
+    # 通知各模块退出并等待事件处理完毕，缓存文件的定时保存线程随之立即结束
+    def shut_down(self) -> None:
+        self.emit(Base.Event.APP_SHUT_DOWN, {})
+        EventManager.get_singleton().join()
@@ -21,9 +21,96 @@ class ExpertConfig(Base, BaseData):
         # 双语输出文件中重复行去重
         self.deduplication_in_bilingual: bool = True
 
+        # 翻译时对原文去重，相同原文只翻译一次，译文复制到所有重复条目
+        self.deduplication_in_translation: bool = False
+
+        # 合并片段，启用后将同一文件中未填满的片段合并，以减少任务数量与提示词开销
+        self.chunk_packing_enable: bool = False
+
+        # 缓存友好的提示词布局，启用后基础提示词在所有请求中保持一致并位于最前，随片段变化的内容位于其后，以便命中接口的提示词缓存
+        self.prompt_cache_layout_enable: bool = False
+
+        # 逐行回收，启用后任务部分失败时保留通过检查的行与子句，仅重新翻译未通过检查的部分
+        self.line_salvage_enable: bool = False
+
         # 结果检查 - 重试次数达到阈值
         self.result_checker_retry_count_threshold: bool = False
 
+        # 缓存日志模式，启用后仅追加写入发生变化的条目，并定期合并为快照
+        self.cache_journal_enable: bool = False
+
+        # 缓存日志合并阈值，日志条目数达到阈值时合并为快照
+        self.cache_journal_compact_threshold: int = 20000
+
+        # 缓存数据库模式，启用后使用 SQLite 数据库保存缓存数据，并在每个任务完成后更新发生变化的条目
+        self.cache_database_enable: bool = False
+
+        # 异步请求引擎，启用后所有请求在同一个事件循环中执行，以降低高并发时的线程开销
+        self.async_request_enable: bool = False
+
+        # 异步请求引擎 - 用于生成提示词与处理回复的线程数量
+        self.async_worker_num: int = 4
+
+        # 流式请求，启用后逐段接收回复，并在回复出现退化、伪回复、行数过多等明显异常时提前中止请求，不支持 Gemini 接口
+        self.streaming_enable: bool = False
+
+        # 批量请求，启用后每一轮的全部任务一次性提交到接口的批量任务中，以更长的等待时间换取更低的价格，仅支持 OpenAI 与 Anthropic 接口
+        self.batch_request_enable: bool = False
+
+        # 批量请求 - 查询批量任务进度的间隔时间（秒）
+        self.batch_request_poll_interval: int = 60
+
+        # HTTP/2，启用后通过同一连接并发发送多个请求，需要安装 h2 库且接口支持 HTTP/2
+        self.http2_enable: bool = False
+
+        # 自适应并发，启用后以并发任务数为初始值，根据请求延迟与错误自动调整并发数
+        self.adaptive_concurrency_enable: bool = False
+
+        # 自适应并发 - 并发数下限
+        self.adaptive_concurrency_min: int = 1
+
+        # 自适应并发 - 并发数上限
+        self.adaptive_concurrency_max: int = 256
+
+        # 持续调度，启用后失败的任务立即切分并重新加入队列，而不是等待当前轮次的全部任务完成后再统一重试
+        self.continuous_scheduling_enable: bool = False
+
+        # 对冲请求，启用后请求耗时超过近期延迟的分位数时，优先使用其他密钥发送相同的请求，采用最先成功的回复并取消另一个请求，仅在启用异步请求引擎时生效
+        self.hedged_request_enable: bool = False
+
+        # 对冲请求 - 触发对冲的延迟分位数
+        self.hedged_request_percentile: float = 95.0
+
+        # 对冲请求 - 预算，对冲请求的数量不超过请求数量的一定比例
+        self.hedged_request_budget: float = 0.05
+
+        # 翻译记忆库，启用后在翻译前直接复用其他项目中相同原文的译文，并在翻译成功后写入新的译文
+        self.translation_memory_enable: bool = False
+
+        # 翻译记忆库 - 模糊匹配，启用后将相似原文的已有译文作为参考添加到提示词中
+        self.translation_memory_fuzzy_enable: bool = False
+
+        # 翻译记忆库 - 模糊匹配时每个条目最多添加的参考译文数量
+        self.translation_memory_fuzzy_top_k: int = 3
+
+        # 翻译记忆库 - 模糊匹配的最低相似度
+        self.translation_memory_fuzzy_threshold: float = 0.6
+
+        # 翻译记忆库 - 相似度达到阈值时直接使用已有译文，为 0 时禁用
+        self.translation_memory_fuzzy_apply_threshold: float = 0.0
+
+        # 翻译预估 - 并发数，为 0 时与并发任务数一致
+        self.plan_concurrency: int = 0
+
+        # 翻译预估 - 每个回复 Token 的耗时（秒），为 0 时根据项目上次翻译的实际耗时计算
+        self.plan_token_latency: float = 0.0
+
+        # 翻译预估 - 每百万输入 Token 的价格，与输出价格均为 0 时不预估费用
+        self.plan_input_price: float = 0.0
+
+        # 翻译预估 - 每百万输出 Token 的价格
+        self.plan_output_price: float = 0.0
+
         # 初始化
         del self.default
         if not os.path.isfile(ExpertConfig.EXPERT_CONFIG_PATH):
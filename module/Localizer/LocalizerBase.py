@@ -89,6 +89,7 @@ class LocalizerBase():
     log_write_file_fail: str = "文件写入失败 ..."
     log_read_cache_file_fail: str = "从文件读取缓存数据失败 ..."
     log_write_cache_file_fail: str = "向文件写入缓存数据失败 ..."
+    log_translation_memory_fail: str = "翻译记忆库读写失败 ..."
     log_load_llama_cpp_slots_num_fail: str = "无法获取 [green]llama.cpp[/] 的响应数据 ..."
     log_crash: str = "出现严重错误，程序即将退出，错误信息已保存至日志文件 ..."
     translator_max_round: str = "最大轮次"
@@ -105,9 +106,54 @@ class LocalizerBase():
     translator_stop: str = "翻译任务已停止 ..."
     translator_write: str = "翻译结果已保存至 {PATH} 目录 ..."
     translator_generate_task: str = "生成翻译任务"
+    translator_load_cache: str = "读取缓存数据"
     translator_rule_filter: str = "规则过滤已完成，共过滤 {COUNT} 个无需翻译的条目 ..."
     translator_mtool_filter: str = "MToolOptimizer 预处理已完成，共过滤 {COUNT} 个包含重复子句的条目 ..."
     translator_language_filter: str = "语言过滤已完成，共过滤 {COUNT} 个不包含目标语言的条目 ..."
+    translator_translation_memory: str = "翻译记忆库匹配已完成，共有 {COUNT} 个条目直接复用了已有的译文 ..."
+    translator_balance: str = "多平台负载均衡已启用，任务将按各接口的实际吞吐量分配到以下接口：{NAMES}"
+    translator_balance_drain: str = "接口 {NAME} 的请求成功率过低，已暂停向其分配任务 ..."
+    translator_balance_resume: str = "接口 {NAME} 的请求已恢复正常，重新向其分配任务 ..."
+    translator_balance_result: str = "接口 {NAME} - 请求 {REQUEST} 次，成功 {SUCCESS} 次，翻译 {LINE} 行"
+    translator_packing: str = "已合并未填满的片段，任务数量 {OLD} → {NEW}，节约提示词开销约 {TOKEN} Tokens ..."
+    translator_stream_abort: str = "回复出现异常，已提前中止请求 ... 原因：{REASON}，已接收 {LENGTH} 个字符"
+    translator_salvage: str = "部分失败的任务中共有 {LINE} 行译文通过检查并被保留，重试时节约 {TOKEN} Tokens ..."
+    translator_deduplication: str = "原文去重已完成，共有 {COUNT} 个重复条目将直接复用译文，节约 {TOKEN} Tokens 与 {REQUEST} 次请求 ..."
+    translator_concurrency: str = "自适应并发已启用，初始并发数为 {INITIAL}，范围为 {MIN} - {MAX} ..."
+    translator_batch_submit: str = "已将 {COUNT} 个翻译任务提交到 {BATCH} 个批量任务中，每隔 {INTERVAL} 秒查询一次进度 ..."
+    translator_batch_progress: str = "批量任务 {ID} - {STATUS}，已完成 {DONE} / {TOTAL} 个请求 ..."
+    translator_batch_done: str = "批量任务 {ID} 已结束，共取回 {COUNT} 个有效回复 ..."
+    translator_batch_cancel: str = "已取消未完成的批量任务 {ID} ..."
+    translator_batch_unsupported: str = "当前接口不支持批量请求，将使用普通请求执行翻译任务 ..."
+    translator_batch_submit_fail: str = "批量任务提交失败 ..."
+    translator_batch_poll_fail: str = "批量任务 {ID} 查询失败，将在下次查询时重试 ..."
+    translator_batch_parse_fail: str = "批量任务中请求 {ID} 的回复解析失败 ..."
+    translator_plan_start: str = "开始翻译预估，将按实际的翻译流程生成第一轮的翻译任务，不会发送任何请求 ..."
+    translator_plan_fail: str = "翻译预估失败 ..."
+    translator_plan_file: str = "文件"
+    translator_plan_line: str = "行数"
+    translator_plan_request: str = "请求"
+    translator_plan_source: str = "原文 Tokens"
+    translator_plan_prompt: str = "提示词 Tokens"
+    translator_plan_ratio: str = "开销占比"
+    translator_plan_total: str = "合计"
+    translator_plan_others: str = "其余 {COUNT} 个文件"
+    translator_plan_summary: str = "预估结果 - 请求 {REQUEST} 次，文本 {LINE} 行，输入 {PROMPT} Tokens（其中原文 {SOURCE} Tokens），预计输出 {COMPLETION} Tokens"
+    translator_plan_overhead: str = "提示词开销 - {OVERHEAD} Tokens，占输入的 {RATIO}%，其中基础提示词 {BASE} Tokens，术语表 {GLOSSARY} Tokens，参考上文 {PRECEDING} Tokens"
+    translator_plan_time: str = "预计耗时 - {TIME} 小时，并发数 {CONCURRENCY}，每个输出 Token 耗时 {LATENCY} 秒（{SOURCE}）"
+    translator_plan_latency_measured: str = "根据项目上次翻译的实际耗时计算"
+    translator_plan_latency_config: str = "专家设置或默认值"
+    translator_plan_cost: str = "预计费用 - {COST}，输入价格 {INPUT} / 百万 Tokens，输出价格 {OUTPUT} / 百万 Tokens"
+    translator_plan_note: str = "预估结果仅包含第一轮翻译，未计入失败任务的重试，输出消耗按原文长度估算 ..."
+    translator_hedge: str = "对冲请求已启用，请求耗时超过近期延迟的 P{PERCENTILE} 时发送对冲请求，预算为请求数量的 {BUDGET}% ..."
+    translator_hedge_async_only: str = "对冲请求仅在启用异步请求引擎时生效 ..."
+    translator_hedge_result: str = "对冲请求 - 发送 {HEDGE} 次（预算 {BUDGET} 次），先于原请求成功 {WIN} 次，额外消耗约 {TOKEN} Tokens"
+    translator_concurrency_change: str = "并发数已调整：{OLD} -> {NEW}（{REASON}）"
+    translator_concurrency_reason_healthy: str = "请求正常"
+    translator_concurrency_reason_latency: str = "延迟升高"
+    translator_concurrency_reason_rate_limit: str = "触发速率限制"
+    translator_concurrency_reason_server: str = "服务端错误"
+    translator_concurrency_reason_timeout: str = "请求超时"
     translator_task_response_think: str = "模型思考内容：\n"
     translator_task_response_result: str = "模型回复内容：\n"
     translator_response_check_fail: str = "译文文本未通过检查，将在下一轮次的翻译中自动重试"
@@ -117,6 +163,10 @@ class LocalizerBase():
     translator_too_many_task: str = "实时任务数较多，暂时停止显示详细结果以提升性能 ..."
     translator_no_items: str = "没有找到需要翻译的数据，请确认输入文件与项目设置是否正确 ..."
     translator_running: str = "任务正在执行中，请稍后再试 ..."
+    cli_start: str = "无界面模式 - 配置文件 {PATH}，输入文件夹 {INPUT}，输出文件夹 {OUTPUT}"
+    cli_progress: str = "翻译进度 - {LINE} / {TOTAL} 行（{PERCENT}%），耗时 {TIME} 秒，速度 {SPEED} 行/秒，消耗 {TOKEN} Tokens"
+    cli_interrupt: str = "已收到中断信号，正在停止翻译任务并保存进度，再次中断将立即退出 ..."
+    cli_result: str = "翻译已结束 - 已翻译 {TRANSLATED} 行，未翻译 {UNTRANSLATED} 行，退出码 {CODE}"
     file_checker_kana: str = "已完成假名残留检查，未发现异常条目 ..."
     file_checker_kana_full: str = "已完成假名残留检查，发现 {COUNT} 个异常条目，占比为 {PERCENT} %，结果已写入 [green]{TARGET}[/] ..."
     file_checker_hangeul: str = "已完成谚文残留检查，未发现异常条目 ..."
@@ -165,9 +215,12 @@ class LocalizerBase():
     # 接口管理
     platform_page_api_test_result: str = "接口测试结果：成功 {SUCCESS} 个，失败 {FAILURE} 个 ..."
     platform_page_api_activate: str = "激活接口"
+    platform_page_api_balance_add: str = "加入负载均衡"
+    platform_page_api_balance_remove: str = "移出负载均衡"
     platform_page_api_edit: str = "编辑接口"
     platform_page_api_args: str = "编辑参数"
     platform_page_api_test: str = "测试接口"
+    platform_page_api_key_stats: str = "密钥状态"
     platform_page_api_delete: str = "删除接口"
     platform_page_widget_add_title: str = "接口列表"
     platform_page_widget_add_content: str = "在此添加和管理任何兼容 OpenAI、Anthropic 格式的 LLM 模型接口"
@@ -190,6 +243,16 @@ class LocalizerBase():
     platform_edit_page_model_edit: str = "手动输入"
     platform_edit_page_model_sync: str = "在线获取"
 
+    # 密钥状态
+    key_stats_page_table_key: str = "密钥"
+    key_stats_page_table_request: str = "请求次数"
+    key_stats_page_table_success_rate: str = "成功率"
+    key_stats_page_table_latency: str = "平均延迟"
+    key_stats_page_table_status: str = "状态"
+    key_stats_page_table_last_error: str = "最后一次错误"
+    key_stats_page_status_healthy: str = "正常"
+    key_stats_page_status_quarantine: str = "已隔离（剩余 {SECONDS} 秒）"
+
     # 参数编辑
     args_edit_page_top_p_title: str = "top_p"
     args_edit_page_top_p_content: str = "请谨慎设置，错误的值可能导致结果异常或者请求报错"
@@ -199,6 +262,10 @@ class LocalizerBase():
     args_edit_page_presence_penalty_content: str = "请谨慎设置，错误的值可能导致结果异常或者请求报错"
     args_edit_page_frequency_penalty_title: str = "frequency_penalty"
     args_edit_page_frequency_penalty_content: str = "请谨慎设置，错误的值可能导致结果异常或者请求报错"
+    args_edit_page_rpm_limit_title: str = "每分钟请求数限制（RPM）"
+    args_edit_page_rpm_limit_content: str = "每个密钥每分钟最多发起的请求数量，达到限制时将在本地等待而不是发起请求，0 = 不限制"
+    args_edit_page_tpm_limit_title: str = "每分钟 Token 数限制（TPM）"
+    args_edit_page_tpm_limit_content: str = "每个密钥每分钟最多消耗的 Token 数量，达到限制时将在本地等待而不是发起请求，0 = 不限制"
     args_edit_page_document_link: str = "点击查看文档"
 
     # 模型列表
@@ -233,11 +300,15 @@ class LocalizerBase():
     translation_page_card_remaining_line = "剩余行数"
     translation_page_card_speed = "平均速度"
     translation_page_card_token = "累计消耗"
+    translation_page_card_cache = "缓存命中"
     translation_page_card_task = "实时任务数"
+    translation_page_card_concurrency = "并发上限"
     translation_page_alert_pause = "停止的翻译任务可以随时继续翻译，是否确定停止任务 ... ？"
     translation_page_continue = "继续翻译"
     translation_page_export = "导出翻译数据"
     translation_page_export_toast = "已根据当前的翻译数据在输出文件夹下生成翻译文件 ..."
+    translation_page_plan = "翻译预估"
+    translation_page_plan_toast = "翻译预估已完成，结果已输出到日志中 ..."
     translation_page_timer = "请设置延迟启动前要等待的时间"
 
     # 基础设置
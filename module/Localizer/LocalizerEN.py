@@ -89,6 +89,7 @@ class LocalizerEN(LocalizerBase):
     log_write_file_fail: str = "File writing failed ..."
     log_read_cache_file_fail: str = "Failed to read cached data from file ..."
     log_write_cache_file_fail: str = "Failed to write cached data to file ..."
+    log_translation_memory_fail: str = "Failed to read or write translation memory ..."
     log_load_llama_cpp_slots_num_fail: str = "Failed to get response data from [green]llama.cpp[/] ..."
     log_crash: str = "A critical error has occurred, program will now exit. Error detail has been saved to the log file ..."
     translator_max_round: str = "Max rounds"
@@ -105,9 +106,54 @@ class LocalizerEN(LocalizerBase):
     translator_stop: str = "Translation task stopped ..."
     translator_write: str = "Translation result saved to {PATH} directory ..."
     translator_generate_task: str = "Generate tasks"
+    translator_load_cache: str = "Load cache data"
     translator_rule_filter: str = "Rule filtering completed, {COUNT} entries not requiring translation filtered out ..."
     translator_mtool_filter: str = "MToolOptimizer preprocessing completed, {COUNT} entries containing duplicate clauses filtered out ..."
     translator_language_filter: str = "Language filtering completed, {COUNT} entries not containing target language filtered out ..."
+    translator_translation_memory: str = "Translation memory lookup completed, {COUNT} entries reused existing translations ..."
+    translator_balance: str = "Multi-platform load balancing enabled, tasks will be distributed by observed throughput across: {NAMES}"
+    translator_balance_drain: str = "The request success rate of API {NAME} is too low, no more tasks will be assigned to it for now ..."
+    translator_balance_resume: str = "API {NAME} has recovered, assigning tasks to it again ..."
+    translator_balance_result: str = "API {NAME} - {REQUEST} requests, {SUCCESS} successful, {LINE} lines translated"
+    translator_packing: str = "Merged underfilled chunks, tasks {OLD} → {NEW}, saving about {TOKEN} prompt tokens ..."
+    translator_stream_abort: str = "Response went wrong, request aborted early ... Reason: {REASON}, {LENGTH} characters received"
+    translator_salvage: str = "{LINE} lines from partially failed tasks passed the checks and were kept, saving {TOKEN} tokens on retries ..."
+    translator_deduplication: str = "Source deduplication completed, {COUNT} duplicate entries will reuse translations, saving {TOKEN} tokens and {REQUEST} requests ..."
+    translator_concurrency: str = "Adaptive concurrency enabled, initial concurrency is {INITIAL}, range is {MIN} - {MAX} ..."
+    translator_batch_submit: str = "Submitted {COUNT} translation tasks in {BATCH} batches, checking progress every {INTERVAL} seconds ..."
+    translator_batch_progress: str = "Batch {ID} - {STATUS}, {DONE} / {TOTAL} requests completed ..."
+    translator_batch_done: str = "Batch {ID} has ended, {COUNT} valid responses retrieved ..."
+    translator_batch_cancel: str = "Cancelled unfinished batch {ID} ..."
+    translator_batch_unsupported: str = "The current API does not support batch requests, translation tasks will use regular requests ..."
+    translator_batch_submit_fail: str = "Failed to submit batch ..."
+    translator_batch_poll_fail: str = "Failed to check batch {ID}, will retry on the next check ..."
+    translator_batch_parse_fail: str = "Failed to parse the response of request {ID} in the batch ..."
+    translator_plan_start: str = "Starting translation estimate, tasks for the first round will be generated as in a real run, no requests will be sent ..."
+    translator_plan_fail: str = "Translation estimate failed ..."
+    translator_plan_file: str = "File"
+    translator_plan_line: str = "Lines"
+    translator_plan_request: str = "Requests"
+    translator_plan_source: str = "Source Tokens"
+    translator_plan_prompt: str = "Prompt Tokens"
+    translator_plan_ratio: str = "Overhead"
+    translator_plan_total: str = "Total"
+    translator_plan_others: str = "{COUNT} other files"
+    translator_plan_summary: str = "Estimate - {REQUEST} requests, {LINE} lines, {PROMPT} input tokens ({SOURCE} source tokens), about {COMPLETION} output tokens"
+    translator_plan_overhead: str = "Prompt overhead - {OVERHEAD} tokens, {RATIO}% of input, including {BASE} base prompt tokens, {GLOSSARY} glossary tokens and {PRECEDING} preceding text tokens"
+    translator_plan_time: str = "Estimated time - {TIME} hours at concurrency {CONCURRENCY}, {LATENCY} seconds per output token ({SOURCE})"
+    translator_plan_latency_measured: str = "measured from the previous run of this project"
+    translator_plan_latency_config: str = "expert settings or default"
+    translator_plan_cost: str = "Estimated cost - {COST}, input price {INPUT} / million tokens, output price {OUTPUT} / million tokens"
+    translator_plan_note: str = "The estimate covers the first round only, retries of failed tasks are not included and output tokens are estimated from the source length ..."
+    translator_hedge: str = "Hedged requests enabled, a hedge is sent when a request takes longer than the recent P{PERCENTILE} latency, budget is {BUDGET}% of requests ..."
+    translator_hedge_async_only: str = "Hedged requests only take effect when the async request engine is enabled ..."
+    translator_hedge_result: str = "Hedged requests - {HEDGE} sent (budget {BUDGET}), {WIN} won over the original request, about {TOKEN} extra tokens consumed"
+    translator_concurrency_change: str = "Concurrency adjusted: {OLD} -> {NEW} ({REASON})"
+    translator_concurrency_reason_healthy: str = "requests healthy"
+    translator_concurrency_reason_latency: str = "latency increased"
+    translator_concurrency_reason_rate_limit: str = "rate limited"
+    translator_concurrency_reason_server: str = "server error"
+    translator_concurrency_reason_timeout: str = "request timeout"
     translator_task_response_think: str = "Model thinking:\n"
     translator_task_response_result: str = "Model response:\n"
     translator_response_check_fail: str = "Translated text failed check, will automatically retry in the next round of translation"
@@ -117,6 +163,10 @@ class LocalizerEN(LocalizerBase):
     translator_too_many_task: str = "Too many real-time tasks. Details hidden for performance ...."
     translator_no_items: str = "No translatable data was found. Please check that the input file and project settings are correct ..."
     translator_running: str = "Task is running, please try again later ..."
+    cli_start: str = "Headless mode - config file {PATH}, input folder {INPUT}, output folder {OUTPUT}"
+    cli_progress: str = "Progress - {LINE} / {TOTAL} lines ({PERCENT}%), {TIME} seconds elapsed, {SPEED} lines/s, {TOKEN} tokens used"
+    cli_interrupt: str = "Interrupt received, stopping translation and saving progress, interrupt again to exit immediately ..."
+    cli_result: str = "Translation finished - {TRANSLATED} lines translated, {UNTRANSLATED} lines untranslated, exit code {CODE}"
     file_checker_kana: str = "Kana residue check complete, no issues found ..."
     file_checker_kana_full: str = "Kana residue check complete, {COUNT} issues found, {PERCENT}%, results written to [green]{TARGET}[/] ..."
     file_checker_hangeul: str = "Hangeul residue check complete, no issues found ..."
@@ -165,9 +215,12 @@ class LocalizerEN(LocalizerBase):
     # 接口管理
     platform_page_api_test_result: str = "API test result: {SUCCESS} successful, {FAILURE} failed ..."
     platform_page_api_activate: str = "Activate API"
+    platform_page_api_balance_add: str = "Add to Load Balancing"
+    platform_page_api_balance_remove: str = "Remove from Load Balancing"
     platform_page_api_edit: str = "Edit API"
     platform_page_api_args: str = "Edit Arguments"
     platform_page_api_test: str = "Test API"
+    platform_page_api_key_stats: str = "Key Status"
     platform_page_api_delete: str = "Delete API"
     platform_page_widget_add_title: str = "API List"
     platform_page_widget_add_content: str = "Add and manage any LLM API compatible with OpenAI and Anthropic formats here"
@@ -190,6 +243,16 @@ class LocalizerEN(LocalizerBase):
     platform_edit_page_model_edit: str = "Manual Input"
     platform_edit_page_model_sync: str = "Fetch Online"
 
+    # 密钥状态
+    key_stats_page_table_key: str = "Key"
+    key_stats_page_table_request: str = "Requests"
+    key_stats_page_table_success_rate: str = "Success Rate"
+    key_stats_page_table_latency: str = "Avg Latency"
+    key_stats_page_table_status: str = "Status"
+    key_stats_page_table_last_error: str = "Last Error"
+    key_stats_page_status_healthy: str = "Healthy"
+    key_stats_page_status_quarantine: str = "Quarantined ({SECONDS}s left)"
+
     # 参数编辑
     args_edit_page_top_p_title: str = "top_p"
     args_edit_page_top_p_content: str = "Please set with caution, incorrect values may cause abnormal results or request errors"
@@ -199,6 +262,10 @@ class LocalizerEN(LocalizerBase):
     args_edit_page_presence_penalty_content: str = "Please set with caution, incorrect values may cause abnormal results or request errors"
     args_edit_page_frequency_penalty_title: str = "frequency_penalty"
     args_edit_page_frequency_penalty_content: str = "Please set with caution, incorrect values may cause abnormal results or request errors"
+    args_edit_page_rpm_limit_title: str = "Requests Per Minute Limit (RPM)"
+    args_edit_page_rpm_limit_content: str = "Maximum number of requests per minute for each key, requests wait locally instead of being sent when the limit is reached, 0 = Unlimited"
+    args_edit_page_tpm_limit_title: str = "Tokens Per Minute Limit (TPM)"
+    args_edit_page_tpm_limit_content: str = "Maximum number of tokens per minute for each key, requests wait locally instead of being sent when the limit is reached, 0 = Unlimited"
     args_edit_page_document_link: str = "Click to view documentation"
 
     # 模型列表
@@ -233,11 +300,15 @@ class LocalizerEN(LocalizerBase):
     translation_page_card_remaining_line = "Remaining Lines"
     translation_page_card_speed = "Average Speed"
     translation_page_card_token = "Total Tokens"
+    translation_page_card_cache = "Cached Tokens"
     translation_page_card_task = "Real Time Tasks"
+    translation_page_card_concurrency = "Concurrency Limit"
     translation_page_alert_pause = "Stopped translation tasks can be resumed at any time. Confirm to stop the task ... ?"
     translation_page_continue = "Continue Translation"
     translation_page_export = "Export Translation Data"
     translation_page_export_toast = "Translation files have been generated in the output folder based on the current translation data ..."
+    translation_page_plan = "Estimate"
+    translation_page_plan_toast = "Translation estimate completed, results have been written to the log ..."
     translation_page_timer = "Waiting time before delayed startup"
 
     # 基础设置
@@ -38,7 +38,7 @@ class PlatformTester(Base):
                 platform = item
                 break
 
-        # 网络代理
+        # 网络代理，请求客户端已直接设置代理，环境变量仅用于 Gemini SDK
         if config.get("proxy_enable") == False or config.get("proxy_url") == "":
             os.environ.pop("http_proxy", None)
             os.environ.pop("https_proxy", None)
@@ -78,9 +78,9 @@ class PlatformTester(Base):
                 },
             ]
 
-        # 开始测试
-        requester = TranslatorRequester(config, platform, 0)
+        # 开始测试，每个密钥单独测试，不受密钥隔离状态的影响
         for key in platform.get("api_key"):
+            requester = TranslatorRequester(config, platform | {"api_key": [key]}, 0)
             self.print("")
             self.info(f"{Localizer.get().platofrm_tester_key} - {key}")
             self.info(f"{Localizer.get().platofrm_tester_messages} - {messages}")
@@ -98,6 +98,9 @@ class PlatformTester(Base):
                 self.info(f"{Localizer.get().platofrm_tester_response_think} - {response_result}")
                 self.info(f"{Localizer.get().platofrm_tester_response_result} - {response_result}")
 
+        # 关闭测试使用的客户端
+        TranslatorRequester.close_clients()
+
         # 测试结果
         result_msg = (
             Localizer.get().platofrm_tester_result.replace("{COUNT}", f"{len(platform.get("api_key"))}")
@@ -108,6 +108,17 @@ class PromptBuilder(Base):
 
         return full_prompt, extra_log
 
+    # 构造代码示例，用于缓存友好布局，代码示例不写入基础提示词，以保证基础提示词在所有请求中保持一致
+    def build_samples(self, samples: list[str]) -> str:
+        if samples == []:
+            return ""
+        elif self.target_language == BaseLanguage.ZH:
+            return f"特别是 {"、".join(samples)} 形式的代码，必须在译文中完整保留。"
+        elif len(samples) == 1:
+            return f"Especially code in the format of {samples[0]} must be completely preserved in the translation."
+        else:
+            return f"Especially code in the format of {f"{", ".join(samples[:-1])} and {samples[-1]}"} must be completely preserved in the translation."
+
     # 构造参考上文
     def build_preceding(self, preceding_items: list[CacheItem]) -> str:
         if preceding_items == []:
@@ -122,6 +133,29 @@ class PromptBuilder(Base):
                 "Preceding Text (for reference only, no translation needed):"
                 + "\n" + "\n".join([item.get_src().strip().replace("\n", "\\n") for item in preceding_items])
             )
+
+    # 构造参考译文
+    def build_reference(self, pairs: list[tuple[str, str]]) -> str:
+        # 构建文本
+        lines = [
+            src.strip().replace("\n", "\\n") + " -> " + dst.strip().replace("\n", "\\n")
+            for src, dst in pairs
+        ]
+
+        # 返回结果
+        if lines == []:
+            return ""
+        elif self.target_language == BaseLanguage.ZH:
+            return (
+                "参考译文（相似原文的已有译文，仅用于参考）："
+                + "\n" + "\n".join(lines)
+            )
+        else:
+            return (
+                "Reference Translations (existing translations of similar source text, for reference only):"
+                + "\n" + "\n".join(lines)
+            )
+
     # 构造术语表
     def build_glossary(self, src_dict: dict) -> str:
         # 将输入字典中的所有值转换为集合
@@ -8,6 +8,7 @@ from module.Filter.RuleFilter import RuleFilter
 from module.Filter.LanguageFilter import LanguageFilter
 from module.CodeSaver import CodeSaver
 from module.PromptBuilder import PromptBuilder
+from module.ExpertConfig import ExpertConfig
 
 class ResponseChecker(Base):
 
@@ -61,7 +62,10 @@ class ResponseChecker(Base):
             len(src_dict) == len(dst_dict) # 原文与译文行数一致
             and all(str(key) in dst_dict for key in range(len(dst_dict))) # 译文的 Key 的值为从 0 开始的连续数值字符
         ):
-            return [ResponseChecker.Error.FAIL_LINE_COUNT]
+            if ExpertConfig.get().line_salvage_enable == True and self.is_salvageable(src_dict, dst_dict):
+                return self.check_lines_salvage(src_dict, dst_dict, item_dict, source_language)
+            else:
+                return [ResponseChecker.Error.FAIL_LINE_COUNT]
 
         # 逐行检查
         error = self.check_lines(src_dict, dst_dict, item_dict, source_language)
@@ -71,6 +75,38 @@ class ResponseChecker(Base):
         # 默认无错误
         return [ResponseChecker.Error.NONE]
 
+    # 判断行数错误的译文是否可以逐行回收
+    # 回收的情形：译文的 Key 均为原文的 Key 且包含最后一行，即中间若干行缺失，其余各行仍与原文一一对应
+    # 不回收的情形：仅缺失末尾若干行时，无法区分是回复被截断还是相邻行被合并导致的错位
+    # 模型常把相邻的两行合并到其中一行的 Key 下并丢弃另一行，因此与缺失行相邻的行同样不回收，见 check_lines_salvage
+    def is_salvageable(self, src_dict: dict[str, str], dst_dict: dict[str, str]) -> bool:
+        return (
+            len(dst_dict) < len(src_dict)
+            and all(key in src_dict for key in dst_dict)
+            and str(len(src_dict) - 1) in dst_dict
+        )
+
+    # 逐行检查错误 - 逐行回收，缺失的行与其相邻的行判断为行数错误，没有可以回收的行时与不回收时的结果一致
+    def check_lines_salvage(self, src_dict: dict[str, str], dst_dict: dict[str, str], item_dict: dict[str, CacheItem], source_language: str) -> list[str]:
+        keys = list(src_dict.keys())
+        missing = [key not in dst_dict for key in keys]
+        rejected = [
+            missing[i] or (i > 0 and missing[i - 1]) or (i + 1 < len(keys) and missing[i + 1])
+            for i in range(len(keys))
+        ]
+        if all(rejected):
+            return [ResponseChecker.Error.FAIL_LINE_COUNT]
+
+        check_result = self.check_lines(src_dict, self.align(src_dict, dst_dict), item_dict, source_language)
+        return [
+            ResponseChecker.Error.FAIL_LINE_COUNT if reject == True else v
+            for reject, v in zip(rejected, check_result)
+        ]
+
+    # 按原文的 Key 对齐译文，缺失的行使用空字符串填充
+    def align(self, src_dict: dict[str, str], dst_dict: dict[str, str]) -> dict[str, str]:
+        return {key: dst_dict.get(key, "") for key in src_dict.keys()}
+
     # 逐行检查错误
     def check_lines(self, src_dict: dict[str, str], dst_dict: dict[str, str], item_dict: dict[str, CacheItem], source_language: str) -> list[str]:
         check_result: list[int] = []
@@ -0,0 +1,110 @@
+import re
+
+from base.Base import Base
+from module.Localizer.Localizer import Localizer
+from module.PromptBuilder import PromptBuilder
+from module.Response.ResponseChecker import ResponseChecker
+
+# 流式回复检查器，在接收回复的过程中检查已收到的内容，回复明显异常时提前中止请求
+class StreamChecker(Base):
+
+    # 两次检查之间至少新增的字符数
+    CHECK_INTERVAL = 64
+
+    # 退化检测时检查的末尾字符数
+    TAIL_LENGTH = 256
+
+    # 回复长度上限，按原文长度的倍数计算，并为每行与整体额外预留一定长度
+    LENGTH_FACTOR = 8
+    LENGTH_MARGIN_LINE = 16
+    LENGTH_MARGIN = 1024
+
+    # 匹配翻译条目的 Key
+    RE_KEY = re.compile(r"['\"‘“](\d+)['\"’”]\s*:")
+
+    # 匹配空白字符
+    RE_WHITESPACE = re.compile(r"\s+")
+
+    def __init__(self, config: dict, src_dict: dict[str, str], api_format: str) -> None:
+        super().__init__()
+
+        # 初始化
+        self.config = config
+        self.src_dict = src_dict
+        self.api_format = api_format
+        self.think: str = ""
+        self.content: str = ""
+        self.prompt_tokens: int = 0
+        self.completion_tokens: int = 0
+        self.error: str = None
+        self.check_length: int = 0
+
+        # 原文中包含重复文本时，不进行退化检测
+        self.check_degradation = all(ResponseChecker.RE_DEGRADATION.search(v) is None for v in src_dict.values())
+
+        # 回复长度上限
+        self.length_limit = (
+            sum(len(v) for v in src_dict.values()) * StreamChecker.LENGTH_FACTOR
+            + len(src_dict) * StreamChecker.LENGTH_MARGIN_LINE
+            + StreamChecker.LENGTH_MARGIN
+        )
+
+    # 接收回复片段，回复异常时返回 False
+    def feed(self, content: str, think: str = "") -> bool:
+        self.think = self.think + (think or "")
+        self.content = self.content + (content or "")
+
+        # 每新增一定数量的字符检查一次，以降低检查的开销
+        if len(self.think) + len(self.content) - self.check_length >= StreamChecker.CHECK_INTERVAL:
+            self.check_length = len(self.think) + len(self.content)
+            self.error = self.check()
+
+        return self.error is None
+
+    # 检查已收到的内容
+    def check(self) -> str:
+        # 思考内容与回复内容均可能陷入重复循环
+        if self.check_degradation == True:
+            for text in (self.think, self.content):
+                tail = StreamChecker.RE_WHITESPACE.sub("", text[-StreamChecker.TAIL_LENGTH :])
+                if ResponseChecker.RE_DEGRADATION.search(tail) is not None:
+                    return ResponseChecker.Error.LINE_ERROR_DEGRADATION
+
+        # 仍在输出思考内容时，不检查回复内容
+        result = self.get_result()
+        if result is None:
+            return None
+
+        # 回复长度远超原文长度时，判断为 退化
+        if len(result) > self.length_limit:
+            return ResponseChecker.Error.LINE_ERROR_DEGRADATION
+
+        # 回复中包含伪回复时，判断为 伪回复残留
+        if PromptBuilder.FAKE_REPLY_ZH in result or PromptBuilder.FAKE_REPLY_EN in result:
+            return ResponseChecker.Error.LINE_ERROR_FAKE_REPLY
+
+        # 回复的行数超过原文的行数时，判断为 行数不一致
+        if self.api_format == Base.APIFormat.SAKURALLM:
+            if len(result.strip().splitlines()) > len(self.src_dict):
+                return ResponseChecker.Error.FAIL_LINE_COUNT
+        elif any(int(key) >= len(self.src_dict) for key in StreamChecker.RE_KEY.findall(result)):
+            return ResponseChecker.Error.FAIL_LINE_COUNT
+
+        return None
+
+    # 获取回复内容中思考内容之后的部分，仍在输出思考内容时返回 None
+    def get_result(self) -> str:
+        if "</think>" in self.content:
+            return self.content.split("</think>")[-1]
+        elif self.content.lstrip().startswith("<think>"):
+            return None
+        else:
+            return self.content
+
+    # 获取错误原因的文本
+    def get_error_text(self) -> str:
+        return {
+            ResponseChecker.Error.FAIL_LINE_COUNT: Localizer.get().response_checker_fail_line_count,
+            ResponseChecker.Error.LINE_ERROR_FAKE_REPLY: Localizer.get().response_checker_line_error_fake_reply,
+            ResponseChecker.Error.LINE_ERROR_DEGRADATION: Localizer.get().response_checker_line_error_degradation,
+        }.get(self.error, Localizer.get().response_checker_unknown)
@@ -0,0 +1,137 @@
+import rapidjson as json
+import openai
+import anthropic
+
+from base.Base import Base
+from module.Localizer.Localizer import Localizer
+from module.Translator.TranslatorRequester import TranslatorRequester
+
+# 批量请求器，将多个请求写入批量任务一次性提交，定期查询进度，批量任务结束后取回全部回复
+# 支持 OpenAI 与 Anthropic 的批量接口，以及实现了相同接口的兼容服务
+class BatchRequester(TranslatorRequester):
+
+    # 单个批量任务的最大请求数量，超过时拆分为多个批量任务
+    MAX_REQUESTS = 10000
+
+    # 批量任务的完成时限
+    COMPLETION_WINDOW = "24h"
+
+    # 批量任务的结束状态 - OpenAI
+    OPENAI_END_STATUS = ("completed", "failed", "expired", "cancelled")
+
+    # 判断接口是否支持批量请求
+    @classmethod
+    def is_supported(cls, platform: dict) -> bool:
+        return platform.get("api_format") in (Base.APIFormat.OPENAI, Base.APIFormat.ANTHROPIC)
+
+    # 生成单个请求的请求体，SDK 的额外参数不属于请求体，额外的请求体参数直接合并到请求体中
+    def generate_body(self, messages: list[dict]) -> dict:
+        if self.platform.get("api_format") == Base.APIFormat.ANTHROPIC:
+            args = self.generate_anthropic_args(messages, *self.get_request_args())
+        else:
+            args = self.generate_openai_args(messages, *self.get_request_args())
+
+        body = {k: v for k, v in args.items() if not k.startswith("extra_")}
+        body.update(args.get("extra_body", {}))
+
+        return body
+
+    # 提交批量任务，requests 为 (请求 ID, 提示词) 的列表，返回 {批量任务 ID: 其中的请求 ID 列表}
+    def submit(self, requests: list[tuple[str, list[dict]]]) -> dict[str, list[str]]:
+        client: openai.OpenAI | anthropic.Anthropic = self.get_client(self.platform, self.config.get("request_timeout"))
+
+        batches: dict[str, list[str]] = {}
+        for i in range(0, len(requests), BatchRequester.MAX_REQUESTS):
+            chunk = requests[i : i + BatchRequester.MAX_REQUESTS]
+            if self.platform.get("api_format") == Base.APIFormat.ANTHROPIC:
+                batch = client.messages.batches.create(
+                    requests = [{"custom_id": custom_id, "params": self.generate_body(messages)} for custom_id, messages in chunk],
+                )
+            else:
+                lines = [
+                    json.dumps(
+                        {
+                            "custom_id": custom_id,
+                            "method": "POST",
+                            "url": "/v1/chat/completions",
+                            "body": self.generate_body(messages),
+                        },
+                        ensure_ascii = False,
+                    )
+                    for custom_id, messages in chunk
+                ]
+                file = client.files.create(
+                    file = ("batch.jsonl", "\n".join(lines).encode("utf-8")),
+                    purpose = "batch",
+                )
+                batch = client.batches.create(
+                    input_file_id = file.id,
+                    endpoint = "/v1/chat/completions",
+                    completion_window = BatchRequester.COMPLETION_WINDOW,
+                )
+            batches[batch.id] = [custom_id for custom_id, _ in chunk]
+
+        return batches
+
+    # 查询批量任务的进度，返回 (是否已结束, 状态, 已完成的请求数量, 请求总数)
+    def poll(self, batch_id: str) -> tuple[bool, str, int, int]:
+        client: openai.OpenAI | anthropic.Anthropic = self.get_client(self.platform, self.config.get("request_timeout"))
+
+        if self.platform.get("api_format") == Base.APIFormat.ANTHROPIC:
+            batch = client.messages.batches.retrieve(batch_id)
+            counts = batch.request_counts
+            done = counts.succeeded + counts.errored + counts.canceled + counts.expired
+            return batch.processing_status == "ended", batch.processing_status, done, done + counts.processing
+        else:
+            batch = client.batches.retrieve(batch_id)
+            counts = batch.request_counts
+            if counts is None:
+                return batch.status in BatchRequester.OPENAI_END_STATUS, batch.status, 0, 0
+            else:
+                return batch.status in BatchRequester.OPENAI_END_STATUS, batch.status, counts.completed + counts.failed, counts.total
+
+    # 取回已结束的批量任务的全部回复，返回 {请求 ID: (skip, 思考内容, 回复内容, 输入消耗, 回复消耗, 命中缓存的输入消耗)}
+    # 失败的请求不在结果中
+    def fetch(self, batch_id: str) -> dict[str, tuple[bool, str, str, int, int, int]]:
+        client: openai.OpenAI | anthropic.Anthropic = self.get_client(self.platform, self.config.get("request_timeout"))
+
+        results: dict[str, tuple[bool, str, str, int, int, int]] = {}
+        if self.platform.get("api_format") == Base.APIFormat.ANTHROPIC:
+            for entry in client.messages.batches.results(batch_id):
+                if entry.result.type != "succeeded":
+                    continue
+
+                try:
+                    results[entry.custom_id] = self.parse_anthropic_response(entry.result.message) + (self.cached_tokens,)
+                except Exception as e:
+                    self.debug(Localizer.get().translator_batch_parse_fail.replace("{ID}", entry.custom_id), e)
+        else:
+            batch = client.batches.retrieve(batch_id)
+            if batch.output_file_id is None:
+                return results
+
+            for line in client.files.content(batch.output_file_id).text.splitlines():
+                if line.strip() == "":
+                    continue
+
+                data: dict = {}
+                try:
+                    data = json.loads(line)
+                    response: dict = data.get("response") or {}
+                    if response.get("status_code") != 200:
+                        continue
+
+                    results[data.get("custom_id")] = self.parse_openai_response(openai.types.chat.ChatCompletion.model_validate(response.get("body"))) + (self.cached_tokens,)
+                except Exception as e:
+                    self.debug(Localizer.get().translator_batch_parse_fail.replace("{ID}", str(data.get("custom_id"))), e)
+
+        return results
+
+    # 取消批量任务
+    def cancel(self, batch_id: str) -> None:
+        client: openai.OpenAI | anthropic.Anthropic = self.get_client(self.platform, self.config.get("request_timeout"))
+
+        if self.platform.get("api_format") == Base.APIFormat.ANTHROPIC:
+            client.messages.batches.cancel(batch_id)
+        else:
+            client.batches.cancel(batch_id)
@@ -0,0 +1,158 @@
+import time
+import asyncio
+import threading
+
+from base.Base import Base
+from module.Localizer.Localizer import Localizer
+from module.Translator.TranslatorRequester import TranslatorRequester
+
+# 自适应并发控制器（加性增、乘性减）
+class ConcurrencyController(Base):
+
+    # 调整原因
+    class Reason():
+
+        HEALTHY: str = "HEALTHY"                                # 请求正常
+        LATENCY: str = "LATENCY"                                # 延迟升高
+        RATE_LIMIT: str = "RATE_LIMIT"                          # 速率限制
+        SERVER: str = "SERVER"                                  # 服务端错误
+        TIMEOUT: str = "TIMEOUT"                                # 请求超时
+
+    # 发生错误时的乘性减小系数
+    DECREASE_FACTOR = 0.5
+
+    # 延迟升高时的乘性减小系数
+    LATENCY_DECREASE_FACTOR = 0.9
+
+    # 延迟容忍倍数，请求延迟超过平均延迟的倍数时视为拥塞
+    LATENCY_TOLERANCE = 3.0
+
+    # 平均延迟的平滑系数
+    LATENCY_ALPHA = 0.1
+
+    # 两次减小之间的最短间隔（秒），避免同一批并发请求的失败导致连续减小
+    DECREASE_INTERVAL = 1.0
+
+    def __init__(self, initial: int, minimum: int, maximum: int) -> None:
+        super().__init__()
+
+        # 初始化
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit: float = min(self.maximum, max(self.minimum, initial))
+        self.in_flight: int = 0
+        self.latency: float = 0.0
+        self.decrease_time: float = 0.0
+
+        # 条件变量
+        self.condition = threading.Condition()
+
+        # 异步等待并发名额时使用的事件，每个事件循环一个，释放名额时在对应的事件循环中唤醒
+        self.async_events: dict[asyncio.AbstractEventLoop, asyncio.Event] = {}
+
+        # 初始化错误原因文本
+        if not hasattr(ConcurrencyController, "REASON_TEXT_DICT"):
+            ConcurrencyController.REASON_TEXT_DICT = {
+                ConcurrencyController.Reason.HEALTHY: Localizer.get().translator_concurrency_reason_healthy,
+                ConcurrencyController.Reason.LATENCY: Localizer.get().translator_concurrency_reason_latency,
+                ConcurrencyController.Reason.RATE_LIMIT: Localizer.get().translator_concurrency_reason_rate_limit,
+                ConcurrencyController.Reason.SERVER: Localizer.get().translator_concurrency_reason_server,
+                ConcurrencyController.Reason.TIMEOUT: Localizer.get().translator_concurrency_reason_timeout,
+            }
+
+    # 获取当前并发上限
+    def get_limit(self) -> int:
+        return int(self.limit)
+
+    # 获取当前执行中的请求数量
+    def get_in_flight(self) -> int:
+        return self.in_flight
+
+    # 获取并发名额，停止任务时直接放行，以便任务尽快退出
+    def acquire(self) -> None:
+        with self.condition:
+            while self.in_flight >= int(self.limit) and Base.WORK_STATUS != Base.Status.STOPPING:
+                self.condition.wait(0.5)
+
+            self.in_flight = self.in_flight + 1
+
+    # 获取并发名额 - 异步，等待释放名额时的唤醒，停止任务时没有名额释放，因此同样设置等待上限
+    async def acquire_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.condition:
+                if self.in_flight < int(self.limit) or Base.WORK_STATUS == Base.Status.STOPPING:
+                    self.in_flight = self.in_flight + 1
+                    return None
+
+                event = self.async_events.get(loop)
+                if event is None:
+                    event = asyncio.Event()
+                    self.async_events[loop] = event
+                event.clear()
+
+            try:
+                await asyncio.wait_for(event.wait(), timeout = 0.5)
+            except asyncio.TimeoutError:
+                pass
+
+    # 释放并发名额，并根据请求结果调整并发上限
+    def release(self, error_type: str, latency: float) -> None:
+        with self.condition:
+            self.in_flight = self.in_flight - 1
+
+            old = int(self.limit)
+            reason = self.adjust(error_type, latency)
+            new = int(self.limit)
+
+            self.condition.notify_all()
+            self.notify_async()
+
+        if new != old:
+            self.info(Localizer.get().translator_concurrency_change.replace("{OLD}", str(old)).replace("{NEW}", str(new)).replace("{REASON}", ConcurrencyController.REASON_TEXT_DICT.get(reason, "")))
+
+    # 唤醒各个事件循环中等待并发名额的协程，已关闭的事件循环直接移除
+    def notify_async(self) -> None:
+        for loop, event in list(self.async_events.items()):
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                del self.async_events[loop]
+
+    # 调整并发上限，返回调整原因
+    def adjust(self, error_type: str, latency: float) -> str:
+        now = time.time()
+
+        # 速率限制、服务端错误、请求超时时乘性减小
+        if error_type in (TranslatorRequester.Error.RATE_LIMIT, TranslatorRequester.Error.SERVER, TranslatorRequester.Error.TIMEOUT):
+            if now - self.decrease_time >= max(ConcurrencyController.DECREASE_INTERVAL, self.latency):
+                self.decrease_time = now
+                self.limit = max(self.minimum, self.limit * ConcurrencyController.DECREASE_FACTOR)
+
+            return {
+                TranslatorRequester.Error.RATE_LIMIT: ConcurrencyController.Reason.RATE_LIMIT,
+                TranslatorRequester.Error.SERVER: ConcurrencyController.Reason.SERVER,
+                TranslatorRequester.Error.TIMEOUT: ConcurrencyController.Reason.TIMEOUT,
+            }.get(error_type)
+
+        # 其他错误与并发数无关，不做调整
+        if error_type is not None:
+            return None
+
+        # 延迟明显高于平均延迟时小幅减小，否则加性增大
+        if self.latency > 0 and latency > self.latency * ConcurrencyController.LATENCY_TOLERANCE:
+            reason = ConcurrencyController.Reason.LATENCY
+            if now - self.decrease_time >= max(ConcurrencyController.DECREASE_INTERVAL, self.latency):
+                self.decrease_time = now
+                self.limit = max(self.minimum, self.limit * ConcurrencyController.LATENCY_DECREASE_FACTOR)
+        else:
+            reason = ConcurrencyController.Reason.HEALTHY
+            self.limit = min(self.maximum, self.limit + 1 / max(1, self.limit))
+
+        # 更新平均延迟
+        if self.latency == 0:
+            self.latency = latency
+        else:
+            self.latency = self.latency + ConcurrencyController.LATENCY_ALPHA * (latency - self.latency)
+
+        return reason
@@ -0,0 +1,66 @@
+import threading
+from collections import deque
+
+from base.Base import Base
+from module.Localizer.Localizer import Localizer
+
+# 对冲请求控制器，请求耗时超过近期延迟的分位数时，允许发送一个相同的请求，并按预算限制对冲请求的数量
+class HedgeController(Base):
+
+    # 延迟样本的窗口大小
+    WINDOW = 256
+
+    # 样本数量达到阈值前不发送对冲请求
+    MIN_SAMPLES = 16
+
+    # 发送对冲请求前的最短等待时间（秒）
+    MIN_DELAY = 1.0
+
+    def __init__(self, percentile: float, budget: float) -> None:
+        super().__init__()
+
+        # 初始化
+        self.percentile = min(99.0, max(50.0, percentile))
+        self.budget = max(0.0, budget)
+        self.latencies: deque[float] = deque(maxlen = HedgeController.WINDOW)
+        self.request: int = 0                                   # 请求数量
+        self.hedge: int = 0                                     # 对冲请求数量
+        self.win: int = 0                                       # 对冲请求先于原请求成功的次数
+        self.token: int = 0                                     # 对冲请求额外消耗的 Token 数量
+
+        # 线程锁
+        self.lock = threading.Lock()
+
+    # 记录一次请求，并返回发送对冲请求前的等待时间，样本数量不足时返回 None
+    def start(self) -> float:
+        with self.lock:
+            self.request = self.request + 1
+            if len(self.latencies) < HedgeController.MIN_SAMPLES:
+                return None
+
+            latencies = sorted(self.latencies)
+            return max(HedgeController.MIN_DELAY, latencies[min(len(latencies) - 1, int(len(latencies) * self.percentile / 100))])
+
+    # 尝试发送对冲请求，对冲请求的数量超过预算时返回 False
+    def try_acquire(self) -> bool:
+        with self.lock:
+            if self.hedge + 1 > self.request * self.budget:
+                return False
+
+            self.hedge = self.hedge + 1
+            return True
+
+    # 记录成功请求的延迟
+    def record(self, latency: float) -> None:
+        with self.lock:
+            self.latencies.append(latency)
+
+    # 记录对冲的结果，token 为未被采用的请求消耗的 Token 数量
+    def report(self, win: bool, token: int) -> None:
+        with self.lock:
+            self.win = self.win + (1 if win == True else 0)
+            self.token = self.token + token
+
+    # 输出对冲请求的统计数据
+    def print_result(self) -> None:
+        self.info(Localizer.get().translator_hedge_result.replace("{HEDGE}", str(self.hedge)).replace("{BUDGET}", str(int(self.request * self.budget))).replace("{WIN}", str(self.win)).replace("{TOKEN}", str(self.token)))
@@ -0,0 +1,124 @@
+import math
+import threading
+import importlib.util
+
+import httpx
+
+from base.Base import Base
+from module.ExpertConfig import ExpertConfig
+
+# HTTP 连接池，按 接口地址 + 代理地址 共享连接，同一接口的所有密钥与所有请求复用已建立的连接
+# OpenAI 与 Anthropic SDK 均基于 httpx，直接使用 httpx 的客户端，可以在两者之间共享
+# 连接数在客户端创建时按当前的并发任务数确定，翻译任务结束时关闭全部客户端，下次翻译时按新的并发任务数重新创建
+class HttpClientPool(Base):
+
+    # 连接超时时间（秒）
+    CONNECT_TIMEOUT = 10.0
+
+    # 空闲连接的保持时间（秒），多数服务端会在 60 秒左右关闭空闲连接
+    KEEPALIVE_EXPIRY = 30.0
+
+    # 每个客户端分片的最大连接数
+    # 连接池在分配连接时需要遍历全部连接，并发数较大时开销显著，因此按并发数将请求分散到多个客户端分片
+    SHARD_CONNECTIONS = 32
+
+    # 同步客户端，按 接口地址 + 代理地址 + 分片 缓存，在翻译任务结束时关闭
+    CLIENTS: dict[tuple[str, str, int], httpx.Client] = {}
+
+    # 异步客户端，与事件循环绑定，在事件循环结束前关闭
+    ASYNC_CLIENTS: dict[tuple[str, str, int], httpx.AsyncClient] = {}
+
+    # 分片轮询索引
+    SHARD_INDEX: int = 0
+
+    # 类线程锁
+    LOCK = threading.Lock()
+
+    # 获取代理地址，未启用代理时返回 None
+    @classmethod
+    def get_proxy(cls, config: dict) -> str:
+        if config.get("proxy_enable", False) == False or config.get("proxy_url", "") == "":
+            return None
+        else:
+            return config.get("proxy_url")
+
+    # 获取连接数，与并发任务数一致，启用自适应并发时与并发数上限一致，避免请求在连接池中排队
+    # 启用对冲请求时，按对冲预算额外预留连接，对冲请求仅在启用异步请求引擎时生效
+    @classmethod
+    def get_connections(cls, config: dict) -> int:
+        connections = config.get("batch_size", 0)
+        if ExpertConfig.get().adaptive_concurrency_enable == True:
+            connections = max(connections, ExpertConfig.get().adaptive_concurrency_max)
+        if ExpertConfig.get().hedged_request_enable == True and ExpertConfig.get().async_request_enable == True:
+            connections = connections + math.ceil(connections * max(0.0, ExpertConfig.get().hedged_request_budget))
+
+        return max(1, connections)
+
+    # 判断是否启用 HTTP/2，需要安装 h2 库（pip install httpx[http2]）
+    @classmethod
+    def is_http2_enabled(cls) -> bool:
+        return ExpertConfig.get().http2_enable == True and importlib.util.find_spec("h2") is not None
+
+    # 生成客户端参数，代理地址直接设置在客户端上，优先于环境变量中的代理设置
+    # 超时时间由 SDK 在每个请求中单独设置
+    @classmethod
+    def get_client_args(cls, config: dict, connections: int) -> dict:
+        return {
+            "proxy": cls.get_proxy(config),
+            "http2": cls.is_http2_enabled(),
+            "limits": httpx.Limits(
+                max_connections = connections,
+                max_keepalive_connections = connections,
+                keepalive_expiry = HttpClientPool.KEEPALIVE_EXPIRY,
+            ),
+            "follow_redirects": True,
+        }
+
+    # 轮询选择分片，返回 (缓存键, 分片的连接数)
+    @classmethod
+    def get_key(cls, config: dict, url: str) -> tuple[tuple[str, str, int], int]:
+        connections = cls.get_connections(config)
+        shards = -(-connections // HttpClientPool.SHARD_CONNECTIONS)
+        cls.SHARD_INDEX = (cls.SHARD_INDEX + 1) % shards
+
+        return (url, cls.get_proxy(config), cls.SHARD_INDEX), -(-connections // shards)
+
+    # 获取客户端
+    @classmethod
+    def get_client(cls, config: dict, url: str) -> httpx.Client:
+        with cls.LOCK:
+            key, connections = cls.get_key(config, url)
+            if key not in cls.CLIENTS:
+                cls.CLIENTS[key] = httpx.Client(**cls.get_client_args(config, connections))
+
+            return cls.CLIENTS.get(key)
+
+    # 获取客户端 - 异步
+    @classmethod
+    def get_client_async(cls, config: dict, url: str) -> httpx.AsyncClient:
+        with cls.LOCK:
+            key, connections = cls.get_key(config, url)
+            if key not in cls.ASYNC_CLIENTS:
+                cls.ASYNC_CLIENTS[key] = httpx.AsyncClient(**cls.get_client_args(config, connections))
+
+            return cls.ASYNC_CLIENTS.get(key)
+
+    # 关闭同步客户端，在翻译任务结束时调用
+    @classmethod
+    def close(cls) -> None:
+        with cls.LOCK:
+            clients = list(cls.CLIENTS.values())
+            cls.CLIENTS = {}
+
+        for client in clients:
+            client.close()
+
+    # 关闭异步客户端，需要在创建客户端的事件循环结束前调用
+    @classmethod
+    async def close_async(cls) -> None:
+        with cls.LOCK:
+            clients = list(cls.ASYNC_CLIENTS.values())
+            cls.ASYNC_CLIENTS = {}
+
+        for client in clients:
+            await client.aclose()
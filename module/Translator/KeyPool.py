@@ -0,0 +1,100 @@
+import time
+import threading
+
+from base.Base import Base
+
+# 密钥池，记录每个密钥的请求结果，暂时隔离持续失败的密钥，优先使用状态正常的密钥
+class KeyPool(Base):
+
+    # 首次隔离的时长（秒），连续失败时按指数增长
+    QUARANTINE_BASE = 5.0
+
+    # 隔离时长上限（秒）
+    QUARANTINE_MAX = 600.0
+
+    # 平均延迟的平滑系数
+    LATENCY_ALPHA = 0.2
+
+    # 密钥统计数据，按 接口地址 + 密钥 记录，在不同翻译任务之间共享，以便在接口页面中查看
+    STATS: dict[tuple[str, str], dict] = {}
+
+    # 密钥轮询索引
+    KEY_INDEX: int = 0
+
+    # 类线程锁
+    LOCK = threading.Lock()
+
+    # 获取密钥的统计数据
+    @classmethod
+    def get_stat(cls, platform: dict, api_key: str) -> dict:
+        key = (platform.get("api_url"), api_key)
+        if key not in cls.STATS:
+            cls.STATS[key] = {
+                "request": 0,                                   # 请求次数
+                "success": 0,                                   # 成功次数
+                "latency": 0.0,                                 # 平均延迟的平滑值
+                "failure": 0,                                   # 连续失败次数
+                "quarantine_until": 0.0,                        # 隔离结束时间
+                "last_error": "",                               # 最后一次错误信息
+                "last_error_time": 0.0,                         # 最后一次错误时间
+            }
+
+        return cls.STATS.get(key)
+
+    # 获取可用的密钥，即未处于隔离状态的密钥
+    # 所有密钥都处于隔离状态时，返回最早结束隔离的密钥，以免请求完全停止
+    @classmethod
+    def get_available_keys(cls, platform: dict) -> list[str]:
+        keys: list[str] = platform.get("api_key", [])
+
+        with cls.LOCK:
+            now = time.time()
+            available = [api_key for api_key in keys if cls.get_stat(platform, api_key).get("quarantine_until") <= now]
+            if len(available) == 0 and len(keys) > 0:
+                available = [min(keys, key = lambda api_key: cls.get_stat(platform, api_key).get("quarantine_until"))]
+
+        return available
+
+    # 在可用的密钥中轮询选择密钥，指定 exclude 时优先选择其他密钥
+    @classmethod
+    def select(cls, platform: dict, exclude: str = None) -> str:
+        keys = cls.get_available_keys(platform)
+        if len(keys) == 0:
+            return ""
+        elif len(keys) > 1 and exclude in keys:
+            keys.remove(exclude)
+
+        with cls.LOCK:
+            cls.KEY_INDEX = (cls.KEY_INDEX + 1) % len(keys)
+            return keys[cls.KEY_INDEX]
+
+    # 记录请求结果，密钥相关的错误（速率限制、鉴权失败、额度耗尽）将使密钥进入隔离状态
+    @classmethod
+    def report(cls, platform: dict, api_key: str, success: bool, quarantine: bool, latency: float, error: str) -> None:
+        with cls.LOCK:
+            stat = cls.get_stat(platform, api_key)
+            stat["request"] = stat.get("request") + 1
+
+            if success == True:
+                stat["success"] = stat.get("success") + 1
+                stat["failure"] = 0
+                if stat.get("latency") == 0:
+                    stat["latency"] = latency
+                else:
+                    stat["latency"] = stat.get("latency") + KeyPool.LATENCY_ALPHA * (latency - stat.get("latency"))
+            else:
+                stat["last_error"] = error
+                stat["last_error_time"] = time.time()
+
+            if quarantine == True:
+                stat["failure"] = stat.get("failure") + 1
+                stat["quarantine_until"] = time.time() + min(
+                    KeyPool.QUARANTINE_MAX,
+                    KeyPool.QUARANTINE_BASE * 2 ** min(16, stat.get("failure") - 1),
+                )
+
+    # 获取平台中各个密钥的统计数据
+    @classmethod
+    def get_stats(cls, platform: dict) -> list[tuple[str, dict]]:
+        with cls.LOCK:
+            return [(api_key, cls.get_stat(platform, api_key).copy()) for api_key in platform.get("api_key", [])]
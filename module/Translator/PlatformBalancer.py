@@ -0,0 +1,123 @@
+import time
+import threading
+
+from base.Base import Base
+from module.Localizer.Localizer import Localizer
+
+# 多平台负载均衡器，按各平台的实际吞吐量分配并发请求
+class PlatformBalancer(Base):
+
+    # 统计数据的平滑系数
+    ALPHA = 0.2
+
+    # 样本数量达到阈值前，使用已知平台中的最大权重，以便尽快收集数据
+    MIN_SAMPLES = 4
+
+    # 成功率低于阈值时停止向平台分配任务
+    DRAIN_THRESHOLD = 0.25
+
+    # 停止分配任务的平台，每隔一段时间（秒）发送一个探测请求，成功率恢复后重新分配任务
+    PROBE_INTERVAL = 15.0
+
+    def __init__(self, platforms: list[dict]) -> None:
+        super().__init__()
+
+        # 初始化
+        self.platforms = platforms
+        self.stats: dict[int, dict] = {
+            platform.get("id"): {
+                "samples": 0,                                   # 已完成的请求数量
+                "in_flight": 0,                                 # 执行中的请求数量
+                "success": 0,                                   # 成功请求的数量
+                "success_rate": 1.0,                            # 成功率的平滑值
+                "throughput": 0.0,                              # 每个请求每秒翻译行数的平滑值
+                "line": 0,                                      # 已翻译的行数
+                "drained": False,                               # 是否已停止分配任务
+                "probe_time": 0.0,                              # 上次发送探测请求的时间
+            }
+            for platform in platforms
+        }
+
+        # 线程锁
+        self.lock = threading.Lock()
+
+    # 获取平台的权重
+    def get_weight(self, stat: dict, default: float) -> float:
+        if stat.get("samples") < PlatformBalancer.MIN_SAMPLES:
+            return default
+        else:
+            return max(1e-6, stat.get("throughput"))
+
+    # 选择平台，在执行中的请求数与权重之比最小的平台上执行请求
+    def acquire(self) -> dict:
+        with self.lock:
+            now = time.time()
+
+            # 停止分配任务的平台，且当前没有执行中的请求时，定期发送探测请求
+            for platform in self.platforms:
+                stat = self.stats.get(platform.get("id"))
+                if stat.get("drained") == True and stat.get("in_flight") == 0 and now - stat.get("probe_time") >= PlatformBalancer.PROBE_INTERVAL:
+                    stat["probe_time"] = now
+                    stat["in_flight"] = stat.get("in_flight") + 1
+                    return platform
+
+            # 尚未收集到足够数据的平台，使用已知平台中的最大权重
+            default = max(
+                [stat.get("throughput") for stat in self.stats.values() if stat.get("samples") >= PlatformBalancer.MIN_SAMPLES and stat.get("drained") == False],
+                default = 1.0,
+            )
+
+            candidates = [platform for platform in self.platforms if self.stats.get(platform.get("id")).get("drained") == False]
+            if len(candidates) == 0:
+                candidates = self.platforms
+
+            platform = min(
+                candidates,
+                key = lambda platform: (
+                    (self.stats.get(platform.get("id")).get("in_flight") + 1)
+                    / self.get_weight(self.stats.get(platform.get("id")), default)
+                ),
+            )
+            stat = self.stats.get(platform.get("id"))
+            stat["in_flight"] = stat.get("in_flight") + 1
+
+            return platform
+
+    # 释放平台，并根据请求结果更新统计数据
+    def release(self, platform: dict, success: bool, line: int, latency: float) -> None:
+        with self.lock:
+            stat = self.stats.get(platform.get("id"))
+            stat["in_flight"] = stat.get("in_flight") - 1
+            stat["samples"] = stat.get("samples") + 1
+            stat["success"] = stat.get("success") + (1 if success == True else 0)
+            stat["line"] = stat.get("line") + line
+
+            # 更新平滑值，首个样本直接作为初始值
+            throughput = line / max(0.001, latency)
+            if stat.get("samples") == 1:
+                stat["success_rate"] = 1.0 if success == True else 0.0
+                stat["throughput"] = throughput
+            else:
+                stat["success_rate"] = stat.get("success_rate") + PlatformBalancer.ALPHA * ((1.0 if success == True else 0.0) - stat.get("success_rate"))
+                stat["throughput"] = stat.get("throughput") + PlatformBalancer.ALPHA * (throughput - stat.get("throughput"))
+
+            # 根据成功率判断是否需要停止或恢复分配任务
+            old = stat.get("drained")
+            if stat.get("samples") >= PlatformBalancer.MIN_SAMPLES:
+                stat["drained"] = stat.get("success_rate") < PlatformBalancer.DRAIN_THRESHOLD
+            new = stat.get("drained")
+
+            # 恢复分配任务时，使用探测请求的吞吐量作为初始值，避免之前失败的请求拉低权重
+            if old == True and new == False:
+                stat["throughput"] = throughput
+
+        if old == False and new == True:
+            self.warning(Localizer.get().translator_balance_drain.replace("{NAME}", platform.get("name")))
+        elif old == True and new == False:
+            self.info(Localizer.get().translator_balance_resume.replace("{NAME}", platform.get("name")))
+
+    # 输出各平台的统计数据
+    def print_result(self) -> None:
+        for platform in self.platforms:
+            stat = self.stats.get(platform.get("id"))
+            self.info(Localizer.get().translator_balance_result.replace("{NAME}", platform.get("name")).replace("{REQUEST}", str(stat.get("samples"))).replace("{SUCCESS}", str(stat.get("success"))).replace("{LINE}", str(stat.get("line"))))
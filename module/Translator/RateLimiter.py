@@ -0,0 +1,149 @@
+import time
+import asyncio
+import threading
+
+from base.Base import Base
+from module.Translator.KeyPool import KeyPool
+
+# 令牌桶速率限制器，每个 接口地址 + 密钥 对应一个实例，分别限制每分钟请求数（RPM）与每分钟 Token 数（TPM）
+class RateLimiter(Base):
+
+    # 等待容量时的最长单次休眠时间（秒），以便及时响应停止任务
+    MAX_WAIT_INTERVAL = 0.5
+
+    # 限制器实例
+    LIMITERS: dict[tuple[str, str], "RateLimiter"] = {}
+
+    # 密钥轮询索引
+    KEY_INDEX: int = 0
+
+    # 类线程锁
+    LOCK = threading.Lock()
+
+    def __init__(self, rpm_limit: int, tpm_limit: int) -> None:
+        super().__init__()
+
+        # 初始化
+        self.rpm_limit = 0
+        self.tpm_limit = 0
+        self.rpm_available: float = 0.0
+        self.tpm_available: float = 0.0
+        self.update_time = time.time()
+
+        # 令牌桶初始为满
+        self.set_limit(rpm_limit, tpm_limit)
+
+    # 判断平台是否设置了速率限制
+    @classmethod
+    def is_enabled(cls, platform: dict) -> bool:
+        return platform.get("rpm_limit", 0) > 0 or platform.get("tpm_limit", 0) > 0
+
+    # 获取限制器实例，平台配置发生变化时同步更新限制
+    @classmethod
+    def get(cls, platform: dict, api_key: str) -> "RateLimiter":
+        key = (platform.get("api_url"), api_key)
+        limiter = cls.LIMITERS.get(key)
+        if limiter is None:
+            limiter = cls(platform.get("rpm_limit", 0), platform.get("tpm_limit", 0))
+            cls.LIMITERS[key] = limiter
+        else:
+            limiter.set_limit(platform.get("rpm_limit", 0), platform.get("tpm_limit", 0))
+
+        return limiter
+
+    # 为请求选择一个容量充足的密钥，所有密钥的容量均不足时等待，指定 exclude 时优先选择其他密钥
+    # 停止任务时返回 None，此时不应发送请求，以便任务尽快退出
+    @classmethod
+    def acquire(cls, platform: dict, tokens: int, exclude: str = None) -> str:
+        while True:
+            api_key, wait = cls.try_acquire(platform, tokens, exclude)
+            if api_key is not None or Base.WORK_STATUS == Base.Status.STOPPING:
+                return api_key
+
+            time.sleep(min(wait, cls.MAX_WAIT_INTERVAL))
+
+    # 为请求选择一个容量充足的密钥 - 异步
+    @classmethod
+    async def acquire_async(cls, platform: dict, tokens: int, exclude: str = None) -> str:
+        while True:
+            api_key, wait = cls.try_acquire(platform, tokens, exclude)
+            if api_key is not None or Base.WORK_STATUS == Base.Status.STOPPING:
+                return api_key
+
+            await asyncio.sleep(min(wait, cls.MAX_WAIT_INTERVAL))
+
+    # 尝试选择密钥，成功时返回 (密钥, 0)，失败时返回 (None, 最短等待时间)，停止任务时返回 (None, 0)
+    # 仅在未处于隔离状态的密钥中选择
+    @classmethod
+    def try_acquire(cls, platform: dict, tokens: int, exclude: str = None) -> tuple[str, float]:
+        keys = KeyPool.get_available_keys(platform)
+        if len(keys) == 0:
+            return "", 0
+
+        with cls.LOCK:
+            # 从上次使用的密钥的下一个开始轮询，使请求均匀分布到各个密钥
+            cls.KEY_INDEX = (cls.KEY_INDEX + 1) % max(1, len(keys))
+            order = keys[cls.KEY_INDEX :] + keys[: cls.KEY_INDEX]
+            if exclude in order:
+                order.remove(exclude)
+                order.append(exclude)
+
+            wait = float("inf")
+            for api_key in order:
+                wait = min(wait, cls.get(platform, api_key).consume(tokens))
+                if wait == 0:
+                    return api_key, 0
+
+            if Base.WORK_STATUS == Base.Status.STOPPING:
+                return None, 0
+
+        return None, wait
+
+    # 根据请求的实际消耗修正令牌桶，预估不足时扣除差额，预估过多时返还差额
+    @classmethod
+    def commit(cls, platform: dict, api_key: str, delta: int) -> None:
+        with cls.LOCK:
+            limiter = cls.get(platform, api_key)
+            if limiter.tpm_limit > 0:
+                limiter.refill()
+                limiter.tpm_available = min(limiter.tpm_limit, limiter.tpm_available - delta)
+
+    # 设置限制，容量增大的部分立即可用
+    def set_limit(self, rpm_limit: int, tpm_limit: int) -> None:
+        if rpm_limit != self.rpm_limit:
+            self.rpm_available = max(0, self.rpm_available + rpm_limit - self.rpm_limit)
+            self.rpm_limit = rpm_limit
+        if tpm_limit != self.tpm_limit:
+            self.tpm_available = max(0, self.tpm_available + tpm_limit - self.tpm_limit)
+            self.tpm_limit = tpm_limit
+
+    # 按经过的时间补充令牌，每分钟补满一次
+    def refill(self) -> None:
+        now = time.time()
+        elapsed = now - self.update_time
+        self.update_time = now
+
+        if self.rpm_limit > 0:
+            self.rpm_available = min(self.rpm_limit, self.rpm_available + elapsed * self.rpm_limit / 60)
+        if self.tpm_limit > 0:
+            self.tpm_available = min(self.tpm_limit, self.tpm_available + elapsed * self.tpm_limit / 60)
+
+    # 尝试消耗令牌，成功时返回 0，失败时返回容量充足前需要等待的时间（秒）
+    # 单个请求的 Token 数超过 TPM 限制时按 TPM 限制计算，避免请求永远无法发出
+    def consume(self, tokens: int) -> float:
+        self.refill()
+
+        tokens = min(tokens, self.tpm_limit)
+        wait = 0.0
+        if self.rpm_limit > 0 and self.rpm_available < 1:
+            wait = max(wait, (1 - self.rpm_available) * 60 / self.rpm_limit)
+        if self.tpm_limit > 0 and self.tpm_available < tokens:
+            wait = max(wait, (tokens - self.tpm_available) * 60 / self.tpm_limit)
+
+        if wait == 0:
+            if self.rpm_limit > 0:
+                self.rpm_available = self.rpm_available - 1
+            if self.tpm_limit > 0:
+                self.tpm_available = self.tpm_available - tokens
+
+        return wait
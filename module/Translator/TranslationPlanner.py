@@ -0,0 +1,230 @@
+from rich import box
+from rich.table import Table
+from rich.console import Console
+from tqdm import tqdm
+
+from base.Base import Base
+from module.Cache.CacheItem import CacheItem
+from module.Cache.CacheManager import CacheManager
+from module.Localizer.Localizer import Localizer
+from module.Translator.TranslatorTask import TranslatorTask
+from module.ExpertConfig import ExpertConfig
+
+# 翻译预估，按实际的切分与提示词生成流程生成全部翻译任务，但不发送请求
+# 统计请求数量与提示词的 Token 数量，并按并发数与每个回复 Token 的耗时估算翻译耗时与费用
+class TranslationPlanner(Base):
+
+    # 回复的 Token 数量按原文的 Token 数量估算，并为每行额外预留 JSON 格式的开销
+    OUTPUT_RATIO = 1.0
+    OUTPUT_LINE_OVERHEAD = 6
+
+    # 无法根据历史数据计算时，每个回复 Token 的默认耗时（秒）
+    DEFAULT_TOKEN_LATENCY = 0.02
+
+    # 文件统计表格的最大行数，其余文件合并为一行
+    MAX_FILE_ROWS = 32
+
+    # 类变量
+    CONSOLE = Console(highlight = True, tab_size = 4)
+
+    def __init__(self, config: dict, platform: dict, cache_manager: CacheManager, concurrency: int, extras: dict) -> None:
+        super().__init__()
+
+        # 初始化
+        self.config = config
+        self.platform = platform
+        self.cache_manager = cache_manager
+        self.concurrency = max(1, concurrency)
+        self.extras = extras
+
+    # 计算提示词的 Token 数量
+    @classmethod
+    def get_token_count(cls, messages: list[dict]) -> int:
+        texts: list[str] = []
+        for message in messages:
+            content = message.get("content", message.get("parts", ""))
+            if isinstance(content, list):
+                texts.extend(block.get("text", "") for block in content)
+            else:
+                texts.append(str(content))
+
+        return sum(cls.get_text_token_count(text) for text in texts)
+
+    # 计算文本的 Token 数量
+    @classmethod
+    def get_text_token_count(cls, text: str) -> int:
+        if text == "":
+            return 0
+        else:
+            return len(CacheItem.get_encoding().encode(text, disallowed_special = ()))
+
+    # 生成全部翻译任务的提示词并输出预估结果
+    def plan(self, chunks: list[list[CacheItem]], preceding_chunks: list[list[CacheItem]]) -> dict:
+        result = {
+            "request": 0,
+            "line": 0,
+            "source": 0,
+            "prompt": 0,
+            "glossary": 0,
+            "preceding": 0,
+            "completion": 0,
+            "files": {},
+        }
+
+        # 与实际翻译流程相同，逐个生成翻译任务与提示词
+        self.print("")
+        latencies: list[float] = []
+        token_latency, measured = self.get_token_latency()
+        for items, preceding_items in tqdm(zip(chunks, preceding_chunks), desc = Localizer.get().translator_generate_task, total = len(chunks)):
+            task = TranslatorTask(self.config, self.platform, items, preceding_items, self.cache_manager)
+            messages, _ = task.generate_messages(task.src_dict, task.preceding_items, task.samples)
+
+            # 随片段变化的提示词开销
+            glossary, preceding = self.get_overhead_token_count(task)
+
+            # 统计
+            source = task.get_token_count()
+            prompt = TranslationPlanner.get_token_count(messages)
+            completion = int(source * TranslationPlanner.OUTPUT_RATIO) + len(task.src_dict) * TranslationPlanner.OUTPUT_LINE_OVERHEAD
+            latencies.append(completion * token_latency)
+            result["request"] = result.get("request") + 1
+            result["line"] = result.get("line") + len(items)
+            result["source"] = result.get("source") + source
+            result["prompt"] = result.get("prompt") + prompt
+            result["glossary"] = result.get("glossary") + glossary
+            result["preceding"] = result.get("preceding") + preceding
+            result["completion"] = result.get("completion") + completion
+
+            # 合并片段时一个任务可能包含多个文件的条目，提示词按原文的 Token 数量分摊到各个文件
+            file_sources: dict[str, int] = {}
+            for item in items:
+                file_sources[item.get_file_path()] = file_sources.get(item.get_file_path(), 0) + max(1, item.get_token_count())
+            for file_path, file_source in file_sources.items():
+                share = file_source / sum(file_sources.values())
+                stats = result.get("files").setdefault(file_path, {"request": 0, "line": 0, "source": 0, "prompt": 0})
+                stats["request"] = stats.get("request") + 1
+                stats["line"] = stats.get("line") + sum(1 for item in items if item.get_file_path() == file_path)
+                stats["source"] = stats.get("source") + sum(item.get_token_count() for item in items if item.get_file_path() == file_path)
+                stats["prompt"] = stats.get("prompt") + prompt * share
+        self.print("")
+
+        # 按并发数估算耗时，耗时不少于最长的单个任务
+        result["time"] = max(sum(latencies) / self.concurrency, max(latencies, default = 0))
+
+        # 输出结果
+        self.print_result(result, token_latency, measured)
+
+        return result
+
+    # 获取提示词中术语表与参考上文的 Token 数量
+    def get_overhead_token_count(self, task: TranslatorTask) -> tuple[int, int]:
+        glossary = ""
+        preceding = ""
+        if self.platform.get("api_format") == Base.APIFormat.SAKURALLM:
+            if self.config.get("glossary_enable") == True:
+                glossary = task.prompt_builder.build_glossary_sakura(task.src_dict)
+        else:
+            if self.config.get("glossary_enable") == True:
+                glossary = task.prompt_builder.build_glossary(task.src_dict)
+            if len(task.preceding_items) > 0:
+                preceding = task.prompt_builder.build_preceding(task.preceding_items)
+
+        return TranslationPlanner.get_text_token_count(glossary), TranslationPlanner.get_text_token_count(preceding)
+
+    # 获取每个回复 Token 的耗时，返回 (耗时, 是否为根据历史数据计算的结果)
+    # 未设置时根据项目上次翻译的累计耗时与回复消耗计算，假设上次翻译时的并发数与当前一致
+    def get_token_latency(self) -> tuple[float, bool]:
+        if ExpertConfig.get().plan_token_latency > 0:
+            return ExpertConfig.get().plan_token_latency, False
+
+        time = self.extras.get("time", 0)
+        completion_tokens = self.extras.get("total_completion_tokens", 0)
+        if time > 0 and completion_tokens > 0:
+            return time * self.concurrency / completion_tokens, True
+        else:
+            return TranslationPlanner.DEFAULT_TOKEN_LATENCY, False
+
+    # 输出预估结果
+    def print_result(self, result: dict, token_latency: float, measured: bool) -> None:
+        # 按文件输出统计表格
+        self.CONSOLE.print(self.generate_file_table(result))
+
+        # 汇总
+        source = result.get("source")
+        prompt = result.get("prompt")
+        overhead = prompt - source
+        self.info(
+            Localizer.get().translator_plan_summary.replace("{REQUEST}", str(result.get("request"))).replace("{LINE}", str(result.get("line")))
+            .replace("{PROMPT}", str(prompt)).replace("{SOURCE}", str(source)).replace("{COMPLETION}", str(result.get("completion")))
+        )
+        self.info(
+            Localizer.get().translator_plan_overhead.replace("{OVERHEAD}", str(overhead)).replace("{RATIO}", f"{overhead / max(1, prompt) * 100:.1f}")
+            .replace("{BASE}", str(overhead - result.get("glossary") - result.get("preceding"))).replace("{GLOSSARY}", str(result.get("glossary"))).replace("{PRECEDING}", str(result.get("preceding")))
+        )
+
+        # 耗时
+        self.info(
+            Localizer.get().translator_plan_time.replace("{CONCURRENCY}", str(self.concurrency)).replace("{LATENCY}", f"{token_latency:.4f}")
+            .replace("{SOURCE}", Localizer.get().translator_plan_latency_measured if measured == True else Localizer.get().translator_plan_latency_config)
+            .replace("{TIME}", f"{result.get("time") / 3600:.2f}")
+        )
+
+        # 费用，未设置价格时不输出
+        input_price = ExpertConfig.get().plan_input_price
+        output_price = ExpertConfig.get().plan_output_price
+        if input_price > 0 or output_price > 0:
+            cost = (prompt * input_price + result.get("completion") * output_price) / 1000000
+            self.info(
+                Localizer.get().translator_plan_cost.replace("{INPUT}", f"{input_price:g}").replace("{OUTPUT}", f"{output_price:g}").replace("{COST}", f"{cost:.2f}")
+            )
+
+        # 提示
+        self.info(Localizer.get().translator_plan_note)
+        self.print("")
+
+    # 生成文件统计表格，按提示词的 Token 数量从多到少排序
+    def generate_file_table(self, result: dict) -> Table:
+        table = Table(
+            box = box.ASCII2,
+            expand = True,
+            title = " ",
+            caption = " ",
+            highlight = True,
+            show_lines = False,
+            show_header = True,
+            show_footer = True,
+            collapse_padding = True,
+        )
+        table.add_column(Localizer.get().translator_plan_file, Localizer.get().translator_plan_total, ratio = 1, overflow = "fold")
+        table.add_column(Localizer.get().translator_plan_line, str(result.get("line")), justify = "right")
+        table.add_column(Localizer.get().translator_plan_request, str(result.get("request")), justify = "right")
+        table.add_column(Localizer.get().translator_plan_source, str(result.get("source")), justify = "right")
+        table.add_column(Localizer.get().translator_plan_prompt, str(result.get("prompt")), justify = "right")
+        table.add_column(
+            Localizer.get().translator_plan_ratio,
+            f"{(result.get("prompt") - result.get("source")) / max(1, result.get("prompt")) * 100:.1f}%",
+            justify = "right",
+        )
+
+        # 超过最大行数的文件合并为一行
+        files = sorted(result.get("files").items(), key = lambda v: v[1].get("prompt"), reverse = True)
+        rows = [(file_path, stats) for file_path, stats in files[: TranslationPlanner.MAX_FILE_ROWS]]
+        if len(files) > TranslationPlanner.MAX_FILE_ROWS:
+            others = {"request": 0, "line": 0, "source": 0, "prompt": 0}
+            for _, stats in files[TranslationPlanner.MAX_FILE_ROWS :]:
+                for k in others:
+                    others[k] = others.get(k) + stats.get(k)
+            rows.append((Localizer.get().translator_plan_others.replace("{COUNT}", str(len(files) - TranslationPlanner.MAX_FILE_ROWS)), others))
+
+        for file_path, stats in rows:
+            prompt = int(stats.get("prompt"))
+            table.add_row(
+                file_path,
+                str(stats.get("line")),
+                str(stats.get("request")),
+                str(stats.get("source")),
+                str(prompt),
+                f"{(prompt - stats.get("source")) / max(1, prompt) * 100:.1f}%",
+            )
+
+        return table
@@ -2,6 +2,7 @@ import os
 import re
 import time
 import shutil
+import asyncio
 import threading
 import concurrent.futures
 from itertools import zip_longest
@@ -13,12 +14,22 @@ from base.Base import Base
 from module.File.FileManager import FileManager
 from module.Cache.CacheItem import CacheItem
 from module.Cache.CacheManager import CacheManager
+from module.Cache.CacheDatabase import CacheDatabase
+from module.Cache.TranslationMemory import TranslationMemory
 from module.Filter.RuleFilter import RuleFilter
 from module.Filter.LanguageFilter import LanguageFilter
 from module.Localizer.Localizer import Localizer
 from module.Translator.TranslatorTask import TranslatorTask
+from module.Translator.TranslatorRequester import TranslatorRequester
+from module.Translator.HttpClientPool import HttpClientPool
+from module.Translator.ConcurrencyController import ConcurrencyController
+from module.Translator.PlatformBalancer import PlatformBalancer
+from module.Translator.HedgeController import HedgeController
+from module.Translator.BatchRequester import BatchRequester
+from module.Translator.TranslationPlanner import TranslationPlanner
 from module.PromptBuilder import PromptBuilder
 from module.ResultChecker import ResultChecker
+from module.ExpertConfig import ExpertConfig
 
 # 翻译器
 class Translator(Base):
@@ -35,6 +46,7 @@ class Translator(Base):
         # 注册事件
         self.subscribe(Base.Event.TRANSLATION_STOP, self.translation_stop)
         self.subscribe(Base.Event.TRANSLATION_START, self.translation_start)
+        self.subscribe(Base.Event.TRANSLATION_PLAN, self.translation_plan)
         self.subscribe(Base.Event.TRANSLATION_MANUAL_EXPORT, self.translation_manual_export)
         self.subscribe(Base.Event.PROJECT_STATUS, self.translation_project_status_check)
         self.subscribe(Base.Event.APP_SHUT_DOWN, self.app_shut_down)
@@ -76,6 +88,19 @@ class Translator(Base):
                 args = (data.get("status"), ),
             ).start()
 
+    # 翻译预估事件
+    def translation_plan(self, event: int, data: dict) -> None:
+        if Base.WORK_STATUS != Base.Status.IDLE:
+            self.emit(Base.Event.APP_TOAST_SHOW, {
+                "type": Base.ToastType.WARNING,
+                "message": Localizer.get().translator_running,
+            })
+        else:
+            threading.Thread(
+                target = self.translation_plan_target,
+                args = (data.get("status"), ),
+            ).start()
+
     # 翻译结果手动导出事件
     def translation_manual_export(self, event: int, data: dict) -> None:
         if Base.WORK_STATUS == Base.Status.TRANSLATING:
@@ -129,13 +154,16 @@ class Translator(Base):
 
         # 初始化
         self.config = self.load_config()
-        self.platform = {}
-        for platform in self.config.get("platforms"):
-            if platform.get("id") == self.config.get("activate_platform"):
-                self.platform = platform
-                break
+        self.platform = self.get_activate_platform()
         self.initialize_proxy()
+        self.initialize_platform_balancer()
         self.initialize_batch_size()
+        self.initialize_concurrency_controller()
+        self.initialize_hedge_controller()
+        self.initialize_batch_request()
+
+        # 读取 Token 数量缓存，从头翻译时也可以复用之前计算的结果
+        self.cache_manager.load_token_count_from_file(self.config.get("output_folder"))
 
         # 生成缓存列表
         try:
@@ -143,6 +171,7 @@ class Translator(Base):
             if status == Base.TranslationStatus.TRANSLATING:
                 self.cache_manager.load_from_file(self.config.get("output_folder"))
             else:
+                CacheDatabase.close(f"{self.config.get("output_folder")}/cache/items.db")
                 shutil.rmtree(f"{self.config.get("output_folder")}/cache", ignore_errors = True)
                 project, items = FileManager(self.config).read_from_path()
                 self.cache_manager.set_items(items)
@@ -169,6 +198,7 @@ class Translator(Base):
                 "line": 0,
                 "token": 0,
                 "total_completion_tokens": 0,
+                "cached_tokens": 0,
                 "time": 0,
             }
 
@@ -176,20 +206,27 @@ class Translator(Base):
         self.emit(Base.Event.TRANSLATION_UPDATE, self.extras)
 
         # 规则过滤
-        self.rule_filter(self.cache_manager.get_items())
+        self.rule_filter(self.cache_manager.get_items(), self.cache_manager)
 
         # 语言过滤
-        self.language_filter(self.cache_manager.get_items())
+        self.language_filter(self.cache_manager.get_items(), self.cache_manager)
 
         # MTool 优化器预处理
-        self.mtool_optimizer_preprocess(self.cache_manager.get_items())
+        self.mtool_optimizer_preprocess(self.cache_manager.get_items(), self.cache_manager)
+
+        # 持续调度时，失败的任务在执行过程中立即切分重试，只需要执行一轮，批量请求不支持持续调度
+        if ExpertConfig.get().continuous_scheduling_enable == True and self.batch_request_enable == False:
+            max_round = min(1, self.config.get("max_round"))
+        else:
+            max_round = self.config.get("max_round")
 
         # 开始循环
-        for current_round in range(self.config.get("max_round") + 1):
+        for current_round in range(max_round + 1):
             # 检测是否需要停止任务
             if Base.WORK_STATUS == Base.Status.STOPPING:
                 # 循环次数比实际最大轮次要多一轮，当触发停止翻译的事件时，最后都会从这里退出任务
                 # 执行到这里说明停止翻译的任务已经执行完毕，可以重置内部状态了
+                TranslatorRequester.close_clients()
                 self.translating = False
                 Base.WORK_STATUS = Base.Status.IDLE
                 return None
@@ -206,7 +243,7 @@ class Translator(Base):
                 break
 
             # 达到最大翻译轮次时
-            if item_count_status_untranslated > 0 and current_round == self.config.get("max_round"):
+            if item_count_status_untranslated > 0 and current_round == max_round:
                 self.print("")
                 self.warning(Localizer.get().translator_fail)
                 self.warning(Localizer.get().translator_writing)
@@ -221,9 +258,19 @@ class Translator(Base):
             if current_round > 0:
                 self.config["task_token_limit"] = max(1, int(self.config.get("task_token_limit") / 2))
 
+            # 使用翻译记忆库中的译文
+            self.translation_memory_apply(self.cache_manager.get_items())
+
+            # 批量计算待翻译条目的 Token 数量
+            self.cache_manager.prepare_token_count(self.config.get("output_folder"))
+
             # 生成缓存数据条目片段
             chunks, preceding_chunks = self.cache_manager.generate_item_chunks(self.config.get("task_token_limit"))
 
+            # 输出原文去重与合并片段的结果
+            self.print_deduplication_result(chunks, self.cache_manager)
+            self.print_packing_result(chunks, self.cache_manager)
+
             # 仅在第一轮启用参考上文功能
             if current_round > 0:
                 preceding_chunks = [[] for _ in range(len(preceding_chunks))]
@@ -239,6 +286,9 @@ class Translator(Base):
                         items,
                         preceding_items,
                         self.cache_manager,
+                        self.concurrency_controller,
+                        self.platform_balancer,
+                        self.hedge_controller,
                     )
                 )
             self.print("")
@@ -261,10 +311,33 @@ class Translator(Base):
             self.print("")
 
             # 开始执行翻译任务
-            with concurrent.futures.ThreadPoolExecutor(max_workers = self.config.get("batch_size"), thread_name_prefix = "translator") as executor:
-                for task in tasks:
-                    future = executor.submit(task.start, current_round)
-                    future.add_done_callback(self.task_done_callback)
+            if self.batch_request_enable == True:
+                self.start_tasks_batch(tasks, current_round)
+            elif ExpertConfig.get().async_request_enable == True:
+                asyncio.run(self.start_tasks_async(tasks, current_round))
+            elif ExpertConfig.get().continuous_scheduling_enable == True:
+                self.start_tasks_continuous(tasks)
+            else:
+                with concurrent.futures.ThreadPoolExecutor(max_workers = self.get_max_workers(), thread_name_prefix = "translator") as executor:
+                    for task in tasks:
+                        future = executor.submit(task.start, current_round)
+                        future.add_done_callback(self.task_done_callback)
+
+        # 关闭本次翻译使用的客户端
+        TranslatorRequester.close_clients()
+
+        # 输出逐行回收的结果
+        self.print_salvage_result()
+
+        # 输出多平台负载均衡的结果
+        if self.platform_balancer is not None:
+            self.platform_balancer.print_result()
+            self.print("")
+
+        # 输出对冲请求的结果
+        if self.hedge_controller is not None:
+            self.hedge_controller.print_result()
+            self.print("")
 
         # MTool 优化器后处理
         self.mtool_optimizer_postprocess(self.cache_manager.get_items())
@@ -273,8 +346,8 @@ class Translator(Base):
         if self.cache_manager.get_item_count_by_status(Base.TranslationStatus.UNTRANSLATED) == 0:
             self.cache_manager.get_project().set_status(Base.TranslationStatus.TRANSLATED)
 
-        # 等待可能存在的缓存文件写入请求处理完毕
-        time.sleep(CacheManager.SAVE_INTERVAL)
+        # 立即处理可能存在的缓存文件写入请求，不必等待定时任务
+        self.cache_manager.save_to_file_required()
 
         # 检查结果并写入文件
         self.check_and_wirte_result(self.cache_manager.get_items())
@@ -286,7 +359,271 @@ class Translator(Base):
         # 触发翻译停止完成的事件
         self.emit(Base.Event.TRANSLATION_STOP_DONE, {})
 
+    # 持续调度执行翻译任务，任务失败时立即将未翻译的条目切分为更小的任务并加入队列
+    def start_tasks_continuous(self, tasks: list[TranslatorTask]) -> None:
+        with concurrent.futures.ThreadPoolExecutor(max_workers = self.get_max_workers(), thread_name_prefix = "translator") as executor:
+            futures: dict[concurrent.futures.Future, tuple[TranslatorTask, int]] = {}
+
+            def submit(task: TranslatorTask, depth: int) -> None:
+                future = executor.submit(task.start, depth)
+                future.add_done_callback(self.task_done_callback)
+                futures[future] = (task, depth)
+
+            for task in tasks:
+                submit(task, 0)
+
+            while len(futures) > 0:
+                done, _ = concurrent.futures.wait(futures, return_when = concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    task, depth = futures.pop(future)
+                    for retry_task in self.generate_retry_tasks(task, depth):
+                        submit(retry_task, depth + 1)
+
+    # 异步执行翻译任务，所有请求在同一个事件循环中执行，并发数由信号量控制
+    # 启用持续调度时，任务失败后立即将未翻译的条目切分为更小的任务并加入队列
+    async def start_tasks_async(self, tasks: list[TranslatorTask], current_round: int) -> None:
+        semaphore = asyncio.Semaphore(self.get_max_workers())
+        futures: set[asyncio.Task] = set()
+
+        async def start_task(task: TranslatorTask, depth: int) -> dict:
+            async with semaphore:
+                result = await task.start_async(depth, executor)
+
+            if ExpertConfig.get().continuous_scheduling_enable == True:
+                for retry_task in self.generate_retry_tasks(task, depth):
+                    submit(retry_task, depth + 1)
+
+            return result
+
+        def submit(task: TranslatorTask, depth: int) -> None:
+            future = asyncio.create_task(start_task(task, depth))
+            future.add_done_callback(self.task_done_callback)
+            futures.add(future)
+
+        TranslatorTask.ASYNC_TASK_NUM = self.get_max_workers()
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers = ExpertConfig.get().async_worker_num, thread_name_prefix = "translator") as executor:
+                for task in tasks:
+                    submit(task, current_round)
+
+                # 等待全部任务完成，包括执行过程中加入的重试任务
+                while len(futures) > 0:
+                    done, _ = await asyncio.wait(futures, return_when = asyncio.FIRST_COMPLETED)
+                    futures.difference_update(done)
+        finally:
+            TranslatorTask.ASYNC_TASK_NUM = 0
+            await TranslatorRequester.close_async_clients()
+
+    # 翻译预估流程，与实际的翻译流程相同地读取数据、过滤条目并生成第一轮的翻译任务，但不发送请求，也不写入缓存数据
+    # 使用独立的缓存管理器，预估过程中对条目状态的修改不会被定时保存或手动导出写入项目
+    def translation_plan_target(self, status: int) -> None:
+        # 设置运行状态，避免与翻译任务同时执行
+        Base.WORK_STATUS = Base.Status.TESTING
+
+        # 预估完成时为条目数量，读取文件失败或预估失败时为 0
+        item_count = 0
+
+        try:
+            # 初始化
+            self.config = self.load_config()
+            self.platform = self.get_activate_platform()
+            self.initialize_platform_balancer()
+            cache_manager = CacheManager(tick = False)
+            cache_manager.load_token_count_from_file(self.config.get("output_folder"))
+
+            # 读取项目数据，用于根据上次翻译的实际耗时估算翻译耗时
+            cache_manager.load_project_from_file(self.config.get("output_folder"))
+            extras = cache_manager.get_project().get_extras()
+
+            # 生成缓存列表
+            try:
+                if status == Base.TranslationStatus.TRANSLATING:
+                    cache_manager.load_from_file(self.config.get("output_folder"))
+                else:
+                    project, items = FileManager(self.config).read_from_path()
+                    cache_manager.set_items(items)
+                    cache_manager.set_project(project)
+            except Exception as e:
+                self.error(f"{Localizer.get().log_read_file_fail}", e)
+                return None
+
+            # 规则过滤、语言过滤、MTool 优化器预处理
+            self.print("")
+            self.info(Localizer.get().translator_plan_start)
+            self.rule_filter(cache_manager.get_items(), cache_manager)
+            self.language_filter(cache_manager.get_items(), cache_manager)
+            self.mtool_optimizer_preprocess(cache_manager.get_items(), cache_manager)
+
+            # 使用翻译记忆库中的译文，命中的条目仅在内存中标记为已翻译
+            self.translation_memory_apply(cache_manager.get_items(), dry_run = True)
+
+            # 生成缓存数据条目片段
+            cache_manager.prepare_token_count(self.config.get("output_folder"))
+            chunks, preceding_chunks = cache_manager.generate_item_chunks(self.config.get("task_token_limit"))
+            self.print_deduplication_result(chunks, cache_manager)
+            self.print_packing_result(chunks, cache_manager)
+
+            # 生成翻译任务并输出预估结果
+            TranslationPlanner(self.config, self.platform, cache_manager, self.get_plan_concurrency(), extras).plan(chunks, preceding_chunks)
+            item_count = cache_manager.get_item_count()
+        except Exception as e:
+            self.error(Localizer.get().translator_plan_fail, e)
+        finally:
+            Base.WORK_STATUS = Base.Status.IDLE
+            self.emit(Base.Event.TRANSLATION_PLAN_DONE, {"item_count": item_count})
+
+    # 批量执行翻译任务，将全部任务一次性提交到接口的批量任务中，定期查询进度，批量任务结束后统一处理回复
+    # 未取回有效回复的任务按失败处理，在下一轮中重试
+    def start_tasks_batch(self, tasks: list[TranslatorTask], current_round: int) -> None:
+        requester = BatchRequester(self.config, self.platform, current_round)
+        tasks_by_id = {f"task-{i}": task for i, task in enumerate(tasks)}
+
+        # 提交批量任务
+        try:
+            batches = requester.submit([(custom_id, task.generate_batch_messages()) for custom_id, task in tasks_by_id.items()])
+        except Exception as e:
+            self.error(Localizer.get().translator_batch_submit_fail, e)
+            return None
+
+        interval = max(1, ExpertConfig.get().batch_request_poll_interval)
+        self.info(Localizer.get().translator_batch_submit.replace("{COUNT}", str(len(tasks))).replace("{BATCH}", str(len(batches))).replace("{INTERVAL}", str(interval)))
+        self.print("")
+
+        # 定期查询进度，每秒检查一次是否需要停止任务
+        poll_time = time.time()
+        while len(batches) > 0:
+            # 停止任务时取消未完成的批量任务
+            if Base.WORK_STATUS == Base.Status.STOPPING:
+                for batch_id in batches:
+                    try:
+                        requester.cancel(batch_id)
+                        self.info(Localizer.get().translator_batch_cancel.replace("{ID}", batch_id))
+                    except Exception as e:
+                        self.debug(Localizer.get().translator_batch_poll_fail.replace("{ID}", batch_id), e)
+                return None
+
+            if time.time() - poll_time < interval:
+                time.sleep(1)
+                continue
+            poll_time = time.time()
+
+            for batch_id in list(batches.keys()):
+                try:
+                    done, status, count, total = requester.poll(batch_id)
+                    self.info(Localizer.get().translator_batch_progress.replace("{ID}", batch_id).replace("{STATUS}", status).replace("{DONE}", str(count)).replace("{TOTAL}", str(total)))
+                    if done == False:
+                        continue
+
+                    results = requester.fetch(batch_id)
+                except Exception as e:
+                    self.warning(Localizer.get().translator_batch_poll_fail.replace("{ID}", batch_id), e)
+                    continue
+
+                # 处理回复，与普通请求相同，通过任务完成的回调更新翻译进度
+                self.info(Localizer.get().translator_batch_done.replace("{ID}", batch_id).replace("{COUNT}", str(len(results))))
+                for custom_id in batches.pop(batch_id):
+                    future = concurrent.futures.Future()
+                    try:
+                        future.set_result(tasks_by_id.get(custom_id).handle_batch_response(*results.get(custom_id, (True, None, None, None, None, 0))))
+                    except Exception as e:
+                        future.set_exception(e)
+                    self.task_done_callback(future)
+
+    # 生成重试任务，将失败任务中未翻译的条目按减半的 Token 阈值重新切分
+    # 重试深度与按轮次重试时的轮次相同，达到最大轮次后不再重试
+    def generate_retry_tasks(self, task: TranslatorTask, depth: int) -> list[TranslatorTask]:
+        if Base.WORK_STATUS == Base.Status.STOPPING or depth + 1 >= self.config.get("max_round"):
+            return []
+
+        items = [item for item in task.items if item.get_status() == Base.TranslationStatus.UNTRANSLATED]
+        if len(items) == 0:
+            return []
+
+        return [
+            TranslatorTask(
+                self.config,
+                self.platform,
+                chunk,
+                [],
+                self.cache_manager,
+                self.concurrency_controller,
+                self.platform_balancer,
+                self.hedge_controller,
+            )
+            for chunk in self.cache_manager.split_item_chunk(items, max(1, int(self.config.get("task_token_limit") / 2 ** (depth + 1))))
+        ]
+
+    # 初始化自适应并发控制器
+    def initialize_concurrency_controller(self) -> None:
+        if ExpertConfig.get().adaptive_concurrency_enable == False:
+            self.concurrency_controller = None
+        else:
+            self.concurrency_controller = ConcurrencyController(
+                self.config.get("batch_size"),
+                ExpertConfig.get().adaptive_concurrency_min,
+                ExpertConfig.get().adaptive_concurrency_max,
+            )
+            self.print("")
+            self.info(Localizer.get().translator_concurrency.replace("{INITIAL}", str(self.concurrency_controller.get_limit())).replace("{MIN}", str(self.concurrency_controller.minimum)).replace("{MAX}", str(self.concurrency_controller.maximum)))
+
+    # 初始化对冲请求控制器，对冲请求需要取消未被采用的请求，仅在启用异步请求引擎时生效
+    def initialize_hedge_controller(self) -> None:
+        if ExpertConfig.get().hedged_request_enable == False:
+            self.hedge_controller = None
+        elif ExpertConfig.get().async_request_enable == False:
+            self.hedge_controller = None
+            self.emit(Base.Event.APP_TOAST_SHOW, {
+                "type": Base.ToastType.WARNING,
+                "message": Localizer.get().translator_hedge_async_only,
+            })
+        else:
+            self.hedge_controller = HedgeController(
+                ExpertConfig.get().hedged_request_percentile,
+                ExpertConfig.get().hedged_request_budget,
+            )
+            self.print("")
+            self.info(Localizer.get().translator_hedge.replace("{PERCENTILE}", f"{self.hedge_controller.percentile:g}").replace("{BUDGET}", f"{self.hedge_controller.budget * 100:g}"))
+
+    # 初始化批量请求，当前接口不支持批量请求时使用普通请求
+    def initialize_batch_request(self) -> None:
+        if ExpertConfig.get().batch_request_enable == False:
+            self.batch_request_enable = False
+        elif BatchRequester.is_supported(self.platform) == False:
+            self.batch_request_enable = False
+            self.print("")
+            self.warning(Localizer.get().translator_batch_unsupported)
+        else:
+            self.batch_request_enable = True
+
+    # 获取当前激活的接口
+    def get_activate_platform(self) -> dict:
+        for platform in self.config.get("platforms"):
+            if platform.get("id") == self.config.get("activate_platform"):
+                return platform
+
+        return {}
+
+    # 获取翻译预估使用的并发数，未设置时按并发任务数计算，但不查询 llama.cpp 的槽位数量
+    def get_plan_concurrency(self) -> int:
+        if ExpertConfig.get().plan_concurrency > 0:
+            return ExpertConfig.get().plan_concurrency
+
+        if self.platform_balancer is None:
+            platforms = [self.platform]
+        else:
+            platforms = self.platform_balancer.platforms
+
+        return sum(4 if self.config.get("batch_size") == 0 else self.config.get("batch_size") for _ in platforms)
+
+    # 获取最大并发任务数，启用自适应并发时由控制器限制实际的并发请求数
+    def get_max_workers(self) -> int:
+        if self.concurrency_controller is None:
+            return self.config.get("batch_size")
+        else:
+            return self.concurrency_controller.maximum
+
     # 初始化网络代理
+    # 请求客户端已在 HttpClientPool 中直接设置代理，此处的环境变量仅用于 Gemini SDK，其 REST 传输方式不支持设置客户端
     def initialize_proxy(self) -> None:
         if self.config.get("proxy_enable") == False or self.config.get("proxy_url") == "":
             os.environ.pop("http_proxy", None)
@@ -296,10 +633,31 @@ class Translator(Base):
             os.environ["https_proxy"] = self.config.get("proxy_url")
 
     # 初始化 batch_size
+    # 多平台负载均衡时，并发任务数为各个平台的并发任务数之和
     def initialize_batch_size(self) -> None:
+        if self.platform_balancer is None:
+            platforms = [self.platform]
+        else:
+            platforms = self.platform_balancer.platforms
+
+        batch_size = 0
+        for platform in platforms:
+            slots = self.get_llama_cpp_slots(platform)
+            if slots > 0:
+                batch_size = batch_size + slots
+            elif self.config.get("batch_size") == 0:
+                batch_size = batch_size + 4
+            else:
+                batch_size = batch_size + self.config.get("batch_size")
+        self.config["batch_size"] = batch_size
+
+    # 获取 llama.cpp 的槽位数量，获取失败时返回 0
+    # 此时并发任务数尚未确定，使用临时客户端，不创建连接池中的客户端
+    def get_llama_cpp_slots(self, platform: dict) -> int:
         try:
             response_json = None
-            response = httpx.get(re.sub(r"/v1$", "", self.platform.get("api_url")) + "/slots")
+            with httpx.Client(**HttpClientPool.get_client_args(self.config, 1)) as client:
+                response = client.get(re.sub(r"/v1$", "", platform.get("api_url")) + "/slots", timeout = HttpClientPool.CONNECT_TIMEOUT)
             response.raise_for_status()
             response_json = response.json()
         except Exception as e:
@@ -307,66 +665,80 @@ class Translator(Base):
             self.debug(Localizer.get().log_load_llama_cpp_slots_num_fail, e)
 
         if isinstance(response_json, list) and len(response_json) > 0:
-            self.config["batch_size"] = len(response_json)
-        elif self.config.get("batch_size") == 0:
-            self.config["batch_size"] = 4
+            return len(response_json)
+        else:
+            return 0
+
+    # 初始化多平台负载均衡器
+    def initialize_platform_balancer(self) -> None:
+        platforms = [
+            platform for platform in self.config.get("platforms")
+            if platform.get("id") in self.config.get("balance_platforms", []) and platform.get("id") != self.platform.get("id")
+        ]
+
+        if len(platforms) == 0:
+            self.platform_balancer = None
+        else:
+            self.platform_balancer = PlatformBalancer([self.platform] + platforms)
+            self.print("")
+            self.info(Localizer.get().translator_balance.replace("{NAMES}", " | ".join(platform.get("name") for platform in self.platform_balancer.platforms)))
 
     # 规则过滤
-    def rule_filter(self, items: list[CacheItem]) -> None:
+    def rule_filter(self, items: list[CacheItem], cache_manager: CacheManager) -> None:
         if len(items) == 0:
             return None
 
         # 统计排除数量
         self.print("")
-        count_excluded = len([v for v in tqdm(items) if v.get_status() == Base.TranslationStatus.EXCLUDED])
+        count_excluded = cache_manager.get_item_count_by_status(Base.TranslationStatus.EXCLUDED)
 
         # 筛选出无效条目并标记为已排除
         target = [
-            v for v in items
+            v for v in tqdm(items)
             if RuleFilter.filter(v.get_src(), v.get_skip_internal_filter()) == True
         ]
         for item in target:
             item.set_status(Base.TranslationStatus.EXCLUDED)
 
         # 输出结果
-        count = len([v for v in items if v.get_status() == Base.TranslationStatus.EXCLUDED]) - count_excluded
+        count = cache_manager.get_item_count_by_status(Base.TranslationStatus.EXCLUDED) - count_excluded
         self.print("")
         self.info(Localizer.get().translator_rule_filter.replace("{COUNT}", str(count)))
 
     # 语言过滤
-    def language_filter(self, items: list[CacheItem]) -> None:
+    def language_filter(self, items: list[CacheItem], cache_manager: CacheManager) -> None:
         if len(items) == 0:
             return None
 
         # 统计排除数量
         self.print("")
-        count_excluded = len([v for v in tqdm(items) if v.get_status() == Base.TranslationStatus.EXCLUDED])
+        count_excluded = cache_manager.get_item_count_by_status(Base.TranslationStatus.EXCLUDED)
 
         # 筛选出无效条目并标记为已排除
         source_language = self.config.get("source_language")
         target = [
-            v for v in items
+            v for v in tqdm(items)
             if LanguageFilter.filter(v.get_src(), source_language) == True
         ]
         for item in target:
             item.set_status(Base.TranslationStatus.EXCLUDED)
 
         # 输出结果
-        count = len([v for v in items if v.get_status() == Base.TranslationStatus.EXCLUDED]) - count_excluded
+        count = cache_manager.get_item_count_by_status(Base.TranslationStatus.EXCLUDED) - count_excluded
         self.print("")
         self.info(Localizer.get().translator_language_filter.replace("{COUNT}", str(count)))
 
     # MTool 优化器预处理
-    def mtool_optimizer_preprocess(self, items: list[CacheItem]) -> None:
+    def mtool_optimizer_preprocess(self, items: list[CacheItem], cache_manager: CacheManager) -> None:
         if len(items) == 0 or self.config.get("mtool_optimizer_enable") == False:
             return None
 
         # 统计排除数量
         self.print("")
-        count_excluded = len([v for v in tqdm(items) if v.get_status() == Base.TranslationStatus.EXCLUDED])
+        count_excluded = cache_manager.get_item_count_by_status(Base.TranslationStatus.EXCLUDED)
 
         # 筛选
-        items_kvjson = [item for item in items if item.get_file_type() == CacheItem.FileType.KVJSON]
+        items_kvjson = [item for item in tqdm(items) if item.get_file_type() == CacheItem.FileType.KVJSON]
 
         # 按文件路径分组
         group_by_file_path: dict[str, list[CacheItem]] = {}
@@ -387,10 +759,81 @@ class Translator(Base):
                 if item.get_src() in target:
                     item.set_status(Base.TranslationStatus.EXCLUDED)
 
-        count = len([v for v in items if v.get_status() == Base.TranslationStatus.EXCLUDED]) - count_excluded
+        count = cache_manager.get_item_count_by_status(Base.TranslationStatus.EXCLUDED) - count_excluded
         self.print("")
         self.info(Localizer.get().translator_mtool_filter.replace("{COUNT}", str(count)))
 
+    # 输出原文去重的结果
+    def print_deduplication_result(self, chunks: list[list[CacheItem]], cache_manager: CacheManager) -> None:
+        count, token = cache_manager.get_duplicate_item_count()
+        if count == 0:
+            return None
+
+        request = max(0, cache_manager.get_item_chunk_count(self.config.get("task_token_limit")) - cache_manager.unpacked_chunk_count)
+        self.print("")
+        self.info(Localizer.get().translator_deduplication.replace("{COUNT}", str(count)).replace("{TOKEN}", str(token)).replace("{REQUEST}", str(request)))
+
+    # 输出合并片段的结果，节约的提示词开销按每个请求的基础提示词计算，不含随片段内容变化的术语表等部分
+    def print_packing_result(self, chunks: list[list[CacheItem]], cache_manager: CacheManager) -> None:
+        request = cache_manager.unpacked_chunk_count - len(chunks)
+        if ExpertConfig.get().chunk_packing_enable == False or request <= 0:
+            return None
+
+        token = request * self.get_prompt_token_count()
+        self.print("")
+        self.info(Localizer.get().translator_packing.replace("{OLD}", str(cache_manager.unpacked_chunk_count)).replace("{NEW}", str(len(chunks))).replace("{TOKEN}", str(token)))
+
+    # 获取每个请求的基础提示词的 Token 数量
+    def get_prompt_token_count(self) -> int:
+        messages, _ = TranslatorTask(self.config, self.platform, [], [], self.cache_manager).generate_messages({}, [], [])
+
+        return TranslationPlanner.get_token_count(messages)
+
+    # 输出逐行回收的结果
+    def print_salvage_result(self) -> None:
+        if self.extras.get("salvage_line", 0) == 0:
+            return None
+
+        self.info(Localizer.get().translator_salvage.replace("{LINE}", str(self.extras.get("salvage_line", 0))).replace("{TOKEN}", str(self.extras.get("salvage_token", 0))))
+        self.print("")
+
+    # 翻译记忆库，翻译预估时不更新翻译进度与缓存文件
+    def translation_memory_apply(self, items: list[CacheItem], dry_run: bool = False) -> None:
+        if len(items) == 0 or ExpertConfig.get().translation_memory_enable == False:
+            return None
+
+        # 将命中的条目标记为已翻译
+        try:
+            hits = TranslationMemory.get().apply(
+                items,
+                self.config.get("source_language"),
+                self.config.get("target_language"),
+                threshold = (
+                    ExpertConfig.get().translation_memory_fuzzy_apply_threshold
+                    if ExpertConfig.get().translation_memory_fuzzy_enable == True else 0
+                ),
+            )
+        except Exception as e:
+            self.debug(Localizer.get().log_translation_memory_fail, e)
+            return None
+
+        # 输出结果
+        self.print("")
+        self.info(Localizer.get().translator_translation_memory.replace("{COUNT}", str(len(hits))))
+        if len(hits) == 0 or dry_run == True:
+            return None
+
+        # 更新翻译进度
+        with self.data_lock:
+            self.extras["line"] = self.extras.get("line", 0) + len(hits)
+            self.extras["time"] = time.time() - self.extras.get("start_time", 0)
+            self.cache_manager.get_project().set_extras(self.extras)
+
+        # 保存发生变化的条目
+        self.cache_manager.save_items_to_file(hits, self.config.get("output_folder"))
+        self.cache_manager.require_save_to_file(self.config.get("output_folder"))
+        self.emit(Base.Event.TRANSLATION_UPDATE, self.extras)
+
     # MTool 优化器后处理
     def mtool_optimizer_postprocess(self, items: list[CacheItem]) -> None:
         if len(items) == 0 or self.config.get("mtool_optimizer_enable") == False:
@@ -448,6 +891,9 @@ class Translator(Base):
                     new["line"] = self.extras.get("line", 0)
                     new["token"] = self.extras.get("token", 0) + result.get("prompt_tokens", 0) + result.get("completion_tokens", 0)
                     new["total_completion_tokens"] = self.extras.get("total_completion_tokens", 0)
+                    new["cached_tokens"] = self.extras.get("cached_tokens", 0)
+                    new["salvage_line"] = self.extras.get("salvage_line", 0)
+                    new["salvage_token"] = self.extras.get("salvage_token", 0)
                     new["time"] = time.time() - self.extras.get("start_time", 0)
                     self.extras = new
                 else:
@@ -458,9 +904,16 @@ class Translator(Base):
                     new["line"] = self.extras.get("line", 0) + result.get("row_count", 0)
                     new["token"] = self.extras.get("token", 0) + result.get("prompt_tokens", 0) + result.get("completion_tokens", 0)
                     new["total_completion_tokens"] = self.extras.get("total_completion_tokens", 0) + result.get("completion_tokens", 0)
+                    new["cached_tokens"] = self.extras.get("cached_tokens", 0) + result.get("cached_tokens", 0)
+                    new["salvage_line"] = self.extras.get("salvage_line", 0) + result.get("salvage_line", 0)
+                    new["salvage_token"] = self.extras.get("salvage_token", 0) + result.get("salvage_token", 0)
                     new["time"] = time.time() - self.extras.get("start_time", 0)
                     self.extras = new
 
+                # 记录当前并发数
+                if self.concurrency_controller is not None:
+                    self.extras["concurrency"] = self.concurrency_controller.get_limit()
+
             # 更新翻译进度
             self.cache_manager.get_project().set_extras(self.extras)
 
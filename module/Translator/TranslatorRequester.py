@@ -1,3 +1,5 @@
+import time
+import asyncio
 import threading
 
 import httpx
@@ -8,19 +10,38 @@ import google.generativeai as genai
 
 from base.Base import Base
 from module.Localizer.Localizer import Localizer
+from module.Response.StreamChecker import StreamChecker
+from module.Translator.KeyPool import KeyPool
+from module.Translator.HttpClientPool import HttpClientPool
+from module.Translator.RateLimiter import RateLimiter
 from module.VersionManager import VersionManager
 
 # 接口请求器
 class TranslatorRequester(Base):
 
+    # 请求错误类型
+    class Error():
+
+        RATE_LIMIT: str = "RATE_LIMIT"                          # 速率限制
+        AUTH: str = "AUTH"                                      # 鉴权失败或额度耗尽
+        SERVER: str = "SERVER"                                  # 服务端错误
+        TIMEOUT: str = "TIMEOUT"                                # 请求超时
+        ABORT: str = "ABORT"                                    # 回复异常，已提前中止
+        OTHER: str = "OTHER"                                    # 其他错误
+
     # 类线程锁
     API_KEY_LOCK = threading.Lock()
 
-    # 客户端
-    SAKURA_CLIENTS: dict[str, openai.OpenAI] = {}
-    OPENAI_CLIENTS: dict[str, openai.OpenAI] = {}
-    GOOGLE_CLIENTS: dict[str, genai.GenerativeModel] = {}
-    ANTHROPIC_CLIENTS: dict[str, anthropic.Anthropic] = {}
+    # 客户端，按 密钥 + 连接池 缓存，同一接口地址的所有密钥共享 HttpClientPool 中的连接池
+    SAKURA_CLIENTS: dict[tuple[str, httpx.Client], openai.OpenAI] = {}
+    OPENAI_CLIENTS: dict[tuple[str, httpx.Client], openai.OpenAI] = {}
+    GOOGLE_CLIENTS: dict[tuple[str, str], genai.GenerativeModel] = {}
+    ANTHROPIC_CLIENTS: dict[tuple[str, httpx.Client], anthropic.Anthropic] = {}
+
+    # 异步客户端，与事件循环绑定，在事件循环结束前关闭
+    ASYNC_SAKURA_CLIENTS: dict[tuple[str, httpx.AsyncClient], openai.AsyncOpenAI] = {}
+    ASYNC_OPENAI_CLIENTS: dict[tuple[str, httpx.AsyncClient], openai.AsyncOpenAI] = {}
+    ASYNC_ANTHROPIC_CLIENTS: dict[tuple[str, httpx.AsyncClient], anthropic.AsyncAnthropic] = {}
 
     def __init__(self, config: dict, platform: dict, current_round: int) -> None:
         super().__init__()
@@ -29,91 +50,200 @@ class TranslatorRequester(Base):
         self.config = config
         self.platform = platform
         self.current_round = current_round
+        self.error_type: str = None
+        self.error_message: str = ""
+        self.api_key: str = None
+        self.wait_time: float = 0.0
+        self.request_time: float = 0.0
+        self.exclude_api_key: str = None
+        self.cached_tokens: int = 0
+        self.stream_checker: StreamChecker = None
+
+    # 发起请求，tokens 为预估的输入 Token 数量，用于速率限制
+    # 传入流式回复检查器时，以流式请求接收回复，回复明显异常时提前中止请求，Gemini 接口不支持
+    def request(self, messages: list[dict], tokens: int = 0, stream_checker: StreamChecker = None) -> tuple[bool, str, int, int]:
+        args = self.get_request_args()
+        self.api_key = None
+        self.cached_tokens = 0
+        self.stream_checker = stream_checker
+
+        # 设置了速率限制时，等待并选择容量充足的密钥
+        if RateLimiter.is_enabled(self.platform):
+            wait_time = time.time()
+            self.api_key = RateLimiter.acquire(self.platform, tokens, self.exclude_api_key)
+            self.wait_time = time.time() - wait_time
+
+            # 停止任务时没有可用的密钥，不发送请求
+            if self.api_key is None:
+                self.error_type = TranslatorRequester.Error.ABORT
+                return True, None, None, None, None
 
-    # 发起请求
-    def request(self, messages: list[dict]) -> tuple[bool, str, int, int]:
-        thinking = self.platform.get("thinking")
-        temperature = self.platform.get("temperature")
-        top_p = self.platform.get("top_p")
-        presence_penalty = self.platform.get("presence_penalty")
-        frequency_penalty = self.platform.get("frequency_penalty") if self.current_round == 0 else max(0.20, self.platform.get("frequency_penalty"))
+        # 发起请求
+        self.request_time = time.time()
+        if self.platform.get("api_format") == Base.APIFormat.SAKURALLM:
+            skip, response_think, response_result, prompt_tokens, completion_tokens = self.request_sakura(messages, *args)
+        elif self.platform.get("api_format") == Base.APIFormat.GOOGLE:
+            skip, response_think, response_result, prompt_tokens, completion_tokens = self.request_google(messages, *args)
+        elif self.platform.get("api_format") == Base.APIFormat.ANTHROPIC:
+            skip, response_think, response_result, prompt_tokens, completion_tokens = self.request_anthropic(messages, *args)
+        else:
+            skip, response_think, response_result, prompt_tokens, completion_tokens = self.request_openai(messages, *args)
+
+        # 记录密钥的请求结果
+        self.report_api_key(skip, time.time() - self.request_time)
+
+        # 根据实际消耗修正速率限制
+        self.commit_rate_limit(tokens, skip, prompt_tokens, completion_tokens)
+
+        return skip, response_think, response_result, prompt_tokens, completion_tokens
+
+    # 发起请求 - 异步
+    async def request_async(self, messages: list[dict], tokens: int = 0, stream_checker: StreamChecker = None) -> tuple[bool, str, int, int]:
+        args = self.get_request_args()
+        self.api_key = None
+        self.cached_tokens = 0
+        self.stream_checker = stream_checker
+
+        # 设置了速率限制时，等待并选择容量充足的密钥
+        if RateLimiter.is_enabled(self.platform):
+            wait_time = time.time()
+            self.api_key = await RateLimiter.acquire_async(self.platform, tokens, self.exclude_api_key)
+            self.wait_time = time.time() - wait_time
+
+            # 停止任务时没有可用的密钥，不发送请求
+            if self.api_key is None:
+                self.error_type = TranslatorRequester.Error.ABORT
+                return True, None, None, None, None
 
         # 发起请求
+        self.request_time = time.time()
         if self.platform.get("api_format") == Base.APIFormat.SAKURALLM:
-            skip, response_think, response_result, prompt_tokens, completion_tokens = self.request_sakura(
-                messages,
-                thinking,
-                temperature,
-                top_p,
-                presence_penalty,
-                frequency_penalty
-            )
+            skip, response_think, response_result, prompt_tokens, completion_tokens = await self.request_sakura_async(messages, *args)
         elif self.platform.get("api_format") == Base.APIFormat.GOOGLE:
-            skip, response_think, response_result, prompt_tokens, completion_tokens = self.request_google(
-                messages,
-                thinking,
-                temperature,
-                top_p,
-                presence_penalty,
-                frequency_penalty
-            )
+            # Gemini SDK 的 REST 传输方式不支持异步请求，在线程中执行同步请求
+            skip, response_think, response_result, prompt_tokens, completion_tokens = await asyncio.to_thread(self.request_google, messages, *args)
         elif self.platform.get("api_format") == Base.APIFormat.ANTHROPIC:
-            skip, response_think, response_result, prompt_tokens, completion_tokens = self.request_anthropic(
-                messages,
-                thinking,
-                temperature,
-                top_p,
-                presence_penalty,
-                frequency_penalty
-            )
+            skip, response_think, response_result, prompt_tokens, completion_tokens = await self.request_anthropic_async(messages, *args)
         else:
-            skip, response_think, response_result, prompt_tokens, completion_tokens = self.request_openai(
-                messages,
-                thinking,
-                temperature,
-                top_p,
-                presence_penalty,
-                frequency_penalty
-            )
+            skip, response_think, response_result, prompt_tokens, completion_tokens = await self.request_openai_async(messages, *args)
+
+        # 记录密钥的请求结果
+        self.report_api_key(skip, time.time() - self.request_time)
+
+        # 根据实际消耗修正速率限制
+        self.commit_rate_limit(tokens, skip, prompt_tokens, completion_tokens)
 
         return skip, response_think, response_result, prompt_tokens, completion_tokens
 
+    # 记录密钥的请求结果，速率限制与鉴权失败时隔离密钥，其他错误与密钥无关
+    # 因回复异常而提前中止的请求与密钥的状态无关，不计入统计，回复未通过结果检查时同样视为密钥可用
+    def report_api_key(self, skip: bool, latency: float) -> None:
+        if self.api_key is None or self.error_type == TranslatorRequester.Error.ABORT:
+            return None
+
+        KeyPool.report(
+            self.platform,
+            self.api_key,
+            success = skip == False,
+            quarantine = self.error_type in (TranslatorRequester.Error.RATE_LIMIT, TranslatorRequester.Error.AUTH),
+            latency = latency,
+            error = self.error_message,
+        )
+
+    # 根据实际消耗修正速率限制，请求失败或接口未返回消耗时保持预估值不变
+    def commit_rate_limit(self, tokens: int, skip: bool, prompt_tokens: int, completion_tokens: int) -> None:
+        if self.api_key is None or skip == True:
+            return None
+
+        if prompt_tokens > 0 or completion_tokens > 0:
+            RateLimiter.commit(self.platform, self.api_key, prompt_tokens + completion_tokens - min(tokens, self.platform.get("tpm_limit", 0)))
+
+    # 判断请求错误类型
+    @classmethod
+    def get_error_type(cls, e: Exception) -> str:
+        if isinstance(e, (openai.APITimeoutError, anthropic.APITimeoutError, httpx.TimeoutException, TimeoutError)):
+            return TranslatorRequester.Error.TIMEOUT
+
+        # OpenAI 与 Anthropic SDK 使用 status_code 属性，Gemini SDK 使用 code 属性
+        status_code = getattr(e, "status_code", None) or getattr(e, "code", None)
+        if status_code == 429:
+            return TranslatorRequester.Error.RATE_LIMIT
+        elif status_code in (401, 402, 403):
+            return TranslatorRequester.Error.AUTH
+        elif isinstance(status_code, int) and status_code >= 500:
+            return TranslatorRequester.Error.SERVER
+        else:
+            return TranslatorRequester.Error.OTHER
+
+    # 获取请求参数
+    def get_request_args(self) -> tuple[bool, float, float, float, float]:
+        thinking = self.platform.get("thinking")
+        temperature = self.platform.get("temperature")
+        top_p = self.platform.get("top_p")
+        presence_penalty = self.platform.get("presence_penalty")
+        frequency_penalty = self.platform.get("frequency_penalty") if self.current_round == 0 else max(0.20, self.platform.get("frequency_penalty"))
+
+        return thinking, temperature, top_p, presence_penalty, frequency_penalty
+
+    # 关闭同步客户端，在翻译任务结束时调用，下次翻译时按新的并发任务数重新创建连接池
+    # 同步客户端的连接均由 HttpClientPool 管理，关闭连接池即可
+    @classmethod
+    def close_clients(cls) -> None:
+        with cls.API_KEY_LOCK:
+            cls.SAKURA_CLIENTS = {}
+            cls.OPENAI_CLIENTS = {}
+            cls.ANTHROPIC_CLIENTS = {}
+
+        HttpClientPool.close()
+
+    # 关闭异步客户端，需要在创建客户端的事件循环结束前调用
+    # 异步客户端的连接均由 HttpClientPool 管理，关闭连接池即可
+    @classmethod
+    async def close_async_clients(cls) -> None:
+        with cls.API_KEY_LOCK:
+            cls.ASYNC_SAKURA_CLIENTS = {}
+            cls.ASYNC_OPENAI_CLIENTS = {}
+            cls.ASYNC_ANTHROPIC_CLIENTS = {}
+
+        await HttpClientPool.close_async()
+
+    # 获取密钥，已由速率限制器选择密钥时直接使用，否则在未处于隔离状态的密钥中轮询选择
+    # 设置了 exclude_api_key 时（例如对冲请求）优先选择其他密钥
+    def get_api_key(self, platform: dict) -> str:
+        if self.api_key is None:
+            self.api_key = KeyPool.select(platform, self.exclude_api_key)
+
+        return self.api_key
+
     # 获取客户端
     def get_client(self, platform: dict, timeout: int) -> openai.OpenAI | genai.GenerativeModel | anthropic.Anthropic:
         with TranslatorRequester.API_KEY_LOCK:
-            # 初始化索引
-            if getattr(TranslatorRequester, "_api_key_index", None) is None:
-                TranslatorRequester._api_key_index = 0
-
             # 轮询获取密钥
-            keys = platform.get("api_key", [])
-            if len(keys) == 1:
-                api_key = keys[0]
-            elif TranslatorRequester._api_key_index >= len(keys) - 1:
-                TranslatorRequester._api_key_index = 0
-                api_key = keys[0]
-            else:
-                TranslatorRequester._api_key_index = TranslatorRequester._api_key_index + 1
-                api_key = keys[TranslatorRequester._api_key_index]
+            api_key = self.get_api_key(platform)
 
             # 从缓存中获取客户端
             if platform.get("api_format") == Base.APIFormat.SAKURALLM:
-                if api_key not in TranslatorRequester.SAKURA_CLIENTS:
-                    TranslatorRequester.SAKURA_CLIENTS[api_key] = openai.OpenAI(
+                http_client = HttpClientPool.get_client(self.config, platform.get("api_url"))
+                key = (api_key, http_client)
+                if key not in TranslatorRequester.SAKURA_CLIENTS:
+                    TranslatorRequester.SAKURA_CLIENTS[key] = openai.OpenAI(
                         base_url = platform.get("api_url"),
                         api_key = api_key,
-                        timeout = httpx.Timeout(timeout = timeout, connect = 10.0),
+                        timeout = httpx.Timeout(timeout = timeout, connect = HttpClientPool.CONNECT_TIMEOUT),
                         max_retries = 1,
+                        http_client = http_client,
                     )
-                return TranslatorRequester.SAKURA_CLIENTS.get(api_key)
+                return TranslatorRequester.SAKURA_CLIENTS.get(key)
             elif platform.get("api_format") == Base.APIFormat.GOOGLE:
+                key = (platform.get("model"), api_key)
+
                 # Gemini SDK 文档 - https://ai.google.dev/api?hl=zh-cn&lang=python
-                if api_key not in TranslatorRequester.GOOGLE_CLIENTS:
+                if key not in TranslatorRequester.GOOGLE_CLIENTS:
                     genai.configure(
                         api_key = api_key,
                         transport = "rest",
                     )
-                    TranslatorRequester.GOOGLE_CLIENTS[api_key] = genai.GenerativeModel(
+                    TranslatorRequester.GOOGLE_CLIENTS[key] = genai.GenerativeModel(
                         model_name = platform.get("model"),
                         safety_settings = [
                             {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
@@ -122,56 +252,87 @@ class TranslatorRequester(Base):
                             {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
                         ],
                     )
-                return TranslatorRequester.GOOGLE_CLIENTS.get(api_key)
+                return TranslatorRequester.GOOGLE_CLIENTS.get(key)
             elif platform.get("api_format") == Base.APIFormat.ANTHROPIC:
-                if api_key not in TranslatorRequester.ANTHROPIC_CLIENTS:
-                    TranslatorRequester.ANTHROPIC_CLIENTS[api_key] = anthropic.Anthropic(
+                http_client = HttpClientPool.get_client(self.config, platform.get("api_url"))
+                key = (api_key, http_client)
+                if key not in TranslatorRequester.ANTHROPIC_CLIENTS:
+                    TranslatorRequester.ANTHROPIC_CLIENTS[key] = anthropic.Anthropic(
                         base_url = platform.get("api_url"),
                         api_key = api_key,
-                        timeout = httpx.Timeout(timeout = timeout, connect = 10.0),
+                        timeout = httpx.Timeout(timeout = timeout, connect = HttpClientPool.CONNECT_TIMEOUT),
                         max_retries = 1,
+                        http_client = http_client,
                     )
-                return TranslatorRequester.ANTHROPIC_CLIENTS.get(api_key)
+                return TranslatorRequester.ANTHROPIC_CLIENTS.get(key)
             else:
-                if api_key not in TranslatorRequester.OPENAI_CLIENTS:
-                    TranslatorRequester.OPENAI_CLIENTS[api_key] = openai.OpenAI(
+                http_client = HttpClientPool.get_client(self.config, platform.get("api_url"))
+                key = (api_key, http_client)
+                if key not in TranslatorRequester.OPENAI_CLIENTS:
+                    TranslatorRequester.OPENAI_CLIENTS[key] = openai.OpenAI(
                         base_url = platform.get("api_url"),
                         api_key = api_key,
-                        timeout = httpx.Timeout(timeout = timeout, connect = 10.0),
+                        timeout = httpx.Timeout(timeout = timeout, connect = HttpClientPool.CONNECT_TIMEOUT),
                         max_retries = 1,
+                        http_client = http_client,
                     )
-                return TranslatorRequester.OPENAI_CLIENTS.get(api_key)
+                return TranslatorRequester.OPENAI_CLIENTS.get(key)
 
-    # 发起请求
-    def request_sakura(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> tuple[bool, str, str, int, int]:
-        try:
-            client: openai.OpenAI = self.get_client(
-                self.platform,
-                self.config.get("request_timeout"),
-            )
-            response = client.chat.completions.create(
-                model = self.platform.get("model"),
-                messages = messages,
-                top_p = top_p,
-                temperature = temperature,
-                presence_penalty = pp,
-                frequency_penalty = fp,
-                max_tokens = max(512, self.config.get("task_token_limit")),
-                extra_query = {
-                    "do_sample": True,
-                    "num_beams": 1,
-                    "repetition_penalty": 1.0
-                },
-                extra_headers = {
-                    "User-Agent": f"LinguaGacha/{VersionManager.VERSION} (https://github.com/neavo/LinguaGacha)"
-                },
-            )
+    # 获取客户端 - 异步
+    def get_client_async(self, platform: dict, timeout: int) -> openai.AsyncOpenAI | anthropic.AsyncAnthropic:
+        with TranslatorRequester.API_KEY_LOCK:
+            # 轮询获取密钥
+            api_key = self.get_api_key(platform)
 
-            # 提取回复的文本内容
-            response_result = response.choices[0].message.content
-        except Exception as e:
-            self.error(f"{Localizer.get().log_task_fail}", e)
-            return True, None, None, None, None
+            # 轮询获取连接池分片
+            http_client = HttpClientPool.get_client_async(self.config, platform.get("api_url"))
+            key = (api_key, http_client)
+
+            # 从缓存中获取客户端
+            if platform.get("api_format") == Base.APIFormat.SAKURALLM:
+                clients = TranslatorRequester.ASYNC_SAKURA_CLIENTS
+                client_type = openai.AsyncOpenAI
+            elif platform.get("api_format") == Base.APIFormat.ANTHROPIC:
+                clients = TranslatorRequester.ASYNC_ANTHROPIC_CLIENTS
+                client_type = anthropic.AsyncAnthropic
+            else:
+                clients = TranslatorRequester.ASYNC_OPENAI_CLIENTS
+                client_type = openai.AsyncOpenAI
+
+            if key not in clients:
+                clients[key] = client_type(
+                    base_url = platform.get("api_url"),
+                    api_key = api_key,
+                    timeout = httpx.Timeout(timeout = timeout, connect = HttpClientPool.CONNECT_TIMEOUT),
+                    max_retries = 1,
+                    http_client = http_client,
+                )
+            return clients.get(key)
+
+    # 生成请求参数 - Sakura
+    def generate_sakura_args(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> dict:
+        return {
+            "model": self.platform.get("model"),
+            "messages": messages,
+            "top_p": top_p,
+            "temperature": temperature,
+            "presence_penalty": pp,
+            "frequency_penalty": fp,
+            "max_tokens": max(512, self.config.get("task_token_limit")),
+            "extra_query": {
+                "do_sample": True,
+                "num_beams": 1,
+                "repetition_penalty": 1.0
+            },
+            "extra_headers": {
+                "User-Agent": f"LinguaGacha/{VersionManager.VERSION} (https://github.com/neavo/LinguaGacha)"
+            },
+        }
+
+    # 解析回复 - Sakura
+    def parse_sakura_response(self, response: openai.types.chat.ChatCompletion) -> tuple[bool, str, str, int, int]:
+        # 提取回复的文本内容
+        response_result = response.choices[0].message.content
 
         # 获取输入消耗
         try:
@@ -185,51 +346,125 @@ class TranslatorRequester(Base):
         except Exception:
             completion_tokens = 0
 
-        # Sakura 返回的内容多行文本，将其转换为 JSON 字符串
-        response_result = json.dumps(
+        # 获取命中缓存的输入消耗
+        self.cached_tokens = self.get_openai_cached_tokens(response.usage)
+
+        return False, "", self.convert_sakura_result(response_result), prompt_tokens, completion_tokens
+
+    # 解析流式回复 - Sakura
+    def parse_sakura_stream(self) -> tuple[bool, str, str, int, int]:
+        if self.stream_checker.error is not None:
+            return self.abort_stream()
+
+        return False, "", self.convert_sakura_result(self.stream_checker.content), self.stream_checker.prompt_tokens, self.stream_checker.completion_tokens
+
+    # Sakura 返回的内容多行文本，将其转换为 JSON 字符串
+    def convert_sakura_result(self, response_result: str) -> str:
+        return json.dumps(
             {str(i): line.strip() for i, line in enumerate(response_result.strip().splitlines())},
             indent = None,
             ensure_ascii = False,
         )
 
-        return False, "", response_result, prompt_tokens, completion_tokens
-
     # 发起请求
-    def request_openai(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> tuple[bool, str, str, int, int]:
+    def request_sakura(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> tuple[bool, str, str, int, int]:
         try:
             client: openai.OpenAI = self.get_client(
                 self.platform,
                 self.config.get("request_timeout"),
             )
-            response = client.chat.completions.create(
-                model = self.platform.get("model"),
-                messages = messages,
-                temperature = temperature,
-                top_p = top_p,
-                presence_penalty = pp,
-                frequency_penalty = fp,
-                max_tokens = 4096,
-                extra_headers = {
-                    "User-Agent": f"LinguaGacha/{VersionManager.VERSION} (https://github.com/neavo/LinguaGacha)"
-                },
+            if self.stream_checker is None:
+                response = client.chat.completions.create(
+                    **self.generate_sakura_args(messages, thinking, temperature, top_p, pp, fp)
+                )
+
+                return self.parse_sakura_response(response)
+            else:
+                stream = client.chat.completions.create(
+                    **self.generate_sakura_args(messages, thinking, temperature, top_p, pp, fp),
+                    **self.generate_openai_stream_args(),
+                )
+                self.receive_openai_stream(stream)
+
+                return self.parse_sakura_stream()
+        except Exception as e:
+            self.error_type = TranslatorRequester.get_error_type(e)
+            self.error_message = str(e)
+            self.error(f"{Localizer.get().log_task_fail}", e)
+            return True, None, None, None, None
+
+    # 发起请求 - 异步
+    async def request_sakura_async(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> tuple[bool, str, str, int, int]:
+        try:
+            client: openai.AsyncOpenAI = self.get_client_async(
+                self.platform,
+                self.config.get("request_timeout"),
             )
+            if self.stream_checker is None:
+                response = await client.chat.completions.create(
+                    **self.generate_sakura_args(messages, thinking, temperature, top_p, pp, fp)
+                )
 
-            # 提取回复内容
-            message = response.choices[0].message
-            if hasattr(message, "reasoning_content") and isinstance(message.reasoning_content, str):
-                response_think = message.reasoning_content.replace("\n\n", "\n").strip()
-                response_result = message.content.strip()
-            elif "</think>" in message.content:
-                splited = message.content.split("</think>")
-                response_think = splited[0].removeprefix("<think>").replace("\n\n", "\n").strip()
-                response_result = splited[-1].strip()
+                return self.parse_sakura_response(response)
             else:
-                response_think = ""
-                response_result = message.content.strip()
+                stream = await client.chat.completions.create(
+                    **self.generate_sakura_args(messages, thinking, temperature, top_p, pp, fp),
+                    **self.generate_openai_stream_args(),
+                )
+                await self.receive_openai_stream_async(stream)
+
+                return self.parse_sakura_stream()
         except Exception as e:
+            self.error_type = TranslatorRequester.get_error_type(e)
+            self.error_message = str(e)
             self.error(f"{Localizer.get().log_task_fail}", e)
             return True, None, None, None, None
 
+    # 生成请求参数 - OpenAI
+    def generate_openai_args(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> dict:
+        return {
+            "model": self.platform.get("model"),
+            "messages": messages,
+            "temperature": temperature,
+            "top_p": top_p,
+            "presence_penalty": pp,
+            "frequency_penalty": fp,
+            "max_tokens": 4096,
+            "extra_headers": {
+                "User-Agent": f"LinguaGacha/{VersionManager.VERSION} (https://github.com/neavo/LinguaGacha)"
+            },
+        }
+
+    # 生成流式请求参数 - OpenAI，在最后一个片段中返回消耗
+    def generate_openai_stream_args(self) -> dict:
+        return {
+            "stream": True,
+            "stream_options": {
+                "include_usage": True,
+            },
+        }
+
+    # 拆分思考内容与回复内容 - OpenAI
+    def split_openai_content(self, content: str, reasoning_content: str) -> tuple[str, str]:
+        if isinstance(reasoning_content, str):
+            response_think = reasoning_content.replace("\n\n", "\n").strip()
+            response_result = content.strip()
+        elif "</think>" in content:
+            splited = content.split("</think>")
+            response_think = splited[0].removeprefix("<think>").replace("\n\n", "\n").strip()
+            response_result = splited[-1].strip()
+        else:
+            response_think = ""
+            response_result = content.strip()
+
+        return response_think, response_result
+
+    # 解析回复 - OpenAI
+    def parse_openai_response(self, response: openai.types.chat.ChatCompletion) -> tuple[bool, str, str, int, int]:
+        # 提取回复内容
+        message = response.choices[0].message
+        response_think, response_result = self.split_openai_content(message.content, getattr(message, "reasoning_content", None))
+
         # 获取输入消耗
         try:
             prompt_tokens = int(response.usage.prompt_tokens)
@@ -242,8 +477,123 @@ class TranslatorRequester(Base):
         except Exception:
             completion_tokens = 0
 
+        # 获取命中缓存的输入消耗
+        self.cached_tokens = self.get_openai_cached_tokens(response.usage)
+
         return False, response_think, response_result, prompt_tokens, completion_tokens
 
+    # 获取命中缓存的输入消耗 - OpenAI，兼容 DeepSeek 接口的字段
+    def get_openai_cached_tokens(self, usage: openai.types.CompletionUsage) -> int:
+        try:
+            details = getattr(usage, "prompt_tokens_details", None)
+            if details is not None and getattr(details, "cached_tokens", None) is not None:
+                return int(details.cached_tokens)
+            else:
+                return int(getattr(usage, "prompt_cache_hit_tokens", None) or 0)
+        except Exception:
+            return 0
+
+    # 解析流式回复 - OpenAI
+    def parse_openai_stream(self) -> tuple[bool, str, str, int, int]:
+        if self.stream_checker.error is not None:
+            return self.abort_stream()
+
+        response_think, response_result = self.split_openai_content(
+            self.stream_checker.content,
+            self.stream_checker.think if self.stream_checker.think != "" else None,
+        )
+
+        return False, response_think, response_result, self.stream_checker.prompt_tokens, self.stream_checker.completion_tokens
+
+    # 接收流式回复片段 - OpenAI，回复异常时返回 False
+    def receive_openai_chunk(self, chunk: openai.types.chat.ChatCompletionChunk) -> bool:
+        if getattr(chunk, "usage", None) is not None:
+            self.stream_checker.prompt_tokens = chunk.usage.prompt_tokens or 0
+            self.stream_checker.completion_tokens = chunk.usage.completion_tokens or 0
+            self.cached_tokens = self.get_openai_cached_tokens(chunk.usage)
+
+        if len(chunk.choices) == 0:
+            return True
+        else:
+            delta = chunk.choices[0].delta
+            return self.stream_checker.feed(delta.content, getattr(delta, "reasoning_content", None))
+
+    # 接收流式回复 - OpenAI，回复异常时关闭连接以中止请求
+    def receive_openai_stream(self, stream: openai.Stream) -> None:
+        with stream:
+            for chunk in stream:
+                if self.receive_openai_chunk(chunk) == False:
+                    break
+
+    # 接收流式回复 - OpenAI 异步
+    async def receive_openai_stream_async(self, stream: openai.AsyncStream) -> None:
+        async with stream:
+            async for chunk in stream:
+                if self.receive_openai_chunk(chunk) == False:
+                    break
+
+    # 中止流式请求，记录错误原因
+    def abort_stream(self) -> tuple[bool, str, str, int, int]:
+        self.error_type = TranslatorRequester.Error.ABORT
+        self.error_message = self.stream_checker.get_error_text()
+        self.warning(Localizer.get().translator_stream_abort.replace("{REASON}", self.error_message).replace("{LENGTH}", str(len(self.stream_checker.think) + len(self.stream_checker.content))))
+
+        return True, None, None, None, None
+
+    # 发起请求
+    def request_openai(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> tuple[bool, str, str, int, int]:
+        try:
+            client: openai.OpenAI = self.get_client(
+                self.platform,
+                self.config.get("request_timeout"),
+            )
+            if self.stream_checker is None:
+                response = client.chat.completions.create(
+                    **self.generate_openai_args(messages, thinking, temperature, top_p, pp, fp)
+                )
+
+                return self.parse_openai_response(response)
+            else:
+                stream = client.chat.completions.create(
+                    **self.generate_openai_args(messages, thinking, temperature, top_p, pp, fp),
+                    **self.generate_openai_stream_args(),
+                )
+                self.receive_openai_stream(stream)
+
+                return self.parse_openai_stream()
+        except Exception as e:
+            self.error_type = TranslatorRequester.get_error_type(e)
+            self.error_message = str(e)
+            self.error(f"{Localizer.get().log_task_fail}", e)
+            return True, None, None, None, None
+
+    # 发起请求 - 异步
+    async def request_openai_async(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> tuple[bool, str, str, int, int]:
+        try:
+            client: openai.AsyncOpenAI = self.get_client_async(
+                self.platform,
+                self.config.get("request_timeout"),
+            )
+            if self.stream_checker is None:
+                response = await client.chat.completions.create(
+                    **self.generate_openai_args(messages, thinking, temperature, top_p, pp, fp)
+                )
+
+                return self.parse_openai_response(response)
+            else:
+                stream = await client.chat.completions.create(
+                    **self.generate_openai_args(messages, thinking, temperature, top_p, pp, fp),
+                    **self.generate_openai_stream_args(),
+                )
+                await self.receive_openai_stream_async(stream)
+
+                return self.parse_openai_stream()
+        except Exception as e:
+            self.error_type = TranslatorRequester.get_error_type(e)
+            self.error_message = str(e)
+            self.error(f"{Localizer.get().log_task_fail}", e)
+            return True, None, None, None, None
+
     # 发起请求
     def request_google(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> tuple[bool, str, int, int]:
         try:
@@ -265,6 +615,8 @@ class TranslatorRequester(Base):
             # 提取回复内容
             response_result = response.text
         except Exception as e:
+            self.error_type = TranslatorRequester.get_error_type(e)
+            self.error_message = str(e)
             self.error(f"{Localizer.get().log_task_fail}", e)
             return True, None, None, None, None
 
@@ -280,8 +632,119 @@ class TranslatorRequester(Base):
         except Exception:
             completion_tokens = 0
 
+        # 获取命中缓存的输入消耗
+        try:
+            self.cached_tokens = int(getattr(response.usage_metadata, "cached_content_token_count", None) or 0)
+        except Exception:
+            self.cached_tokens = 0
+
         return False, "", response_result, prompt_tokens, completion_tokens
 
+    # 生成请求参数 - Anthropic
+    def generate_anthropic_args(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> dict:
+        # 根据是否为思考模式，选择不同的请求方式
+        if thinking == True:
+            return {
+                "model": self.platform.get("model"),
+                "messages": messages,
+                "thinking": {
+                    "type": "enabled",
+                    "budget_tokens": 1024
+                },
+                "max_tokens": 4096,
+                "extra_headers": {
+                    "User-Agent": f"LinguaGacha/{VersionManager.VERSION} (https://github.com/neavo/LinguaGacha)"
+                },
+            }
+        else:
+            return {
+                "model": self.platform.get("model"),
+                "messages": messages,
+                "temperature": temperature,
+                "top_p": top_p,
+                "max_tokens": 4096,
+                "extra_headers": {
+                    "User-Agent": f"LinguaGacha/{VersionManager.VERSION} (https://github.com/neavo/LinguaGacha)"
+                },
+            }
+
+    # 解析回复 - Anthropic
+    def parse_anthropic_response(self, response: anthropic.types.Message) -> tuple[bool, str, str, int, int]:
+        # 提取回复内容
+        text_messages = [msg for msg in response.content if hasattr(msg, "text") and isinstance(msg.text, str)]
+        think_messages = [msg for msg in response.content if hasattr(msg, "thinking") and isinstance(msg.thinking, str)]
+
+        if text_messages != []:
+            response_result = text_messages[-1].text.strip()
+        else:
+            response_result = ""
+
+        if think_messages != []:
+            response_think = think_messages[-1].thinking.replace("\n\n", "\n").strip()
+        else:
+            response_think = ""
+
+        # 获取输入消耗
+        prompt_tokens, self.cached_tokens = self.get_anthropic_prompt_tokens(response.usage)
+
+        # 获取回复消耗
+        try:
+            completion_tokens = int(response.usage.output_tokens)
+        except Exception:
+            completion_tokens = 0
+
+        return False, response_think, response_result, prompt_tokens, completion_tokens
+
+    # 获取输入消耗与命中缓存的输入消耗 - Anthropic
+    # input_tokens 不包含读取与写入缓存的部分，输入消耗为三者之和
+    def get_anthropic_prompt_tokens(self, usage: anthropic.types.Usage) -> tuple[int, int]:
+        try:
+            cache_read = int(getattr(usage, "cache_read_input_tokens", None) or 0)
+            cache_creation = int(getattr(usage, "cache_creation_input_tokens", None) or 0)
+            return int(usage.input_tokens or 0) + cache_read + cache_creation, cache_read
+        except Exception:
+            return 0, 0
+
+    # 解析流式回复 - Anthropic
+    def parse_anthropic_stream(self) -> tuple[bool, str, str, int, int]:
+        if self.stream_checker.error is not None:
+            return self.abort_stream()
+
+        return (
+            False,
+            self.stream_checker.think.replace("\n\n", "\n").strip(),
+            self.stream_checker.content.strip(),
+            self.stream_checker.prompt_tokens,
+            self.stream_checker.completion_tokens,
+        )
+
+    # 接收流式回复事件 - Anthropic，回复异常时返回 False
+    def receive_anthropic_event(self, event: anthropic.types.RawMessageStreamEvent) -> bool:
+        if event.type == "message_start":
+            self.stream_checker.prompt_tokens, self.cached_tokens = self.get_anthropic_prompt_tokens(event.message.usage)
+        elif event.type == "message_delta":
+            self.stream_checker.completion_tokens = event.usage.output_tokens or 0
+        elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+            return self.stream_checker.feed(event.delta.text)
+        elif event.type == "content_block_delta" and event.delta.type == "thinking_delta":
+            return self.stream_checker.feed("", event.delta.thinking)
+
+        return True
+
+    # 接收流式回复 - Anthropic，回复异常时关闭连接以中止请求
+    def receive_anthropic_stream(self, stream: anthropic.Stream) -> None:
+        with stream:
+            for event in stream:
+                if self.receive_anthropic_event(event) == False:
+                    break
+
+    # 接收流式回复 - Anthropic 异步
+    async def receive_anthropic_stream_async(self, stream: anthropic.AsyncStream) -> None:
+        async with stream:
+            async for event in stream:
+                if self.receive_anthropic_event(event) == False:
+                    break
+
     # 发起请求
     def request_anthropic(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> tuple[bool, str, str, int, int]:
         try:
@@ -289,59 +752,49 @@ class TranslatorRequester(Base):
                 self.platform,
                 self.config.get("request_timeout"),
             )
-            # 根据是否为思考模式，选择不同的请求方式
-            if thinking == True:
-                response = client.messages.create(
-                    model = self.platform.get("model"),
-                    messages = messages,
-                    thinking = {
-                        "type": "enabled",
-                        "budget_tokens": 1024
-                    },
-                    max_tokens = 4096,
-                    extra_headers = {
-                        "User-Agent": f"LinguaGacha/{VersionManager.VERSION} (https://github.com/neavo/LinguaGacha)"
-                    },
-                )
-            else:
+            if self.stream_checker is None:
                 response = client.messages.create(
-                    model = self.platform.get("model"),
-                    messages = messages,
-                    temperature = temperature,
-                    top_p = top_p,
-                    max_tokens = 4096,
-                    extra_headers = {
-                        "User-Agent": f"LinguaGacha/{VersionManager.VERSION} (https://github.com/neavo/LinguaGacha)"
-                    },
+                    **self.generate_anthropic_args(messages, thinking, temperature, top_p, pp, fp)
                 )
 
-            # 提取回复内容
-            text_messages = [msg for msg in response.content if hasattr(msg, "text") and isinstance(msg.text, str)]
-            think_messages = [msg for msg in response.content if hasattr(msg, "thinking") and isinstance(msg.thinking, str)]
-
-            if text_messages != []:
-                response_result = text_messages[-1].text.strip()
+                return self.parse_anthropic_response(response)
             else:
-                response_result = ""
+                stream = client.messages.create(
+                    **self.generate_anthropic_args(messages, thinking, temperature, top_p, pp, fp),
+                    stream = True,
+                )
+                self.receive_anthropic_stream(stream)
 
-            if think_messages != []:
-                response_think = think_messages[-1].thinking.replace("\n\n", "\n").strip()
-            else:
-                response_think = ""
+                return self.parse_anthropic_stream()
         except Exception as e:
+            self.error_type = TranslatorRequester.get_error_type(e)
+            self.error_message = str(e)
             self.error(f"{Localizer.get().log_task_fail}", e)
             return True, None, None, None, None
 
-        # 获取输入消耗
+    # 发起请求 - 异步
+    async def request_anthropic_async(self, messages: list[dict], thinking: bool, temperature: float, top_p: float, pp: float, fp: float) -> tuple[bool, str, str, int, int]:
         try:
-            prompt_tokens = int(response.usage.input_tokens)
-        except Exception:
-            prompt_tokens = 0
+            client: anthropic.AsyncAnthropic = self.get_client_async(
+                self.platform,
+                self.config.get("request_timeout"),
+            )
+            if self.stream_checker is None:
+                response = await client.messages.create(
+                    **self.generate_anthropic_args(messages, thinking, temperature, top_p, pp, fp)
+                )
 
-        # 获取回复消耗
-        try:
-            completion_tokens = int(response.usage.output_tokens)
-        except Exception:
-            completion_tokens = 0
+                return self.parse_anthropic_response(response)
+            else:
+                stream = await client.messages.create(
+                    **self.generate_anthropic_args(messages, thinking, temperature, top_p, pp, fp),
+                    stream = True,
+                )
+                await self.receive_anthropic_stream_async(stream)
 
-        return False, response_think, response_result, prompt_tokens, completion_tokens
\ No newline at end of file
+                return self.parse_anthropic_stream()
+        except Exception as e:
+            self.error_type = TranslatorRequester.get_error_type(e)
+            self.error_message = str(e)
+            self.error(f"{Localizer.get().log_task_fail}", e)
+            return True, None, None, None, None
@@ -1,6 +1,8 @@
 import time
+import asyncio
 import itertools
 import threading
+import concurrent.futures
 
 import opencc
 import rapidjson as json
@@ -13,18 +15,24 @@ from base.BaseLanguage import BaseLanguage
 from module.Text.TextHelper import TextHelper
 from module.Cache.CacheItem import CacheItem
 from module.Cache.CacheManager import CacheManager
+from module.Cache.TranslationMemory import TranslationMemory
 from module.Fixer.KanaFixer import KanaFixer
 from module.Fixer.EscapeFixer import EscapeFixer
 from module.Fixer.HangeulFixer import HangeulFixer
 from module.Fixer.PunctuationFixer import PunctuationFixer
 from module.Response.ResponseChecker import ResponseChecker
 from module.Response.ResponseDecoder import ResponseDecoder
+from module.Response.StreamChecker import StreamChecker
 from module.Localizer.Localizer import Localizer
 from module.LogHelper import LogHelper
 from module.CodeSaver import CodeSaver
 from module.Normalizer import Normalizer
 from module.Translator.TranslatorRequester import TranslatorRequester
+from module.Translator.ConcurrencyController import ConcurrencyController
+from module.Translator.PlatformBalancer import PlatformBalancer
+from module.Translator.HedgeController import HedgeController
 from module.PromptBuilder import PromptBuilder
+from module.ExpertConfig import ExpertConfig
 
 class TranslatorTask(Base):
 
@@ -33,13 +41,20 @@ class TranslatorTask(Base):
     OPENCCT2S = opencc.OpenCC("t2s")
     CONSOLE = Console(highlight = True, tab_size = 4)
 
+    # 异步请求引擎的并发任务数，用于判断是否需要打印详细结果
+    ASYNC_TASK_NUM = 0
+
     # 类线程锁
     LOCK = threading.Lock()
 
-    def __init__(self, config: dict, platform: dict, items: list[CacheItem], preceding_items: list[CacheItem], cache_manager: CacheManager) -> None:
+    def __init__(self, config: dict, platform: dict, items: list[CacheItem], preceding_items: list[CacheItem], cache_manager: CacheManager, concurrency_controller: ConcurrencyController = None, platform_balancer: PlatformBalancer = None, hedge_controller: HedgeController = None) -> None:
         super().__init__()
 
         # 初始化
+        self.concurrency_controller = concurrency_controller
+        self.platform_balancer = platform_balancer
+        self.hedge_controller = hedge_controller
+        self.cached_tokens: int = 0
         self.items = items
         self.preceding_items = preceding_items
         self.config = config
@@ -53,10 +68,17 @@ class TranslatorTask(Base):
         self.src_dict: dict[str, str] = {}
         self.item_dict: dict[str, CacheItem] = {}
         for item in items:
-            for sub_line in item.split_sub_lines():
+            for sub_line in item.get_pending_sub_lines():
                 self.src_dict[str(len(self.src_dict))] = sub_line
                 self.item_dict[str(len(self.item_dict))] = item
 
+        # 部分子句已通过检查的条目，将其已通过检查的子句作为参考上文
+        self.preceding_items = self.preceding_items + [
+            CacheItem({"src": sub_line})
+            for item in items
+            for sub_line in item.get_accepted_sub_lines()
+        ]
+
         # 正规化
         self.src_dict = self.normalize(self.src_dict)
 
@@ -81,7 +103,35 @@ class TranslatorTask(Base):
 
     # 启动任务
     def start(self, current_round: int) -> dict:
-        return self.request(self.src_dict, self.item_dict, self.preceding_items, self.samples, current_round)
+        if self.platform_balancer is None:
+            return self.request(self.src_dict, self.item_dict, self.preceding_items, self.samples, current_round)
+
+        # 多平台负载均衡时，在生成提示词之前选择平台，并在任务完成后更新平台的统计数据
+        result = {}
+        start_time = time.time()
+        self.platform = self.platform_balancer.acquire()
+        try:
+            result = self.request(self.src_dict, self.item_dict, self.preceding_items, self.samples, current_round)
+        finally:
+            self.platform_balancer.release(self.platform, len(result) > 0 and result.get("check_result") is None, result.get("row_count", 0), time.time() - start_time)
+
+        return result
+
+    # 启动任务 - 异步
+    async def start_async(self, current_round: int, executor: concurrent.futures.Executor) -> dict:
+        if self.platform_balancer is None:
+            return await self.request_async(self.src_dict, self.item_dict, self.preceding_items, self.samples, current_round, executor)
+
+        # 多平台负载均衡时，在生成提示词之前选择平台，并在任务完成后更新平台的统计数据
+        result = {}
+        start_time = time.time()
+        self.platform = self.platform_balancer.acquire()
+        try:
+            result = await self.request_async(self.src_dict, self.item_dict, self.preceding_items, self.samples, current_round, executor)
+        finally:
+            self.platform_balancer.release(self.platform, len(result) > 0 and result.get("check_result") is None, result.get("row_count", 0), time.time() - start_time)
+
+        return result
 
     # 请求
     def request(self, src_dict: dict[str, str], item_dict: dict[str, CacheItem], preceding_items: list[CacheItem], samples: list[str], current_round: int) -> dict:
@@ -97,15 +147,194 @@ class TranslatorTask(Base):
             return {}
 
         # 生成请求提示词
-        if self.platform.get("api_format") != Base.APIFormat.SAKURALLM:
-            self.messages, console_log = self.generate_prompt(src_dict, preceding_items, samples)
+        self.messages, console_log = self.generate_messages(src_dict, preceding_items, samples)
+
+        # 发起请求
+        requester = TranslatorRequester(self.config, self.platform, current_round)
+        if self.concurrency_controller is None:
+            skip, response_think, response_result, prompt_tokens, completion_tokens = requester.request(self.messages, self.get_token_count(), self.generate_stream_checker(src_dict))
         else:
-            self.messages, console_log = self.generate_prompt_sakura(src_dict)
+            self.concurrency_controller.acquire()
+            request_time = time.time()
+            try:
+                skip, response_think, response_result, prompt_tokens, completion_tokens = requester.request(self.messages, self.get_token_count(), self.generate_stream_checker(src_dict))
+            finally:
+                self.concurrency_controller.release(requester.error_type, time.time() - request_time - requester.wait_time)
+        self.cached_tokens = requester.cached_tokens
+
+        # 处理回复
+        return self.handle_response(src_dict, item_dict, start_time, console_log, skip, response_think, response_result, prompt_tokens, completion_tokens)
+
+    # 请求 - 异步，提示词生成与回复处理等计算密集的步骤在线程池中执行，避免阻塞事件循环
+    async def request_async(self, src_dict: dict[str, str], item_dict: dict[str, CacheItem], preceding_items: list[CacheItem], samples: list[str], current_round: int, executor: concurrent.futures.Executor) -> dict:
+        # 任务开始的时间
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+
+        # 检测是否需要停止任务
+        if Base.WORK_STATUS == Base.Status.STOPPING:
+            return {}
+
+        # 生成请求提示词
+        self.messages, console_log = await loop.run_in_executor(executor, self.generate_messages, src_dict, preceding_items, samples)
 
         # 发起请求
         requester = TranslatorRequester(self.config, self.platform, current_round)
-        skip, response_think, response_result, prompt_tokens, completion_tokens = requester.request(self.messages)
+        if self.concurrency_controller is None:
+            skip, response_think, response_result, prompt_tokens, completion_tokens = await self.send_request_async(requester, src_dict, item_dict, current_round, executor)
+        else:
+            await self.concurrency_controller.acquire_async()
+            request_time = time.time()
+            try:
+                skip, response_think, response_result, prompt_tokens, completion_tokens = await self.send_request_async(requester, src_dict, item_dict, current_round, executor)
+            finally:
+                self.concurrency_controller.release(requester.error_type, time.time() - request_time - requester.wait_time)
+
+        # 处理回复
+        return await loop.run_in_executor(
+            executor,
+            self.handle_response,
+            src_dict,
+            item_dict,
+            start_time,
+            console_log,
+            skip,
+            response_think,
+            response_result,
+            prompt_tokens,
+            completion_tokens,
+        )
+
+    # 发送请求 - 异步
+    # 启用对冲请求时，请求耗时超过近期延迟的分位数后，优先使用其他密钥发送相同的请求，采用最先通过结果检查的回复并取消另一个请求
+    async def send_request_async(self, requester: TranslatorRequester, src_dict: dict[str, str], item_dict: dict[str, CacheItem], current_round: int, executor: concurrent.futures.Executor) -> tuple[bool, str, str, int, int]:
+        if self.hedge_controller is None:
+            result = await requester.request_async(self.messages, self.get_token_count(), self.generate_stream_checker(src_dict))
+            self.cached_tokens = requester.cached_tokens
+            return result
+
+        delay = self.hedge_controller.start()
+        primary = asyncio.create_task(requester.request_async(self.messages, self.get_token_count(), self.generate_stream_checker(src_dict)))
+        pending: set[asyncio.Task] = {primary}
+        try:
+            # 等待原请求完成，等待速率限制的时间不计入请求耗时
+            while delay is not None and primary.done() == False:
+                elapsed = time.time() - requester.request_time if requester.request_time > 0 else 0
+                if elapsed >= delay:
+                    break
+                await asyncio.wait(pending, timeout = delay - elapsed)
+
+            # 原请求已完成、对冲预算不足或正在停止任务时，不发送对冲请求
+            if primary.done() == True or delay is None or Base.WORK_STATUS == Base.Status.STOPPING or self.hedge_controller.try_acquire() == False:
+                result = await primary
+                if result[0] == False:
+                    self.hedge_controller.record(time.time() - requester.request_time)
+                self.cached_tokens = requester.cached_tokens
+                return result
+
+            # 发送对冲请求，与原请求并行等待，采用最先通过结果检查的回复
+            # 均未通过时采用收到回复的请求的结果，以便逐行回收，均失败时采用原请求的结果
+            hedger = TranslatorRequester(self.config, self.platform, current_round)
+            hedger.exclude_api_key = requester.api_key
+            hedge = asyncio.create_task(self.send_hedge_request_async(hedger, src_dict))
+            pending.add(hedge)
+            results: dict[asyncio.Task, tuple[bool, str, str, int, int]] = {}
+            passed: dict[asyncio.Task, bool] = {}
+            loop = asyncio.get_running_loop()
+            while len(pending) > 0 and not any(passed.values()):
+                done, pending = await asyncio.wait(pending, return_when = asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key = lambda task: task is not primary):
+                    results[task] = task.result()
+                    passed[task] = await loop.run_in_executor(executor, self.is_response_passed, src_dict, item_dict, results.get(task))
+        finally:
+            # 取消未完成的请求
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions = True)
+
+        # 记录对冲的结果，被取消的请求按预估的输入 Token 数量计算消耗
+        winner = next((task for task, v in passed.items() if v == True), None)
+        if winner is None:
+            winner = next((task for task in (primary, hedge) if task in results and results.get(task)[0] == False), primary)
+        loser = hedge if winner is primary else primary
+        if results.get(winner)[0] == False:
+            self.hedge_controller.record(time.time() - (requester if winner is primary else hedger).request_time)
+        if loser in results:
+            token = (results.get(loser)[3] or 0) + (results.get(loser)[4] or 0)
+        else:
+            token = self.get_token_count()
+        self.hedge_controller.report(winner is hedge, token)
+        self.cached_tokens = (requester if winner is primary else hedger).cached_tokens
+
+        return results.get(winner)
+
+    # 发送对冲请求 - 异步，对冲请求同样占用并发名额，其结果计入并发上限的调整，被取消时不计入
+    async def send_hedge_request_async(self, hedger: TranslatorRequester, src_dict: dict[str, str]) -> tuple[bool, str, str, int, int]:
+        if self.concurrency_controller is None:
+            return await hedger.request_async(self.messages, self.get_token_count(), self.generate_stream_checker(src_dict))
+
+        await self.concurrency_controller.acquire_async()
+        request_time = time.time()
+        try:
+            return await hedger.request_async(self.messages, self.get_token_count(), self.generate_stream_checker(src_dict))
+        except asyncio.CancelledError:
+            hedger.error_type = TranslatorRequester.Error.ABORT
+            raise
+        finally:
+            self.concurrency_controller.release(hedger.error_type, time.time() - request_time - hedger.wait_time)
+
+    # 生成批量请求的提示词，批量请求由 Translator 统一提交
+    def generate_batch_messages(self) -> list[dict]:
+        self.start_time = time.time()
+        self.messages, self.console_log = self.generate_messages(self.src_dict, self.preceding_items, self.samples)
+
+        return self.messages
+
+    # 处理批量请求的回复
+    def handle_batch_response(self, skip: bool, response_think: str, response_result: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int) -> dict:
+        self.cached_tokens = cached_tokens
+        return self.handle_response(self.src_dict, self.item_dict, self.start_time, self.console_log, skip, response_think, response_result, prompt_tokens, completion_tokens)
+
+    # 生成流式回复检查器，未启用流式请求时返回 None
+    def generate_stream_checker(self, src_dict: dict[str, str]) -> StreamChecker:
+        if ExpertConfig.get().streaming_enable == False:
+            return None
+        else:
+            return StreamChecker(self.config, src_dict, self.platform.get("api_format"))
+
+    # 获取预估的输入 Token 数量
+    def get_token_count(self) -> int:
+        return sum(item.get_token_count() for item in self.items)
+
+    # 生成请求提示词
+    def generate_messages(self, src_dict: dict[str, str], preceding_items: list[CacheItem], samples: list[str]) -> tuple[list[dict], list[str]]:
+        if self.platform.get("api_format") != Base.APIFormat.SAKURALLM:
+            return self.generate_prompt(src_dict, preceding_items, samples)
+        else:
+            return self.generate_prompt_sakura(src_dict)
+
+    # 解析回复内容
+    def decode_response(self, response_result: str) -> tuple[dict[str, str], list[dict], str]:
+        if self.config.get("auto_glossary_enable") == False:
+            dst_dict, glossary_auto, response_decode_log = ResponseDecoder().decode(response_result)
+        else:
+            dst_dict, glossary_auto, response_decode_log = ResponseDecoder().decode_mix(response_result)
 
+        # 确保 kv 都为字符串
+        return {str(k): str(v) for k, v in dst_dict.items()}, glossary_auto, response_decode_log
+
+    # 判断回复是否通过结果检查，用于在对冲请求中选择采用的回复
+    def is_response_passed(self, src_dict: dict[str, str], item_dict: dict[str, CacheItem], result: tuple[bool, str, str, int, int]) -> bool:
+        if result[0] == True:
+            return False
+
+        dst_dict, _, _ = self.decode_response(result[2])
+        check_result = self.response_checker.check(src_dict, dst_dict, item_dict, self.config.get("source_language"))
+
+        return all(v == ResponseChecker.Error.NONE for v in check_result)
+
+    # 处理回复
+    def handle_response(self, src_dict: dict[str, str], item_dict: dict[str, CacheItem], start_time: float, console_log: list[str], skip: bool, response_think: str, response_result: str, prompt_tokens: int, completion_tokens: int) -> dict:
         # 如果请求结果标记为 skip，即有错误发生，则跳过本次循环
         if skip == True:
             return {
@@ -116,17 +345,15 @@ class TranslatorTask(Base):
             }
 
         # 提取回复内容
-        if self.config.get("auto_glossary_enable") == False:
-            dst_dict, glossary_auto, response_decode_log = ResponseDecoder().decode(response_result)
-        else:
-            dst_dict, glossary_auto, response_decode_log = ResponseDecoder().decode_mix(response_result)
-
-        # 确保 kv 都为字符串
-        dst_dict = {str(k): str(v) for k, v in dst_dict.items()}
+        dst_dict, glossary_auto, response_decode_log = self.decode_response(response_result)
 
         # 检查回复内容
         check_result = self.response_checker.check(src_dict, dst_dict, item_dict, self.config.get("source_language"))
 
+        # 逐行回收时，按原文的 Key 对齐译文，以便按位置合并
+        if ExpertConfig.get().line_salvage_enable == True and len(check_result) == len(src_dict):
+            dst_dict = self.response_checker.align(src_dict, dst_dict)
+
         # 当任务失败且是单条目任务时，更新重试次数
         if any(v != ResponseChecker.Error.NONE for v in check_result) != None and len(self.items) == 1:
             self.items[0].set_retry_count(self.items[0].get_retry_count() + 1)
@@ -164,15 +391,32 @@ class TranslatorTask(Base):
 
             # 更新缓存数据
             updated_count = 0
+            updated_items: list[CacheItem] = []
             dst_sub_lines = list(dst_dict.values())
             check_result_lines = check_result.copy()
             for item in self.items:
-                dst, dst_sub_lines, check_result_lines = item.merge_sub_lines(dst_sub_lines, check_result_lines)
+                dst, dst_sub_lines, check_result_lines = item.merge_sub_lines(dst_sub_lines, check_result_lines, ExpertConfig.get().line_salvage_enable)
                 if dst != None:
                     updated_count = updated_count + 1
+                    updated_items.append(item)
                     item.set_dst(dst)
                     item.set_status(Base.TranslationStatus.TRANSLATED)
 
+            # 统计部分失败的任务中回收的行数与 Token 数量
+            salvage_line, salvage_token = self.get_salvage_count(src_dict, item_dict, check_result)
+
+            # 更新翻译记忆库
+            self.update_translation_memory(updated_items)
+
+            # 将译文复制到重复条目
+            duplicate_items = self.cache_manager.fan_out_duplicate_items(updated_items)
+            updated_count = updated_count + len(duplicate_items)
+        else:
+            duplicate_items = []
+
+        # 保存发生变化的条目
+        self.cache_manager.save_items_to_file(self.items + duplicate_items, self.config.get("output_folder"))
+
         # 打印任务结果
         self.print_log_table(
             check_result,
@@ -192,6 +436,9 @@ class TranslatorTask(Base):
                 "row_count": updated_count,
                 "prompt_tokens": prompt_tokens,
                 "completion_tokens": completion_tokens,
+                "cached_tokens": self.cached_tokens,
+                "salvage_line": salvage_line,
+                "salvage_token": salvage_token,
             }
         else:
             return {
@@ -201,6 +448,56 @@ class TranslatorTask(Base):
                 "completion_tokens": 0,
             }
 
+    # 统计部分失败的任务中回收的行数与 Token 数量
+    # 通过检查且已写入条目（或启用逐行回收时已记录到条目）的行视为已回收，这些行无需在重试时再次翻译
+    def get_salvage_count(self, src_dict: dict[str, str], item_dict: dict[str, CacheItem], check_result: list[str]) -> tuple[int, int]:
+        if all(v == ResponseChecker.Error.NONE for v in check_result) or len(check_result) != len(src_dict):
+            return 0, 0
+
+        lines = [
+            src
+            for src, item, v in zip(src_dict.values(), item_dict.values(), check_result)
+            if v == ResponseChecker.Error.NONE and (item.get_status() == Base.TranslationStatus.TRANSLATED or len(item.get_accepted_sub_lines()) > 0)
+        ]
+
+        return len(lines), sum(len(CacheItem.get_encoding().encode(line, disallowed_special = ())) for line in lines)
+
+    # 更新翻译记忆库
+    def update_translation_memory(self, items: list[CacheItem]) -> None:
+        if len(items) == 0 or ExpertConfig.get().translation_memory_enable == False:
+            return None
+
+        try:
+            TranslationMemory.get().add(
+                [(item.get_src(), item.get_dst()) for item in items],
+                self.config.get("source_language"),
+                self.config.get("target_language"),
+            )
+        except Exception as e:
+            self.debug(Localizer.get().log_translation_memory_fail, e)
+
+    # 从翻译记忆库中查询相似原文的已有译文
+    def query_translation_memory(self) -> list[tuple[str, str]]:
+        try:
+            similar = TranslationMemory.get().query_similar(
+                [item.get_src() for item in self.items],
+                self.config.get("source_language"),
+                self.config.get("target_language"),
+                top_k = ExpertConfig.get().translation_memory_fuzzy_top_k,
+                threshold = ExpertConfig.get().translation_memory_fuzzy_threshold,
+            )
+        except Exception as e:
+            self.debug(Localizer.get().log_translation_memory_fail, e)
+            return []
+
+        # 去重
+        pairs: dict[str, str] = {}
+        for v in similar.values():
+            for src, dst, _ in v:
+                pairs[src] = dst
+
+        return list(pairs.items())
+
     # 正规化
     def normalize(self, data: dict[str, str]) -> dict:
         for k in data.keys():
@@ -328,9 +625,17 @@ class TranslatorTask(Base):
         extra_log = []
 
         # 基础提示词
-        main, log = self.prompt_builder.build_main(samples)
-        if log != "":
-            extra_log.append(log)
+        # 启用缓存友好布局时，代码示例放在基础提示词之后，使基础提示词在所有请求中逐字节一致，以便接口缓存
+        if ExpertConfig.get().prompt_cache_layout_enable == False:
+            main, log = self.prompt_builder.build_main(samples)
+            if log != "":
+                extra_log.append(log)
+            prefix = ""
+        else:
+            prefix, _ = self.prompt_builder.build_main([])
+            main = self.prompt_builder.build_samples(samples)
+            if main != "":
+                extra_log.append(main)
 
         # 参考上文
         if len(preceding_items) > 0:
@@ -339,6 +644,13 @@ class TranslatorTask(Base):
                 main = main + "\n" + result
                 extra_log.append(result)
 
+        # 参考译文
+        if ExpertConfig.get().translation_memory_enable == True and ExpertConfig.get().translation_memory_fuzzy_enable == True:
+            result = self.prompt_builder.build_reference(self.query_translation_memory())
+            if result != "":
+                main = main + "\n" + result
+                extra_log.append(result)
+
         # 术语表
         if self.config.get("glossary_enable") == True:
             result = self.prompt_builder.build_glossary(src_dict)
@@ -347,14 +659,30 @@ class TranslatorTask(Base):
                 extra_log.append(result)
 
         # 构建提示词列表
-        messages.append({
-            "role": "user",
-            "content": (
-                f"{main}"
-                + "\n" + "原文文本："
-                + "\n" + json.dumps(src_dict, indent = None, ensure_ascii = False)
-            ),
-        })
+        main = (
+            f"{main}"
+            + "\n" + "原文文本："
+            + "\n" + json.dumps(src_dict, indent = None, ensure_ascii = False)
+        ).lstrip("\n")
+        if prefix == "":
+            messages.append({
+                "role": "user",
+                "content": main,
+            })
+        elif self.platform.get("api_format") == Base.APIFormat.ANTHROPIC:
+            # Anthropic 接口需要显式标记缓存断点，基础提示词长度低于模型的最低缓存长度时标记不生效
+            messages.append({
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": main},
+                ],
+            })
+        else:
+            messages.append({
+                "role": "user",
+                "content": prefix + "\n" + main,
+            })
 
         # 伪造预回复，可以更好的回避模型的安全限制
         # DeepSeek R1、 Claude 思考模式 不兼容此方法
@@ -463,7 +791,7 @@ class TranslatorTask(Base):
         log_func("\n" + "\n\n".join(file_rows) + "\n", file = True, console = False)
 
         # 根据线程数判断是否需要打印表格
-        task_num = sum(1 for t in threading.enumerate() if "translator" in t.name)
+        task_num = max(TranslatorTask.ASYNC_TASK_NUM, sum(1 for t in threading.enumerate() if "translator" in t.name))
         if task_num > 32:
             log_func(
                 Localizer.get().translator_too_many_task + "\n" + message + "\n",
@@ -6,8 +6,6 @@ import zipfile
 import threading
 
 import httpx
-from PyQt5.QtGui import QDesktopServices
-from PyQt5.QtCore import QUrl
 
 from base.Base import Base
 from module.Localizer.Localizer import Localizer
@@ -198,6 +196,10 @@ class VersionManager(Base):
             "duration": 60 * 1000,
         })
 
+        # 延迟导入，无界面模式下不需要 Qt
+        from PyQt5.QtGui import QDesktopServices
+        from PyQt5.QtCore import QUrl
+
         # 延迟3秒后关闭应用并打开更新日志
         time.sleep(3)
         QDesktopServices.openUrl(QUrl(VersionManager.RELEASE_URL))